@@ -0,0 +1,2660 @@
+"""
+RefCast Core — headless import logic
+====================================
+Everything here runs without 3ds Max or Qt: file scanning, header probes,
+view detection, plane placement math and FFmpeg orchestration. The plugin
+(RefCast_V1.py) builds its UI and scene work on top of it; the benchmark
+suite in benchmarks/ drives it against a fake pymxs runtime.
+"""
+
+import sys
+import os
+import time
+import re
+import subprocess
+import shutil
+import hashlib
+import json
+import struct
+import tempfile
+import threading
+import functools
+import collections
+import contextlib
+import fnmatch
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+# ==========================================
+# ===== MAXSCRIPT HELPERS =====
+# ==========================================
+# Injected once by the plugin (rt.execute); kept here so headless tools can
+# inspect the exact calls the scene side makes.
+MAXSCRIPT_HELPERS = """
+fn UPDATE_VISIBILITY_FN obj val = (
+    if isValidNode obj do (
+        if obj.visibility == undefined then (
+            obj.visibility = Bezier_Float()
+        )
+        else (
+            if (getPropertyController obj #visibility) == undefined do (
+                obj.visibility = Bezier_Float()
+            )
+        )
+        obj.visibility.controller.value = val
+    )
+)
+
+fn REFCAST_APPLY_PROPS_FN objs val gray doFreeze cull rend castSh rcvSh = (
+    -- Applies every live property to a whole node collection in one call
+    local count = 0
+    with redraw off (
+        for obj in objs where isValidNode obj do (
+            try (
+                UPDATE_VISIBILITY_FN obj val
+                obj.showFrozenInGray = gray
+                if doFreeze then (if not obj.isFrozen do freeze obj)
+                else (if obj.isFrozen do unfreeze obj)
+                obj.backFaceCull = cull
+                obj.renderable = rend
+                obj.castShadows = castSh
+                obj.receiveShadows = rcvSh
+                count += 1
+            ) catch ()
+        )
+    )
+    count
+)
+
+-- Shared fade: every node of a group instances one visibility controller,
+-- so fading the group is a single value change. Nodes carry the group key
+-- in the "RefCast_Fade" user prop; the controllers are re-learned from them
+-- whenever the session cache goes stale (new scene, merged file).
+global REFCAST_FADE_KEYS = #()
+global REFCAST_FADE_CTRLS = #()
+
+fn REFCAST_FADE_KEY_FN obj = (
+    local key = getUserProp obj "RefCast_Fade"
+    if key == undefined then "" else key as string
+)
+
+fn REFCAST_FADE_REBUILD_FN layerName = (
+    REFCAST_FADE_KEYS = #()
+    REFCAST_FADE_CTRLS = #()
+    local theLayer = LayerManager.getLayerFromName layerName
+    if theLayer != undefined do (
+        local layerNodes = #()
+        theLayer.nodes &layerNodes
+        for obj in layerNodes do (
+            local key = REFCAST_FADE_KEY_FN obj
+            local ctrl = getPropertyController obj #visibility
+            if key != "" and ctrl != undefined and (findItem REFCAST_FADE_KEYS key) == 0 do (
+                append REFCAST_FADE_KEYS key
+                append REFCAST_FADE_CTRLS ctrl
+            )
+        )
+    )
+    REFCAST_FADE_KEYS
+)
+
+fn REFCAST_FADE_GROUPS_FN layerName = (
+    -- Keys of every fade group on the layer
+    local stale = REFCAST_FADE_KEYS.count == 0
+    for c in REFCAST_FADE_CTRLS where not isValidObj c do stale = true
+    if stale then REFCAST_FADE_REBUILD_FN layerName else REFCAST_FADE_KEYS
+)
+
+fn REFCAST_FADE_CONTROLLER_FN key layerName = (
+    local i = findItem REFCAST_FADE_KEYS key
+    if i == 0 or not isValidObj REFCAST_FADE_CTRLS[i] do (
+        REFCAST_FADE_REBUILD_FN layerName
+        i = findItem REFCAST_FADE_KEYS key
+    )
+    if i > 0 then REFCAST_FADE_CTRLS[i] else undefined
+)
+
+fn REFCAST_FADE_ATTACH_FN objs key val layerName = (
+    -- Joins the loose objs to a fade group, creating its controller at val if it is new.
+    -- Nodes already in a group keep it.
+    local ctrl = REFCAST_FADE_CONTROLLER_FN key layerName
+    if ctrl == undefined do (
+        ctrl = Bezier_Float()
+        ctrl.value = val
+        append REFCAST_FADE_KEYS key
+        append REFCAST_FADE_CTRLS ctrl
+    )
+    local count = 0
+    with redraw off (
+        for obj in objs where isValidNode obj and (REFCAST_FADE_KEY_FN obj) == "" do (
+            obj.visibility = ctrl
+            setUserProp obj "RefCast_Fade" key
+            count += 1
+        )
+    )
+    count
+)
+
+fn REFCAST_FADE_DETACH_FN objs = (
+    -- Back to a controller per node, keeping each node's current opacity
+    local count = 0
+    with redraw off (
+        for obj in objs where isValidNode obj and (REFCAST_FADE_KEY_FN obj) != "" do (
+            local ctrl = getPropertyController obj #visibility
+            local v = if ctrl != undefined then ctrl.value else 1.0
+            obj.visibility = Bezier_Float()
+            obj.visibility.controller.value = v
+            setUserProp obj "RefCast_Fade" ""
+            count += 1
+        )
+    )
+    count
+)
+
+fn REFCAST_FADE_SPLIT_FN objs = (
+    -- #(group keys, loose nodes) of objs
+    local keys = #()
+    local loose = #()
+    for obj in objs where isValidNode obj do (
+        local key = REFCAST_FADE_KEY_FN obj
+        if key == "" then append loose obj else appendIfUnique keys key
+    )
+    #(keys, loose)
+)
+
+fn REFCAST_FADE_SET_FN keys val layerName = (
+    -- One value change per group, however many nodes share it
+    local count = 0
+    for key in keys do (
+        local ctrl = REFCAST_FADE_CONTROLLER_FN key layerName
+        if ctrl != undefined do (
+            ctrl.value = val
+            count += 1
+        )
+    )
+    count
+)
+
+fn REFCAST_BUILD_PLANES_FN names widths lengths mats texs xforms matKeys fullPaths proxyPaths layerName val gray doFreeze cull rend castSh rcvSh = (
+    -- Builds every plane of an import batch in one call.
+    -- xforms holds 9 floats per plane: rotation xyz, position xyz, pivot xyz.
+    local result = #()
+    local theLayer = LayerManager.getLayerFromName layerName
+    if theLayer == undefined do theLayer = LayerManager.newLayerFromName layerName
+    local shownMats = #()
+    with redraw off (
+        for i = 1 to names.count do (
+            local k = (i - 1) * 9
+            local p = Plane width:widths[i] length:lengths[i] widthsegs:1 lengthsegs:1
+            p.name = names[i]
+            p.material = mats[i]
+            if (findItem shownMats mats[i]) == 0 do (
+                showTextureMap mats[i] texs[i] true
+                append shownMats mats[i]
+            )
+            addModifier p (Uvwmap maptype:4)
+            rotate p (eulerAngles xforms[k+1] xforms[k+2] xforms[k+3])
+            p.pos = [xforms[k+4], xforms[k+5], xforms[k+6]]
+            p.pivot = [xforms[k+7], xforms[k+8], xforms[k+9]]
+            p.renderable = rend
+            p.castShadows = castSh
+            p.receiveShadows = rcvSh
+            p.backFaceCull = cull
+            UPDATE_VISIBILITY_FN p val
+            if matKeys[i] != "" do setUserProp p "RefCast_MatKey" matKeys[i]
+            if proxyPaths[i] != "" do (
+                setUserProp p "RefCast_FullRes" fullPaths[i]
+                setUserProp p "RefCast_Proxy" proxyPaths[i]
+            )
+            if doFreeze do (
+                p.showFrozenInGray = gray
+                freeze p
+            )
+            theLayer.addNode p
+            append result p
+        )
+    )
+    result
+)
+
+fn REFCAST_BUILD_ATLAS_MESH_FN meshName quads mat tex xform sheetPath layerName val gray doFreeze cull rend castSh rcvSh = (
+    -- One Editable Mesh per atlas sheet: a quad (two faces) per image with its own UV island.
+    -- quads holds 8 floats per image: x0 y0 x1 y1 (local units), u0 v0 u1 v1.
+    -- xform holds 6 floats: rotation xyz, position xyz.
+    local verts = #()
+    local tverts = #()
+    local faces = #()
+    local n = quads.count / 8
+    for i = 0 to n - 1 do (
+        local b = i * 8
+        local x0 = quads[b+1]; local y0 = quads[b+2]; local x1 = quads[b+3]; local y1 = quads[b+4]
+        local u0 = quads[b+5]; local v0 = quads[b+6]; local u1 = quads[b+7]; local v1 = quads[b+8]
+        join verts #([x0, y0, 0], [x1, y0, 0], [x1, y1, 0], [x0, y1, 0])
+        join tverts #([u0, v0, 0], [u1, v0, 0], [u1, v1, 0], [u0, v1, 0])
+        local k = i * 4
+        join faces #([k+1, k+2, k+3], [k+1, k+3, k+4])
+    )
+    local theLayer = LayerManager.getLayerFromName layerName
+    if theLayer == undefined do theLayer = LayerManager.newLayerFromName layerName
+    local m = mesh name:meshName vertices:verts faces:faces tverts:tverts
+    for i = 1 to n do (
+        -- hide the quad diagonals
+        setEdgeVis m (i * 2 - 1) 3 false
+        setEdgeVis m (i * 2) 1 false
+    )
+    update m
+    m.material = mat
+    showTextureMap mat tex true
+    rotate m (eulerAngles xform[1] xform[2] xform[3])
+    m.pos = [xform[4], xform[5], xform[6]]
+    m.renderable = rend
+    m.castShadows = castSh
+    m.receiveShadows = rcvSh
+    m.backFaceCull = cull
+    UPDATE_VISIBILITY_FN m val
+    setUserProp m "RefCast_Atlas" sheetPath
+    if doFreeze do (
+        m.showFrozenInGray = gray
+        freeze m
+    )
+    theLayer.addNode m
+    m
+)
+
+fn REFCAST_COLLECT_ASSETS_FN layerName = (
+    -- #(matKey, material, bitmapTexture, filename, usesAlpha) for every map on the layer
+    local result = #()
+    local theLayer = LayerManager.getLayerFromName layerName
+    if theLayer != undefined do (
+        local layerNodes = #()
+        theLayer.nodes &layerNodes
+        for n in layerNodes where n.material != undefined do (
+            local matKey = getUserProp n "RefCast_MatKey"
+            if matKey == undefined do matKey = ""
+            for t in (getClassInstances BitmapTexture target:n.material) do (
+                append result #(matKey as string, n.material, t, t.filename, t.alphaSource == 2)
+            )
+        )
+    )
+    result
+)
+
+fn REFCAST_RESIZE_PLANES_FN objs widths lengths = (
+    -- Re-sync: new plane sizes for sources whose image dimensions changed
+    local count = 0
+    with redraw off (
+        for i = 1 to objs.count where isValidNode objs[i] and classOf objs[i] == Plane do (
+            objs[i].width = widths[i]
+            objs[i].length = lengths[i]
+            count += 1
+        )
+    )
+    count
+)
+
+fn REFCAST_INDEX_READ_FN propName = (
+    -- The scene index is a JSON string kept in the file's custom properties
+    local i = fileProperties.findProperty #custom propName
+    if i == 0 then "" else ((fileProperties.getPropertyValue #custom i) as string)
+)
+
+fn REFCAST_INDEX_WRITE_FN propName data = (
+    fileProperties.addProperty #custom propName data
+    true
+)
+
+fn REFCAST_NODE_HANDLES_FN objs = (
+    for o in objs collect (if isValidNode o then o.inode.handle else 0)
+)
+
+fn REFCAST_NODES_BY_HANDLE_FN handles = (
+    -- undefined for nodes deleted since they were indexed
+    for h in handles collect (maxOps.getNodeByHandle h)
+)
+
+fn REFCAST_LAYER_SOURCES_FN layerName = (
+    -- #(handle, source, load path, proxy or "") for every textured node on the layer
+    local result = #()
+    local theLayer = LayerManager.getLayerFromName layerName
+    if theLayer != undefined do (
+        local layerNodes = #()
+        theLayer.nodes &layerNodes
+        for obj in layerNodes where obj.material != undefined do (
+            local maps = getClassInstances BitmapTexture target:obj.material
+            if maps.count > 0 and maps[1].filename != undefined do (
+                local loadPath = maps[1].filename
+                local full = getUserProp obj "RefCast_FullRes"
+                local proxy = getUserProp obj "RefCast_Proxy"
+                local atlas = getUserProp obj "RefCast_Atlas"
+                local source = loadPath
+                if full != undefined do source = full as string
+                if atlas != undefined do source = atlas as string
+                append result #(obj.inode.handle, source, loadPath, if proxy != undefined then proxy as string else "")
+            )
+        )
+    )
+    result
+)
+
+-- Bumped on every new / opened / reset scene, after a merge or import and
+-- on undo / redo, so the plugin can keep the parsed index in memory and
+-- re-read it only when the scene changed (merged or redone RefCast planes
+-- are picked up on that read, undone ones drop out when resolved).
+global REFCAST_SCENE_GEN = 0
+callbacks.removeScripts id:#RefCastScene
+for ev in #(#filePostOpen, #systemPostNew, #systemPostReset, #filePostMerge, #postImport,
+            #sceneUndo, #sceneRedo) do
+    callbacks.addScript ev "REFCAST_SCENE_GEN += 1" id:#RefCastScene
+"""
+
+# MAXScript globals live for the whole Max session, so the helpers only need
+# injecting once; the version stamp re-injects them after an upgrade.
+MAXSCRIPT_HELPERS_GLOBAL = "REFCAST_HELPERS_VERSION"
+MAXSCRIPT_HELPERS_VERSION = hashlib.sha1(MAXSCRIPT_HELPERS.encode('utf-8')).hexdigest()[:12]
+
+
+def ensure_maxscript_helpers(runtime):
+    """Inject MAXSCRIPT_HELPERS unless this session already has this version. Returns True if injected."""
+    check = (f'(globalVars.isGlobal #{MAXSCRIPT_HELPERS_GLOBAL}) and '
+             f'{MAXSCRIPT_HELPERS_GLOBAL} == "{MAXSCRIPT_HELPERS_VERSION}"')
+    if runtime.execute(check) is True:
+        return False
+    runtime.execute(MAXSCRIPT_HELPERS)
+    runtime.execute(f'global {MAXSCRIPT_HELPERS_GLOBAL} = "{MAXSCRIPT_HELPERS_VERSION}"')
+    return True
+
+# ===== SUPPORTED FORMATS =====
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.tga', '.bmp', '.tif', '.tiff', '.exr', '.hdr', '.gif']
+VIDEO_EXTENSIONS = ['.avi', '.mov', '.mp4', '.wmv', '.mpg', '.mpeg', '.mkv', '.webm', '.flv', '.m4v']
+SEQUENCE_EXTENSIONS = ['.ifl']
+ALL_MEDIA_EXTENSIONS = IMAGE_EXTENSIONS + VIDEO_EXTENSIONS + SEQUENCE_EXTENSIONS
+
+
+def normalize_path(path):
+    return os.path.normcase(os.path.normpath(path))
+
+
+# ==========================================
+# ===== FOLDER SCANNING =====
+# ==========================================
+def collect_media_files(paths):
+    """Expand dropped files/folders into the supported media files they contain."""
+    final_files = []
+    for f in paths:
+        if os.path.isdir(f):
+            for root, dirs, filenames in os.walk(f):
+                for fn in filenames:
+                    if os.path.splitext(fn)[1].lower() in ALL_MEDIA_EXTENSIONS:
+                        final_files.append(os.path.join(root, fn).replace("\\", "/"))
+        elif os.path.splitext(f)[1].lower() in ALL_MEDIA_EXTENSIONS:
+            final_files.append(f.replace("\\", "/"))
+    return final_files
+
+
+# Folder scan options. max_depth -1 = unlimited, 0 = only the dropped folder.
+DEFAULT_SCAN_OPTIONS = {
+    'max_depth': -1,
+    'include': [],              # glob patterns on file names, e.g. ["*.png", "*front*"]
+    'exclude': [],              # glob patterns on file and folder names
+    'group_sequences': True,    # numbered frames -> one IFL
+    'min_frames': 5,            # shortest numbered run treated as a sequence
+    'sequence_root': None,      # where generated IFLs go (None = system temp)
+    'frame_start': 0,           # first frame number to use, 0 = first on disk
+    'frame_end': 0,             # last frame number to use, 0 = last on disk
+    'frame_step': 1,            # use every Nth frame
+    'gap_mode': 'hold',         # missing frames: 'hold' previous, 'split' into runs, 'skip'
+}
+SCAN_MAX_WORKERS = 8            # directory listings are I/O bound (network shares)
+SEQUENCE_DIRNAME = "RefCast_Sequences"   # next to the frame cache: a purge must not break planes
+FRAME_NUMBER_RE = re.compile(r'^(.*?)(\d+)(\.[^.]+)$')
+
+
+def parse_glob_list(text):
+    """'*.png; *front*' -> ['*.png', '*front*']"""
+    return [p.strip() for p in re.split(r'[;,]', text or "") if p.strip()]
+
+
+def _glob_hit(name, patterns):
+    name = name.lower()
+    return any(fnmatch.fnmatchcase(name, p.lower()) for p in patterns)
+
+
+def _scan_dir(path, depth, include, exclude):
+    """One os.scandir pass: (media files, subfolders, depth). Unreadable folders are empty."""
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if exclude and _glob_hit(entry.name, exclude):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                        continue
+                except OSError:
+                    continue
+                if os.path.splitext(entry.name)[1].lower() not in ALL_MEDIA_EXTENSIONS:
+                    continue
+                if include and not _glob_hit(entry.name, include):
+                    continue
+                files.append(entry.path.replace("\\", "/"))
+    except OSError:
+        pass
+    files.sort()
+    return files, dirs, depth
+
+
+def scan_media_paths(paths, options=None, on_batch=None, cancel_event=None, max_workers=SCAN_MAX_WORKERS,
+                     report=None):
+    """
+    Expand dropped files/folders into media files, listing folders in
+    parallel with os.scandir. Each folder's matches are passed to
+    on_batch(list) as soon as it is listed. Returns everything found.
+    Dropped files are kept as-is; folder contents honour the options.
+    Sequence gap warnings go to `report` (see group_sequence_files).
+    """
+    opts = dict(DEFAULT_SCAN_OPTIONS)
+    opts.update(options or {})
+    include, exclude = opts['include'], opts['exclude']
+
+    found = [p.replace("\\", "/") for p in paths
+             if not os.path.isdir(p) and os.path.splitext(p)[1].lower() in ALL_MEDIA_EXTENSIONS]
+    if found and on_batch:
+        on_batch(list(found))
+
+    folders = [p for p in paths if os.path.isdir(p)]
+    if not folders:
+        return found
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(_scan_dir, f, 0, include, exclude) for f in folders}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if cancel_event is not None and cancel_event.is_set():
+                for fut in pending:
+                    fut.cancel()
+                break
+            for fut in done:
+                files, subdirs, depth = fut.result()
+                if opts['max_depth'] < 0 or depth < opts['max_depth']:
+                    pending |= {pool.submit(_scan_dir, d, depth + 1, include, exclude) for d in subdirs}
+                if files and opts['group_sequences']:
+                    files = group_sequence_files(files, opts, report)
+                if files:
+                    found.extend(files)
+                    if on_batch:
+                        on_batch(files)
+    return found
+
+
+# ==========================================
+# ===== IMAGE SEQUENCES =====
+# ==========================================
+def split_sequences(paths, min_frames=DEFAULT_SCAN_OPTIONS['min_frames']):
+    """
+    Group numbered images (name_0001.png, name_0002.png, ...) that share a
+    folder, prefix and extension. Returns (sequences, singles); each sequence
+    is {'name', 'folder', 'ext', 'numbers', 'frames'} sorted by frame number.
+    """
+    runs = {}
+    singles = []
+    for path in paths:
+        folder, fname = os.path.split(path)
+        m = FRAME_NUMBER_RE.match(fname)
+        if not m or m.group(3).lower() not in IMAGE_EXTENSIONS:
+            singles.append(path)
+            continue
+        key = (folder, m.group(1), m.group(3).lower())
+        runs.setdefault(key, []).append((int(m.group(2)), path))
+
+    sequences = []
+    for (folder, prefix, ext), frames in runs.items():
+        if len(frames) < max(2, min_frames):
+            singles.extend(p for _, p in frames)
+            continue
+        frames.sort()
+        name = prefix.rstrip(" _-.") or os.path.basename(folder) or "frames"
+        sequences.append({'name': name, 'folder': folder, 'ext': ext,
+                          'numbers': [n for n, _ in frames], 'frames': [p for _, p in frames]})
+    return sequences, sorted(singles)
+
+
+def sequence_step(numbers):
+    """Numbering step of a run (1 for 1,2,3; 10 for 10,20,40 — the 30 is a gap)."""
+    step = 0
+    for a, b in zip(numbers, numbers[1:]):
+        step = math.gcd(step, b - a)
+    return step or 1
+
+
+def sequence_gaps(numbers, step=None):
+    """Missing frame ranges [(first, last), ...] between the first and last number."""
+    step = step or sequence_step(numbers)
+    return [(a + step, b - step) for a, b in zip(numbers, numbers[1:]) if b - a > step]
+
+
+def format_gaps(gaps, limit=3):
+    parts = [f"{a}" if a == b else f"{a}-{b}" for a, b in gaps[:limit]]
+    if len(gaps) > limit:
+        parts.append(f"+{len(gaps) - limit} more")
+    return ", ".join(parts)
+
+
+def sequence_ifl_runs(sequence, options):
+    """
+    Apply the frame range, gap mode and step to a sequence. Returns
+    [(suffix, lines)] — one IFL per run ("split" can make several); lines
+    are "path" or "path hold" (IFL syntax for showing a frame N times).
+    Split runs of a single frame are kept as one-line entries.
+    """
+    step = sequence_step(sequence['numbers'])
+    start, end = options['frame_start'], options['frame_end']
+    pairs = [(n, p) for n, p in zip(sequence['numbers'], sequence['frames'])
+             if n >= start and (end <= 0 or n <= end)]
+    if not pairs:
+        return []
+
+    runs = [pairs]
+    if options['gap_mode'] == 'split':
+        runs = [[pairs[0]]]
+        for prev, cur in zip(pairs, pairs[1:]):
+            if cur[0] - prev[0] > step:
+                runs.append([])
+            runs[-1].append(cur)
+
+    every = max(1, options['frame_step'])
+    result = []
+    for run in runs:
+        if options['gap_mode'] == 'hold':
+            holds = [(b[0] - a[0]) // step for a, b in zip(run, run[1:])] + [1]
+        else:
+            holds = [1] * len(run)
+        lines = []
+        for i in range(0, len(run), every):
+            hold = sum(holds[i:i + every]) if options['gap_mode'] == 'hold' else 1
+            lines.append(run[i][1] if hold == 1 else f"{run[i][1]} {hold}")
+        suffix = f"_{run[0][0]}-{run[-1][0]}" if len(runs) > 1 else ""
+        result.append((suffix, lines))
+    return result
+
+
+def write_sequence_ifl(sequence, lines, ifl_root=None, suffix="", options=None):
+    """
+    IFL for a detected sequence (absolute frame paths); returns its path.
+    Range/step/gap options are part of the folder key, so differently
+    trimmed imports of the same frames don't overwrite each other.
+    """
+    ifl_root = ifl_root or os.path.join(tempfile.gettempdir(), SEQUENCE_DIRNAME)
+    opts = options or {}
+    ident = json.dumps([normalize_path(os.path.join(sequence['folder'], sequence['name'] + sequence['ext'])),
+                        suffix] + [opts.get(k) for k in ('frame_start', 'frame_end', 'frame_step', 'gap_mode')])
+    seq_dir = os.path.join(ifl_root, hashlib.sha1(ident.encode('utf-8')).hexdigest()[:12])
+    os.makedirs(seq_dir, exist_ok=True)
+    return write_ifl(os.path.join(seq_dir, sequence['name'] + suffix + ".ifl").replace("\\", "/"), lines)
+
+
+def group_sequence_files(paths, options, report=None):
+    """
+    Replace numbered frame runs in `paths` by generated IFLs. Sequences with
+    missing frames add a line to `report` (a list) when given; isolated
+    frames left by "split" are imported as stills and reported there too.
+    """
+    opts = dict(DEFAULT_SCAN_OPTIONS)
+    opts.update(options or {})
+    sequences, singles = split_sequences(paths, opts['min_frames'])
+    ifls = []
+    for seq in sequences:
+        gaps = sequence_gaps(seq['numbers'])
+        if gaps and report is not None:
+            missing = sum((b - a) // sequence_step(seq['numbers']) + 1 for a, b in gaps)
+            report.append(f"{seq['name']}: {missing} missing frame(s) ({format_gaps(gaps)})")
+        stills = []
+        for suffix, lines in sequence_ifl_runs(seq, opts):
+            if len(lines) == 1 and opts['gap_mode'] == 'split':
+                stills.append(lines[0])
+                continue
+            ifls.append(write_sequence_ifl(seq, lines, opts['sequence_root'], suffix, opts))
+        if stills and report is not None:
+            names = ", ".join(os.path.basename(p) for p in stills[:5])
+            more = f" +{len(stills) - 5} more" if len(stills) > 5 else ""
+            report.append(f"{seq['name']}: {len(stills)} isolated frame(s) imported as stills ({names}{more})")
+        singles.extend(stills)
+    return ifls + singles
+
+
+# ==========================================
+# ===== SETTINGS FILE =====
+# ==========================================
+# Small per-user JSON file for things worth remembering between Max sessions.
+SETTINGS_FILENAME = "RefCast_Settings.json"
+
+
+def default_settings_path():
+    base = os.environ.get("APPDATA") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "RefCast", SETTINGS_FILENAME)
+
+
+def load_settings(path):
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_settings(path, data):
+    """Atomic write, so a crash never leaves half a settings file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+_SETTINGS_LOCK = threading.Lock()     # serialises read-modify-write of the settings file
+
+
+def update_settings(section, values, path=None):
+    """Replace one top-level section of the settings file; False if it could not be saved."""
+    path = path or default_settings_path()
+    with _SETTINGS_LOCK:
+        settings = load_settings(path)
+        settings[section] = values
+        try:
+            save_settings(path, settings)
+        except OSError:
+            return False
+    return True
+
+
+# ==========================================
+# ===== FFMPEG VIDEO CONVERSION SYSTEM =====
+# ==========================================
+TOOL_VERSION_TIMEOUT_SEC = 10
+TOOL_REQUIRED_ENCODERS = {"ffmpeg": ("png", "mjpeg")}     # PNG / JPEG frame output
+
+
+def _discover_ffmpeg():
+    """The slow search: PATH, common install folders, then WinGet packages."""
+    if shutil.which("ffmpeg"):
+        return shutil.which("ffmpeg")
+    common_paths = [
+        r"C:\ffmpeg\bin\ffmpeg.exe",
+        r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
+        r"C:\Program Files (x86)\ffmpeg\bin\ffmpeg.exe",
+        os.path.expanduser(r"~\ffmpeg\bin\ffmpeg.exe"),
+        os.path.expanduser(r"~\Desktop\ffmpeg\bin\ffmpeg.exe"),
+    ]
+    for p in common_paths:
+        if os.path.isfile(p):
+            return p
+    winget_dir = os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\WinGet\Packages")
+    if os.path.isdir(winget_dir):
+        for root, dirs, files in os.walk(winget_dir):
+            if root == winget_dir:
+                dirs[:] = [d for d in dirs if "ffmpeg" in d.lower()]   # e.g. Gyan.FFmpeg_…
+            if "ffmpeg.exe" in files:
+                return os.path.join(root, "ffmpeg.exe")
+    return None
+
+
+def _discover_ffprobe(ffmpeg_path):
+    if ffmpeg_path:
+        folder, name = os.path.split(ffmpeg_path)
+        candidate = os.path.join(folder, name.lower().replace("ffmpeg", "ffprobe"))
+        if os.path.isfile(candidate):
+            return candidate
+    return shutil.which("ffprobe")
+
+
+def _run_tool(cmd):
+    cflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=TOOL_VERSION_TIMEOUT_SEC,
+                            creationflags=cflags)
+    return result.stdout
+
+
+def validate_tool(name, path):
+    """
+    Check that `path` really is `name` (ffmpeg / ffprobe) and can write our
+    frame formats. Returns ({'path', 'version', 'encoders'}, None) or (None, error).
+    """
+    if not path or not os.path.isfile(path):
+        return None, f"{name} not found: {path}"
+    try:
+        first = (_run_tool([path, "-hide_banner", "-version"]).splitlines() or [""])[0]
+    except (OSError, subprocess.SubprocessError) as e:
+        return None, f"Cannot run {os.path.basename(path)}: {e}"
+    if not first.startswith(f"{name} version"):
+        return None, f"{path} does not report an {name} version"
+    info = {'path': path.replace("\\", "/"), 'version': first.split()[2] if len(first.split()) > 2 else "?",
+            'encoders': []}
+    required = TOOL_REQUIRED_ENCODERS.get(name)
+    if required:
+        try:
+            listing = _run_tool([path, "-hide_banner", "-encoders"])
+        except (OSError, subprocess.SubprocessError) as e:
+            return None, f"Cannot list {name} encoders: {e}"
+        found = {parts[1] for parts in (line.split() for line in listing.splitlines()) if len(parts) > 1}
+        missing = [enc for enc in required if enc not in found]
+        if missing:
+            return None, f"{name} {info['version']} lacks encoder(s): {', '.join(missing)}"
+        info['encoders'] = list(required)
+    return info, None
+
+
+class ToolResolver(object):
+    """
+    Finds ffmpeg / ffprobe once and remembers them in the settings file.
+    A remembered tool is trusted until its file disappears; a user-chosen
+    path always wins over discovery. Safe to call from worker threads.
+    """
+    TOOLS = ("ffmpeg", "ffprobe")
+
+    def __init__(self, settings_path=None):
+        self.settings_path = settings_path or default_settings_path()
+        self._lock = threading.Lock()
+        self._memo = {}     # name -> info dict, for this session
+
+    def _store(self, update):
+        with _SETTINGS_LOCK:
+            settings = load_settings(self.settings_path)
+            tools = settings.setdefault('tools', {})
+            for key, value in update.items():
+                if value is None:
+                    tools.pop(key, None)
+                else:
+                    tools[key] = value
+            try:
+                save_settings(self.settings_path, settings)
+            except OSError:
+                pass        # read-only profile: still works, just not remembered
+
+    def info(self, name):
+        """Last known {'path', 'version', ...} for `name` without searching, or None."""
+        with self._lock:
+            if name in self._memo:
+                return self._memo[name]
+        return load_settings(self.settings_path).get('tools', {}).get(name)
+
+    def user_path(self, name):
+        return load_settings(self.settings_path).get('tools', {}).get(f"{name}_user")
+
+    def resolve(self, name):
+        """Path to a validated `name`, or None."""
+        with self._lock:
+            memo = self._memo.get(name)
+            if memo and os.path.isfile(memo['path']):
+                return memo['path']
+            tools = load_settings(self.settings_path).get('tools', {})
+            user = tools.get(f"{name}_user")
+            cached = tools.get(name)
+            if cached and os.path.isfile(cached.get('path', "")) and (
+                    not user or normalize_path(user) == normalize_path(cached['path'])):
+                self._memo[name] = cached
+                return cached['path']
+
+            info = None
+            if user:
+                info, _ = validate_tool(name, user)
+            if info is None:
+                found = _discover_ffmpeg() if name == "ffmpeg" else _discover_ffprobe(
+                    self._memo.get("ffmpeg", {}).get('path') or tools.get("ffmpeg", {}).get('path'))
+                info, _ = validate_tool(name, found) if found else (None, None)
+            if info is None:
+                self._memo.pop(name, None)
+                return None     # not remembered: installing FFmpeg later just works
+            self._memo[name] = info
+            self._store({name: info})
+            return info['path']
+
+    def set_user_path(self, name, path):
+        """Validate and pin `path` for `name`. Returns (info, error)."""
+        info, err = validate_tool(name, path)
+        if info is None:
+            return None, err
+        with self._lock:
+            self._memo[name] = info
+            self._store({name: info, f"{name}_user": info['path']})
+        return info, None
+
+    def clear_user_path(self, name):
+        """Back to automatic discovery on the next resolve."""
+        with self._lock:
+            self._memo.pop(name, None)
+            self._store({name: None, f"{name}_user": None})
+
+
+TOOLS = ToolResolver()
+
+
+def find_ffmpeg():
+    return TOOLS.resolve("ffmpeg")
+
+
+def list_sequence_frames(seq_dir, base_name, frame_ext):
+    prefix = base_name + "_"
+    frames = [fn for fn in os.listdir(seq_dir)
+              if fn.startswith(prefix) and fn.lower().endswith(frame_ext)]
+    return [os.path.join(seq_dir, fn).replace("\\", "/") for fn in sorted(frames)]
+
+
+def write_ifl(ifl_path, frames):
+    # Write beside and swap in, so Max never reads a half-written list
+    tmp_path = ifl_path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        for frame in frames:
+            f.write(frame.replace("\\", "/") + "\n")
+    os.replace(tmp_path, ifl_path)
+    return ifl_path
+
+
+# Video import options. 0 means "keep the source value" for end/fps/max_edge.
+DEFAULT_VIDEO_OPTIONS = {
+    'start': 0.0,       # seconds
+    'end': 0.0,         # seconds, 0 = to the end of the clip
+    'fps': 0.0,         # target frame rate, 0 = native
+    'max_edge': 0,      # longest side in pixels, 0 = native
+    'format': 'png',    # 'png' keeps alpha, 'jpg' is smaller and faster
+}
+
+
+def build_ffmpeg_video_args(options):
+    """
+    Translate video import options into FFmpeg arguments.
+    Returns (input_args, output_args, frame_ext).
+    """
+    opts = dict(DEFAULT_VIDEO_OPTIONS)
+    opts.update(options or {})
+
+    input_args = []
+    output_args = []
+    start = max(0.0, float(opts['start']))
+    end = float(opts['end'])
+    if start > 0:
+        input_args += ["-ss", f"{start:.3f}"]   # input-side seek: skips decoding
+    if end > start:
+        output_args += ["-t", f"{end - start:.3f}"]
+
+    filters = []
+    if opts['fps'] > 0:
+        filters.append(f"fps={opts['fps']:g}")
+    if opts['max_edge'] > 0:
+        edge = int(opts['max_edge'])
+        filters.append(f"scale='min(iw,{edge})':'min(ih,{edge})':force_original_aspect_ratio=decrease")
+
+    if opts['format'] == 'jpg':
+        frame_ext = ".jpg"
+        output_args += ["-q:v", "3"]
+    else:
+        frame_ext = ".png"
+        filters.append("format=rgba")
+
+    if filters:
+        output_args = ["-vf", ",".join(filters)] + output_args
+    return input_args, output_args, frame_ext
+
+
+# FFmpeg runs are bounded by the clip length (from an ffprobe pre-pass) and
+# killed early if `-progress` output stops moving.
+FFPROBE_TIMEOUT_SEC = 15
+FFMPEG_TIMEOUT_BASE_SEC = 60            # startup, seeking, flushing the last frames
+FFMPEG_TIMEOUT_PER_CLIP_SEC = 10        # wall-clock seconds allowed per second of footage
+FFMPEG_TIMEOUT_UNKNOWN_SEC = 1800       # duration unknown (ffprobe missing or failed)
+FFMPEG_STALL_SEC = 60                   # no progress for this long = hung
+FFMPEG_POLL_SEC = 0.25
+
+
+def find_ffprobe(ffmpeg_path=None):
+    """
+    The remembered / pinned ffprobe (see ToolResolver), so probing and the
+    Settings page agree. Only if none validates, the one _discover_ffprobe
+    finds beside `ffmpeg_path` or on PATH.
+    """
+    return TOOLS.resolve("ffprobe") or _discover_ffprobe(ffmpeg_path)
+
+
+def probe_video_duration(ffprobe_path, video_path):
+    """Clip length in seconds, or None if it can't be read quickly."""
+    if not ffprobe_path:
+        return None
+    cmd = [ffprobe_path, "-v", "error", "-show_entries", "format=duration",
+           "-of", "default=noprint_wrappers=1:nokey=1", video_path]
+    try:
+        cflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=FFPROBE_TIMEOUT_SEC,
+                                creationflags=cflags)
+        duration = float(result.stdout.strip().splitlines()[0])
+    except (OSError, subprocess.SubprocessError, ValueError, IndexError):
+        return None
+    return duration if duration > 0 else None
+
+
+def clip_seconds(duration, options=None):
+    """Seconds of footage a conversion will decode, given the in / out options."""
+    opts = dict(DEFAULT_VIDEO_OPTIONS)
+    opts.update(options or {})
+    start = max(0.0, float(opts['start']))
+    end = float(opts['end'])
+    if duration is not None:
+        end = min(end, duration) if end > start else duration
+    return max(0.0, end - start) if end > start else None
+
+
+def conversion_timeout(seconds):
+    if seconds is None:
+        return FFMPEG_TIMEOUT_UNKNOWN_SEC
+    return FFMPEG_TIMEOUT_BASE_SEC + seconds * FFMPEG_TIMEOUT_PER_CLIP_SEC
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(round(seconds))
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def run_ffmpeg(cmd, log_path, total_sec=None, timeout=None, cancel_event=None, on_progress=None,
+               on_poll=None):
+    """
+    Run FFmpeg with `-progress` on stdout and stderr going to `log_path`.
+    `on_progress(done_sec, total_sec, eta_sec)` fires on every progress
+    block; `on_poll()` once per poll tick. Returns 'ok', 'error',
+    'cancelled', 'timeout' or 'stalled'.
+    """
+    cmd = [cmd[0], "-nostats", "-progress", "pipe:1"] + list(cmd[1:])
+    state = {'done': 0.0, 'beat': time.time()}
+
+    def read_progress(stream):
+        for line in stream:
+            key, _, value = line.strip().partition("=")
+            if key in ("out_time_us", "out_time_ms"):   # both are microseconds
+                try:
+                    state['done'] = max(0.0, int(value) / 1e6)
+                except ValueError:
+                    pass
+            elif key == "progress":
+                state['beat'] = time.time()
+                if value == "end" and total_sec:
+                    state['done'] = total_sec
+                if on_progress:
+                    elapsed = state['beat'] - started
+                    eta = None
+                    if total_sec and state['done'] > 0:
+                        eta = elapsed * max(0.0, total_sec - state['done']) / state['done']
+                    on_progress(state['done'], total_sec, eta)
+
+    cflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+    started = time.time()
+    with open(log_path, 'w') as log:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=log, stdin=subprocess.DEVNULL,
+                                text=True, creationflags=cflags)
+        reader = threading.Thread(target=read_progress, args=(proc.stdout,), daemon=True)
+        reader.start()
+        status = None
+        while proc.poll() is None:
+            time.sleep(FFMPEG_POLL_SEC)
+            now = time.time()
+            if cancel_event is not None and cancel_event.is_set():
+                status = 'cancelled'
+            elif timeout is not None and now - started > timeout:
+                status = 'timeout'
+            elif now - state['beat'] > FFMPEG_STALL_SEC:
+                status = 'stalled'
+            if status:
+                proc.kill()
+                break
+            if on_poll: on_poll()
+        proc.wait()
+        reader.join(1.0)
+    if status:
+        return status
+    return 'ok' if proc.returncode == 0 else 'error'
+
+
+def _ffmpeg_log_tail(log_path):
+    try:
+        with open(log_path, 'r') as log:
+            return log.read()[-300:] or "Unknown error"
+    except OSError:
+        return "Unknown error"
+
+
+def _ffmpeg_failure(status, name, log_path):
+    if status == 'cancelled':
+        return f"Conversion cancelled: '{name}'"
+    if status == 'timeout':
+        return f"FFmpeg timed out converting '{name}'"
+    if status == 'stalled':
+        return f"FFmpeg stopped making progress on '{name}'"
+    return f"FFmpeg produced no frames for '{name}'.\n{_ffmpeg_log_tail(log_path)}"
+
+
+def _ffmpeg_bounds(ffmpeg_path, video_path, options):
+    """(seconds of footage, timeout) from the ffprobe pre-pass."""
+    seconds = clip_seconds(probe_video_duration(find_ffprobe(ffmpeg_path), video_path), options)
+    return seconds, conversion_timeout(seconds)
+
+
+def _uncached_sequence_dir(cache, temp_root, base_name):
+    """
+    New, empty folder for frames that must not enter the cache (no cache, or
+    a run that failed part way): `refcast_<name>_<random>`, which
+    FrameCache.purge() sweeps. Unique even for same-named clips converted
+    in parallel.
+    """
+    root = os.path.dirname(cache.root) if cache is not None else (temp_root or tempfile.gettempdir())
+    os.makedirs(root, exist_ok=True)
+    return tempfile.mkdtemp(prefix=f"refcast_{base_name}_", dir=root).replace("\\", "/")
+
+
+def convert_video_to_sequence(ffmpeg_path, video_path, temp_root=None, threads=0, cache=None,
+                              options=None, cancel_event=None, on_progress=None):
+    name = os.path.basename(video_path)
+    base_name = os.path.splitext(name)[0]
+    input_args, output_args, frame_ext = build_ffmpeg_video_args(options)
+
+    key = None
+    if cache is not None:
+        key = cache.make_key(video_path, {"in": input_args, "out": output_args})
+        cached_ifl = cache.lookup(key)
+        if cached_ifl:
+            return cached_ifl, None
+        seq_dir = cache.staging_dir(key)
+    else:
+        seq_dir = _uncached_sequence_dir(None, temp_root, base_name)
+    os.makedirs(seq_dir, exist_ok=True)
+    frame_pattern = os.path.join(seq_dir, f"{base_name}_%05d{frame_ext}").replace("\\", "/")
+    log_path = os.path.join(seq_dir, "ffmpeg.log")
+
+    cmd = [ffmpeg_path] + input_args + ["-i", video_path] + output_args
+    if threads > 0:
+        cmd += ["-threads", str(threads)]
+    cmd += ["-y", frame_pattern]
+    seconds, timeout = _ffmpeg_bounds(ffmpeg_path, video_path, options)
+    try:
+        try:
+            status = run_ffmpeg(cmd, log_path, seconds, timeout, cancel_event, on_progress)
+        except Exception as e:
+            shutil.rmtree(seq_dir, ignore_errors=True)
+            return None, f"FFmpeg error: {str(e)}"
+
+        # FFmpeg can fail part way and still leave usable frames; killed runs can't be trusted
+        frames = list_sequence_frames(seq_dir, base_name, frame_ext) if status in ('ok', 'error') else []
+        if not frames:
+            err = _ffmpeg_failure(status, name, log_path)
+            shutil.rmtree(seq_dir, ignore_errors=True)     # partial frames are useless
+            return None, err
+        try:
+            os.remove(log_path)
+        except OSError:
+            pass
+
+        if cache is not None:
+            if status == 'ok':
+                return cache.store(key, seq_dir, base_name, frame_ext, video_path), None
+            # Truncated clip: import what there is, but never cache it as the whole clip
+            try:
+                partial_dir = _uncached_sequence_dir(cache, temp_root, base_name)
+                moved = []
+                for frame in frames:
+                    moved.append(os.path.join(partial_dir, os.path.basename(frame)).replace("\\", "/"))
+                    os.replace(frame, moved[-1])
+            except OSError as e:
+                return None, f"Cannot keep the partial frames of '{name}': {e}"
+            seq_dir, frames = partial_dir, moved
+
+        ifl_path = os.path.join(seq_dir, f"{base_name}.ifl").replace("\\", "/")
+        return write_ifl(ifl_path, frames), None
+    finally:
+        if cache is not None and os.path.isdir(cache.staging_dir(key)):
+            shutil.rmtree(cache.staging_dir(key), ignore_errors=True)
+
+
+STREAM_FIRST_FRAMES = 12     # frames on disk before the plane is created
+
+
+def stream_video_to_sequence(ffmpeg_path, video_path, temp_root=None, threads=0, cache=None,
+                             options=None, on_frames=None, cancel_event=None, on_progress=None):
+    """
+    Streaming variant of convert_video_to_sequence.
+
+    FFmpeg runs in the background while this call polls the output folder and
+    rewrites the IFL as frames land. `on_frames(ifl_path, frame_count, finished)`
+    is called from this thread once STREAM_FIRST_FRAMES exist and again each
+    time the list grows, so the caller can show the clip before it is done.
+    """
+    name = os.path.basename(video_path)
+    base_name = os.path.splitext(name)[0]
+    input_args, output_args, frame_ext = build_ffmpeg_video_args(options)
+
+    key = None
+    if cache is not None:
+        key = cache.make_key(video_path, {"in": input_args, "out": output_args})
+        cached_ifl = cache.lookup(key)
+        if cached_ifl:
+            return cached_ifl, None
+        seq_dir = cache.open_stream(key)
+    else:
+        seq_dir = _uncached_sequence_dir(None, temp_root, base_name)
+    frame_pattern = os.path.join(seq_dir, f"{base_name}_%05d{frame_ext}").replace("\\", "/")
+    ifl_path = os.path.join(seq_dir, f"{base_name}.ifl").replace("\\", "/")
+    log_path = os.path.join(seq_dir, "ffmpeg.log")
+
+    cmd = [ffmpeg_path] + input_args + ["-i", video_path] + output_args
+    if threads > 0:
+        cmd += ["-threads", str(threads)]
+    cmd += ["-y", frame_pattern]
+
+    published = [0]
+
+    def publish():
+        # The newest file may still be mid-write: publish all but the last
+        frames = list_sequence_frames(seq_dir, base_name, frame_ext)[:-1]
+        if len(frames) >= STREAM_FIRST_FRAMES and len(frames) > published[0]:
+            write_ifl(ifl_path, frames)
+            published[0] = len(frames)
+            if on_frames: on_frames(ifl_path, published[0], False)
+
+    seconds, timeout = _ffmpeg_bounds(ffmpeg_path, video_path, options)
+    try:
+        status = run_ffmpeg(cmd, log_path, seconds, timeout, cancel_event, on_progress, publish)
+    except Exception as e:
+        shutil.rmtree(seq_dir, ignore_errors=True)
+        return None, f"FFmpeg error: {str(e)}"
+
+    if status in ('ok', 'error'):
+        frames = list_sequence_frames(seq_dir, base_name, frame_ext)
+    else:
+        # Killed mid-write: only what was already published is safe to keep
+        frames = list_sequence_frames(seq_dir, base_name, frame_ext)[:published[0]]
+    if not frames:
+        err = _ffmpeg_failure(status, name, log_path)
+        shutil.rmtree(seq_dir, ignore_errors=True)
+        return None, err
+
+    try:
+        os.remove(log_path)
+    except OSError:
+        pass
+    if cache is not None:
+        # A clip that did not finish stays on screen, so its folder can't move;
+        # an incomplete entry keeps it in the size accounting without being reused
+        ifl_path = cache.finalize(key, base_name, frame_ext, video_path, complete=(status == 'ok'),
+                                  frames=frames)
+    else:
+        write_ifl(ifl_path, frames)
+    if status not in ('ok', 'error'):
+        return ifl_path, None       # stopped early: the plane keeps what it already shows
+    if on_frames: on_frames(ifl_path, len(frames), True)
+    return ifl_path, None
+
+
+# ==========================================
+# ===== FRAME SEQUENCE CACHE =====
+# ==========================================
+FRAME_CACHE_DIRNAME = "RefCast_Cache"
+FRAME_CACHE_DEFAULT_MB = 4096
+
+
+class FrameCache(object):
+    """
+    Persistent, size-bounded cache of converted video frame sequences.
+
+    Each entry is a folder named after a key derived from the source file's
+    path, size and mtime plus the conversion parameters. `entry.json` is
+    written last and marks the entry as complete; its mtime is the LRU stamp.
+    Files in `loose_dirs` (regenerable outputs such as proxies) count
+    towards the same limit and are evicted one file at a time.
+    """
+    META_NAME = "entry.json"
+    KEY_DIR_RE = re.compile(r'^[0-9a-f]{40}(\.part-.*)?$')     # entry / staging folder names
+
+    def __init__(self, root, max_bytes=FRAME_CACHE_DEFAULT_MB * 1024 * 1024, loose_dirs=()):
+        self.root = root.replace("\\", "/")
+        self.max_bytes = max_bytes
+        self.loose_dirs = tuple(loose_dirs)
+        self._lock = threading.Lock()
+
+    def make_key(self, source_path, params):
+        st = os.stat(source_path)
+        ident = [os.path.normcase(os.path.abspath(source_path)), st.st_size,
+                 int(st.st_mtime), params]
+        return hashlib.sha1(json.dumps(ident, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def entry_dir(self, key):
+        return os.path.join(self.root, key).replace("\\", "/")
+
+    def staging_dir(self, key):
+        name = f"{key}.part-{os.getpid()}-{threading.get_ident()}"
+        return os.path.join(self.root, name).replace("\\", "/")
+
+    def _read_meta(self, entry_dir):
+        try:
+            with open(os.path.join(entry_dir, self.META_NAME), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _read_complete_meta(self, entry_dir):
+        meta = self._read_meta(entry_dir)
+        return meta if meta and meta.get("complete", True) else None
+
+    def lookup(self, key):
+        """Return the cached IFL path for `key` (and mark it used), or None."""
+        entry_dir = self.entry_dir(key)
+        meta = self._read_complete_meta(entry_dir)
+        if not meta:
+            return None
+        ifl_path = os.path.join(entry_dir, meta.get("ifl", "")).replace("\\", "/")
+        if not os.path.isfile(ifl_path):
+            return None
+        try:
+            os.utime(os.path.join(entry_dir, self.META_NAME), None)
+        except OSError:
+            pass
+        return ifl_path
+
+    def store(self, key, staging_dir, base_name, frame_ext, source_path):
+        """Move a finished conversion into the cache and return its IFL path."""
+        entry_dir = self.entry_dir(key)
+        with self._lock:
+            if self._read_complete_meta(entry_dir):
+                # An identical job finished first — keep its frames
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                return self.lookup(key)
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.rename(staging_dir, entry_dir)
+        return self.finalize(key, base_name, frame_ext, source_path)
+
+    def open_stream(self, key):
+        """
+        Claim the final entry folder for a conversion that writes in place
+        (streaming). The entry only counts as cached once finalize() runs.
+        """
+        entry_dir = self.entry_dir(key)
+        with self._lock:
+            if os.path.isdir(entry_dir) and not self._read_complete_meta(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.makedirs(entry_dir, exist_ok=True)
+        return entry_dir
+
+    def finalize(self, key, base_name, frame_ext, source_path, complete=True, frames=None):
+        """
+        Write the IFL and metadata for an entry; returns the IFL path.
+        An incomplete entry (conversion stopped early) counts towards the size
+        limit and gets evicted like any other, but lookup() never returns it.
+        """
+        entry_dir = self.entry_dir(key)
+        if frames is None:
+            frames = list_sequence_frames(entry_dir, base_name, frame_ext)
+        ifl_name = f"{base_name}.ifl"
+        write_ifl(os.path.join(entry_dir, ifl_name), frames)
+        meta = {
+            "source": source_path.replace("\\", "/"),
+            "ifl": ifl_name,
+            "frames": len(frames),
+            "bytes": sum(os.path.getsize(fr) for fr in frames),
+            "created": time.time(),
+            "complete": complete,
+        }
+        with open(os.path.join(entry_dir, self.META_NAME), 'w') as f:
+            json.dump(meta, f, indent=1)
+        self.evict(protect=(key,))
+        return os.path.join(entry_dir, ifl_name).replace("\\", "/")
+
+    def entries(self):
+        """List finished entries (complete or not), most recently used first."""
+        result = []
+        if not os.path.isdir(self.root):
+            return result
+        for name in os.listdir(self.root):
+            entry_dir = self.entry_dir(name)
+            meta = self._read_meta(entry_dir)
+            if not meta:
+                continue
+            try:
+                last_used = os.path.getmtime(os.path.join(entry_dir, self.META_NAME))
+            except OSError:
+                continue
+            info = dict(meta)
+            info["key"] = name
+            info["last_used"] = last_used
+            result.append(info)
+        result.sort(key=lambda e: e["last_used"], reverse=True)
+        return result
+
+    def loose_files(self):
+        """Files in the loose folders as {'key': '<dir>/<name>', 'path', 'bytes', 'last_used'}."""
+        result = []
+        for sub in self.loose_dirs:
+            folder = os.path.join(self.root, sub)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name).replace("\\", "/")
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if os.path.isfile(path):
+                    result.append({"key": f"{sub}/{name}", "path": path,
+                                   "bytes": st.st_size, "last_used": st.st_mtime})
+        return result
+
+    def total_bytes(self):
+        return sum(e.get("bytes", 0) for e in self.entries() + self.loose_files())
+
+    def evict(self, protect=()):
+        """Drop least-recently-used entries and loose files until the cache fits in max_bytes."""
+        with self._lock:
+            items = self.entries() + self.loose_files()
+            items.sort(key=lambda e: e["last_used"], reverse=True)
+            total = sum(e.get("bytes", 0) for e in items)
+            for item in reversed(items):
+                if total <= self.max_bytes:
+                    break
+                if item["key"] in protect:
+                    continue
+                if "path" in item:
+                    try:
+                        os.remove(item["path"])
+                    except OSError:
+                        continue
+                else:
+                    shutil.rmtree(self.entry_dir(item["key"]), ignore_errors=True)
+                total -= item.get("bytes", 0)
+
+    def purge(self):
+        """
+        Delete every entry and staging folder (finished or not), plus the
+        `refcast_<name>_*` folders kept next to the cache in Max's temp
+        dir. Other folders under the root are left alone.
+        """
+        removed = 0
+        with self._lock:
+            if os.path.isdir(self.root):
+                for name in os.listdir(self.root):
+                    if self.KEY_DIR_RE.match(name):
+                        shutil.rmtree(self.entry_dir(name), ignore_errors=True)
+                        removed += 1
+            legacy_root = os.path.dirname(self.root)
+            if os.path.isdir(legacy_root):
+                for name in os.listdir(legacy_root):
+                    path = os.path.join(legacy_root, name)
+                    if name.startswith("refcast_") and os.path.isdir(path):
+                        shutil.rmtree(path, ignore_errors=True)
+                        removed += 1
+        return removed
+
+
+def default_ffmpeg_jobs():
+    cpu = os.cpu_count() or 4
+    return max(1, min(4, cpu // 2))
+
+
+def default_ffmpeg_threads(jobs):
+    cpu = os.cpu_count() or 4
+    return max(1, cpu // max(1, jobs))
+
+
+class VideoConversionScheduler(object):
+    """
+    Runs several FFmpeg conversions at once on a bounded pool.
+    Each job is a blocking subprocess, so threads (not processes) are enough;
+    `threads_per_job` caps FFmpeg's own threading so jobs don't oversubscribe.
+    """
+
+    def __init__(self, ffmpeg_path, temp_root, max_jobs=None, threads_per_job=None, cache=None,
+                 options=None, on_frames=None, on_progress=None, profiler=None):
+        self.ffmpeg_path = ffmpeg_path
+        self.temp_root = temp_root
+        self.cache = cache
+        self.options = options
+        # on_frames(video_path, ifl_path, count, finished) switches jobs to streaming
+        self.on_frames = on_frames
+        # on_progress(video_path, done_sec, total_sec, eta_sec), from the job threads
+        self.on_progress = on_progress
+        self.profiler = profiler or NULL_PROFILER
+        self.cancel_event = threading.Event()
+        self.max_jobs = max_jobs or default_ffmpeg_jobs()
+        self.threads_per_job = threads_per_job or default_ffmpeg_threads(self.max_jobs)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_jobs)
+        self._futures = {}
+
+    def submit(self, video_path):
+        progress_cb = None
+        if self.on_progress is not None:
+            progress_cb = functools.partial(self.on_progress, video_path)
+        if self.on_frames is not None:
+            def frames_cb(ifl_path, count, finished, v=video_path):
+                self.on_frames(v, ifl_path, count, finished)
+            future = self._pool.submit(self._run, stream_video_to_sequence, self.ffmpeg_path, video_path,
+                                       self.temp_root, self.threads_per_job, self.cache,
+                                       self.options, frames_cb, self.cancel_event, progress_cb)
+        else:
+            future = self._pool.submit(self._run, convert_video_to_sequence, self.ffmpeg_path, video_path,
+                                       self.temp_root, self.threads_per_job, self.cache,
+                                       self.options, self.cancel_event, progress_cb)
+        self._futures[future] = video_path
+        return future
+
+    def _run(self, fn, ffmpeg_path, video_path, *args):
+        with self.profiler.stage("ffmpeg", file=os.path.basename(video_path)):
+            return fn(ffmpeg_path, video_path, *args)
+
+    def results(self):
+        """Yield (video_path, ifl_path, error) in completion order."""
+        for future in as_completed(list(self._futures)):
+            video_path = self._futures.pop(future)
+            if future.cancelled():
+                continue
+            try:
+                ifl_path, err = future.result()
+            except Exception as e:
+                ifl_path, err = None, f"FFmpeg error: {str(e)}"
+            yield video_path, ifl_path, err
+
+    def cancel(self):
+        """Drop queued jobs and kill running FFmpeg processes (their partial frames are removed)."""
+        self.cancel_event.set()
+        for future in list(self._futures):
+            future.cancel()
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False)
+
+
+def ffmpeg_missing_message(video_path):
+    return (
+        f"Cannot load video '{os.path.basename(video_path)}'.\n"
+        f"FFmpeg is required for video support.\n\n"
+        f"Install FFmpeg:\n"
+        f"  winget install ffmpeg\n"
+        f"  or download from https://ffmpeg.org/download.html\n"
+        f"  and add to system PATH"
+    )
+
+
+def prepare_media(fpath, temp_root, ffmpeg_path=None, cache=None, video_options=None):
+    """
+    Resolve a dropped file to the path Max should load.
+    Safe to call off the main thread: no pymxs calls are made here.
+    Returns (load_path, error).
+    """
+    if not os.path.isfile(fpath):
+        return None, f"File not found: {os.path.basename(fpath)}"
+    ext = os.path.splitext(fpath)[1].lower()
+    if ext not in VIDEO_EXTENSIONS:
+        return fpath, None
+    if ffmpeg_path is None:
+        return None, ffmpeg_missing_message(fpath)
+    return convert_video_to_sequence(ffmpeg_path, fpath, temp_root, cache=cache,
+                                     options=video_options)
+
+
+# ==========================================
+# ===== IMAGE HEADER PROBE =====
+# ==========================================
+# Reads only the first bytes of a file, so sizes for hundreds of images are
+# known before Max decodes a single bitmap. Each reader returns (w, h) or None.
+
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _probe_png(f):
+    head = f.read(24)
+    if len(head) < 24 or head[:8] != b"\x89PNG\r\n\x1a\n" or head[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", head[16:24])
+
+
+def _probe_gif(f):
+    head = f.read(10)
+    if len(head) < 10 or head[:6] not in (b"GIF87a", b"GIF89a"):
+        return None
+    return struct.unpack("<HH", head[6:10])
+
+
+def _probe_bmp(f):
+    head = f.read(26)
+    if len(head) < 26 or head[:2] != b"BM":
+        return None
+    dib_size = struct.unpack("<I", head[14:18])[0]
+    if dib_size == 12:
+        return struct.unpack("<HH", head[18:22])
+    w, h = struct.unpack("<ii", head[18:26])
+    return w, abs(h)
+
+
+def _probe_tga(f):
+    head = f.read(18)
+    if len(head) < 18 or head[2] not in (1, 2, 3, 9, 10, 11):
+        return None
+    return struct.unpack("<HH", head[12:16])
+
+
+def _probe_jpeg(f):
+    if f.read(2) != b"\xff\xd8":
+        return None
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = f.read(1)
+        while marker == b"\xff":      # fill bytes
+            marker = f.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code == 0xD8 or 0xD0 <= code <= 0xD7 or code == 0x01:
+            continue                    # markers without a length
+        if code == 0xD9:
+            return None
+        seg = f.read(2)
+        if len(seg) < 2:
+            return None
+        seg_len = struct.unpack(">H", seg)[0]
+        if code in JPEG_SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            h, w = struct.unpack(">HH", data[1:5])
+            return w, h
+        f.seek(seg_len - 2, 1)
+
+
+def _probe_tiff(f):
+    head = f.read(8)
+    if head[:4] == b"II*\x00":
+        endian = "<"
+    elif head[:4] == b"MM\x00*":
+        endian = ">"
+    else:
+        return None
+    f.seek(struct.unpack(endian + "I", head[4:8])[0])
+    raw = f.read(2)
+    if len(raw) < 2:
+        return None
+    w = h = None
+    for _ in range(struct.unpack(endian + "H", raw)[0]):
+        entry = f.read(12)
+        if len(entry) < 12:
+            break
+        tag, typ = struct.unpack(endian + "HH", entry[:4])
+        if tag not in (256, 257):
+            continue
+        if typ == 3:
+            val = struct.unpack(endian + "H", entry[8:10])[0]
+        else:
+            val = struct.unpack(endian + "I", entry[8:12])[0]
+        if tag == 256: w = val
+        else: h = val
+        if w and h:
+            return w, h
+    return None
+
+
+def _probe_exr(f):
+    if f.read(8)[:4] != b"\x76\x2f\x31\x01":
+        return None
+    windows = {}
+    # Header: sequence of (name\0, type\0, int32 size, value), ended by a null byte
+    for _ in range(256):
+        name = _read_cstring(f)
+        if not name:
+            break
+        _read_cstring(f)
+        size = struct.unpack("<i", f.read(4))[0]
+        if name in (b"displayWindow", b"dataWindow") and size == 16:
+            x0, y0, x1, y1 = struct.unpack("<iiii", f.read(16))
+            windows[name] = (x1 - x0 + 1, y1 - y0 + 1)
+        else:
+            f.seek(size, 1)
+    return windows.get(b"displayWindow") or windows.get(b"dataWindow")
+
+
+def _read_cstring(f, limit=256):
+    out = bytearray()
+    while len(out) < limit:
+        c = f.read(1)
+        if not c or c == b"\x00":
+            break
+        out += c
+    return bytes(out)
+
+
+def _probe_hdr(f):
+    if not f.read(2) == b"#?":
+        return None
+    for _ in range(64):
+        line = f.readline(256).strip()
+        if line.startswith((b"-Y", b"+Y", b"-X", b"+X")):
+            parts = line.split()
+            if len(parts) != 4:
+                return None
+            dims = {parts[0][1:2]: int(parts[1]), parts[2][1:2]: int(parts[3])}
+            return dims.get(b"X"), dims.get(b"Y")
+    return None
+
+
+IMAGE_PROBES = {
+    '.png': _probe_png, '.gif': _probe_gif, '.bmp': _probe_bmp, '.tga': _probe_tga,
+    '.jpg': _probe_jpeg, '.jpeg': _probe_jpeg, '.tif': _probe_tiff, '.tiff': _probe_tiff,
+    '.exr': _probe_exr, '.hdr': _probe_hdr,
+}
+
+
+def first_ifl_frame(ifl_path):
+    """First image listed in an IFL, resolved relative to the IFL folder."""
+    try:
+        with open(ifl_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith(";"):
+                    continue
+                parts = line.rsplit(None, 1)
+                if len(parts) == 2 and parts[1].isdigit():
+                    line = parts[0]     # "frame.png 3" holds a frame for 3 ticks
+                if not os.path.isabs(line):
+                    line = os.path.join(os.path.dirname(ifl_path), line)
+                return line
+    except OSError:
+        pass
+    return None
+
+
+def probe_image_size(path):
+    """
+    Return (width, height) from the file header, or None if the format is
+    unknown or the header can't be parsed. IFLs report their first frame.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.ifl':
+        frame = first_ifl_frame(path)
+        return probe_image_size(frame) if frame else None
+    reader = IMAGE_PROBES.get(ext)
+    if reader is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            size = reader(f)
+    except (OSError, struct.error, ValueError, IndexError):
+        return None
+    if not size or not size[0] or not size[1] or size[0] <= 0 or size[1] <= 0:
+        return None
+    return int(size[0]), int(size[1])
+
+
+# ==========================================
+# ===== PLANE SPECS =====
+# ==========================================
+VIEW_ROTATIONS = {
+    "Front": (90, 0, 0), "Back": (90, 0, 180),
+    "Left": (90, 0, -90), "Right": (90, 0, 90),
+    "Top": (0, 0, 0), "Bottom": (180, 0, 0),
+}
+
+
+def get_pivot_world_offset(view_name, pivot_loc, final_w, final_h):
+    if pivot_loc == "Center":
+        return (0.0, 0.0, 0.0)
+
+    w2 = final_w / 2.0
+    h2 = final_h / 2.0
+    dx = dy = dz = 0.0
+
+    if view_name in ("Front", "Back"):
+        if "Bottom" in pivot_loc: dz = -h2
+        elif "Top" in pivot_loc: dz = h2
+        if "Left" in pivot_loc: dx = -w2
+        elif "Right" in pivot_loc: dx = w2
+    elif view_name == "Left":
+        if "Bottom" in pivot_loc: dz = -h2
+        elif "Top" in pivot_loc: dz = h2
+        if "Left" in pivot_loc: dy = w2
+        elif "Right" in pivot_loc: dy = -w2
+    elif view_name == "Right":
+        if "Bottom" in pivot_loc: dz = -h2
+        elif "Top" in pivot_loc: dz = h2
+        if "Left" in pivot_loc: dy = -w2
+        elif "Right" in pivot_loc: dy = w2
+    elif view_name == "Top":
+        if "Bottom" in pivot_loc: dy = -h2
+        elif "Top" in pivot_loc: dy = h2
+        if "Left" in pivot_loc: dx = -w2
+        elif "Right" in pivot_loc: dx = w2
+    elif view_name == "Bottom":
+        if "Bottom" in pivot_loc: dy = h2
+        elif "Top" in pivot_loc: dy = -h2
+        if "Left" in pivot_loc: dx = -w2
+        elif "Right" in pivot_loc: dx = w2
+
+    return (dx, dy, dz)
+
+
+def get_view_position(view_name, offset_val):
+    px = py = pz = 0.0
+    if view_name == "Front": py = offset_val
+    elif view_name == "Back": py = -offset_val
+    elif view_name == "Left": px = offset_val
+    elif view_name == "Right": px = -offset_val
+    elif view_name == "Top": pz = -offset_val
+    elif view_name == "Bottom": pz = offset_val
+    return (px, py, pz)
+
+
+def build_plane_spec(source_name, view_name, img_w, img_h, scale_val, offset_val, pivot_loc):
+    """Everything needed to place one plane, computed without touching Max."""
+    final_w = img_w * scale_val
+    final_h = img_h * scale_val
+    pos = get_view_position(view_name, offset_val)
+    pdx, pdy, pdz = get_pivot_world_offset(view_name, pivot_loc, final_w, final_h)
+    return {
+        'name': "Ref_" + view_name + "_" + source_name,
+        'width': final_w,
+        'length': final_h,
+        'rotation': VIEW_ROTATIONS.get(view_name, (0, 0, 0)),
+        'pos': pos,
+        'pivot': (pos[0] + pdx, pos[1] + pdy, pos[2] + pdz),
+    }
+
+
+# Local +X / +Y of a plane in each view, in world space
+VIEW_RIGHT_AXIS = {
+    "Front": (1, 0, 0), "Back": (-1, 0, 0),
+    "Left": (0, -1, 0), "Right": (0, 1, 0),
+    "Top": (1, 0, 0), "Bottom": (1, 0, 0),
+}
+VIEW_UP_AXIS = {
+    "Front": (0, 0, 1), "Back": (0, 0, 1),
+    "Left": (0, 0, 1), "Right": (0, 0, 1),
+    "Top": (0, 1, 0), "Bottom": (0, -1, 0),
+}
+
+
+def move_in_view(spec, view_name, dx, dy=0.0):
+    """Move a plane spec by (dx, dy) in the view's own right/up directions."""
+    rx = VIEW_RIGHT_AXIS.get(view_name, (1, 0, 0))
+    uy = VIEW_UP_AXIS.get(view_name, (0, 0, 1))
+    delta = tuple(r * dx + u * dy for r, u in zip(rx, uy))
+    spec = dict(spec)
+    spec['pos'] = tuple(p + d for p, d in zip(spec['pos'], delta))
+    spec['pivot'] = tuple(p + d for p, d in zip(spec['pivot'], delta))
+    return spec
+
+
+BOX_VIEWS = ["Front", "Back", "Left", "Right", "Top", "Bottom"]
+
+
+def views_for_file(mode, fpath, manual_view, detector=None, min_confidence=0.0):
+    """
+    Views to build for one file in the given setup mode, plus the material
+    name prefix. Smart Detect returns no views when nothing matched or the
+    match is below `min_confidence`; the caller decides whether to review.
+    """
+    if "Manual" in mode:
+        return [manual_view], "Ref_"
+    if "Box" in mode:
+        return list(BOX_VIEWS), "Ref_Box_"
+    if "Smart" in mode:
+        match = (detector or VIEW_DETECTOR).match(fpath)
+        if match.view and match.confidence >= min_confidence:
+            return [match.view], "Ref_"
+        return [], "Ref_"
+    return [], "Ref_"
+
+
+def plane_specs_for_file(fpath, size, mode, views, scale_val, offsets, pivot_loc):
+    offset_w, offset_h = offsets
+    specs = []
+    for v in views:
+        # Box Mode pushes Top/Bottom out by the height; other modes use one offset
+        use_offset = offset_h if ("Box" in mode and v in ("Top", "Bottom")) else offset_w
+        specs.append(build_plane_spec(os.path.basename(fpath), v, size[0], size[1],
+                                      scale_val, use_offset, pivot_loc))
+    return specs
+
+
+def commit_plane_specs(runtime, entries, props, layer_name):
+    """
+    Build planes from (spec, tex, mat, mat_key, full_path, proxy_path) entries
+    with a single REFCAST_BUILD_PLANES_FN call on `runtime` (pymxs.runtime or
+    a stand-in). Returns the new nodes, already on the layer.
+    """
+    if not entries:
+        return []
+    names, widths, lengths, mats, texs, xforms = [], [], [], [], [], []
+    mat_keys, full_paths, proxy_paths = [], [], []
+    for spec, tex, mat, mat_key, full_path, proxy_path in entries:
+        names.append(spec['name'])
+        widths.append(spec['width'])
+        lengths.append(spec['length'])
+        mats.append(mat)
+        texs.append(tex)
+        xforms.extend(float(v) for v in spec['rotation'] + spec['pos'] + spec['pivot'])
+        mat_keys.append(mat_key or "")
+        full_paths.append(full_path or "")
+        proxy_paths.append(proxy_path or "")
+    nodes = runtime.REFCAST_BUILD_PLANES_FN(
+        names, widths, lengths, mats, texs, xforms, mat_keys, full_paths, proxy_paths,
+        layer_name, props['opacity'], props['gray'], props['freeze'], props['cull'],
+        props['renderable'], props['cast'], props['rcv'])
+    return list(nodes)
+
+
+# ==========================================
+# ===== BOARD LAYOUT =====
+# ==========================================
+# Manual mode boards: where each plane goes so a batch doesn't stack up.
+# Sizes are the final plane sizes (pixels * scale); results are plane
+# centres in view units (+X right, +Y up), with the board centred on 0,0.
+LAYOUT_MODES = ["stacked", "grid", "row", "masonry"]
+LAYOUT_DEFAULT_SPACING = 10.0
+
+
+def _auto_columns(n, columns):
+    return columns if columns > 0 else max(1, int(math.ceil(math.sqrt(n))))
+
+
+def layout_board(sizes, mode="grid", spacing=LAYOUT_DEFAULT_SPACING, columns=0):
+    """One pass over `sizes` [(w, h)] -> centres [(x, y)] in the same order."""
+    n = len(sizes)
+    if n == 0 or mode == "stacked":
+        return [(0.0, 0.0)] * n
+
+    centres = []
+    if mode == "row":
+        x = 0.0
+        for w, h in sizes:
+            centres.append((x + w / 2.0, 0.0))
+            x += w + spacing
+    elif mode == "masonry":
+        cols = _auto_columns(n, columns)
+        col_w = max(w for w, _ in sizes)
+        heights = [0.0] * cols
+        for w, h in sizes:
+            c = heights.index(min(heights))     # shortest column takes the next image
+            centres.append((c * (col_w + spacing) + col_w / 2.0, -(heights[c] + h / 2.0)))
+            heights[c] += h + spacing
+    else:   # grid: uniform cells sized to the largest image
+        cols = _auto_columns(n, columns)
+        cell_w = max(w for w, _ in sizes)
+        cell_h = max(h for _, h in sizes)
+        for i in range(n):
+            r, c = divmod(i, cols)
+            centres.append((c * (cell_w + spacing) + cell_w / 2.0, -(r * (cell_h + spacing) + cell_h / 2.0)))
+
+    # Centre the board's bounding box on the origin
+    min_x = min(cx - w / 2.0 for (cx, _), (w, _) in zip(centres, sizes))
+    max_x = max(cx + w / 2.0 for (cx, _), (w, _) in zip(centres, sizes))
+    min_y = min(cy - h / 2.0 for (_, cy), (_, h) in zip(centres, sizes))
+    max_y = max(cy + h / 2.0 for (_, cy), (_, h) in zip(centres, sizes))
+    ox, oy = (min_x + max_x) / 2.0, (min_y + max_y) / 2.0
+    return [(cx - ox, cy - oy) for cx, cy in centres]
+
+
+# ==========================================
+# ===== ATLAS PACKING =====
+# ==========================================
+# Mood boards of many small images: pack them into a few large sheets so
+# the viewport binds one texture per sheet instead of one per image.
+ATLAS_DIRNAME = "RefCast_Atlas"        # next to the frame cache: the only copy of atlas textures
+ATLAS_DEFAULT_SHEET = 4096             # max sheet edge (px)
+ATLAS_DEFAULT_CELL = 512               # max edge of one image inside a sheet (px)
+ATLAS_DEFAULT_PADDING = 4              # px between images
+ATLAS_SHEET_GAP = 0.05                 # gap between sheets, relative to sheet width
+ATLAS_PROP = "RefCast_Atlas"
+
+
+def fit_size(w, h, max_edge):
+    """(w, h) scaled down so the longer side is at most max_edge (never up)."""
+    if max_edge <= 0 or max(w, h) <= max_edge:
+        return int(w), int(h)
+    f = float(max_edge) / max(w, h)
+    return max(1, int(round(w * f))), max(1, int(round(h * f)))
+
+
+def pack_atlas(sizes, sheet_edge=ATLAS_DEFAULT_SHEET, padding=ATLAS_DEFAULT_PADDING):
+    """
+    Shelf bin-packing, tallest images first. `sizes` = [(w, h)] already fitted
+    to the sheet. Returns sheets [{'width', 'height', 'items': [(index, x, y, w, h)]}]
+    with each sheet trimmed to the area actually used.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (sizes[i][1], sizes[i][0]), reverse=True)
+    sheets = []
+    sheet = None
+    for i in order:
+        w, h = sizes[i]
+        w, h = min(w, sheet_edge), min(h, sheet_edge)
+        if sheet is not None:
+            # next slot on the current shelf, else a new shelf, else a new sheet
+            if sheet['x'] + w > sheet_edge:
+                sheet['y'] += sheet['shelf_h'] + padding
+                sheet['x'] = 0
+                sheet['shelf_h'] = 0
+            if sheet['y'] + h > sheet_edge:
+                sheet = None
+        if sheet is None:
+            sheet = {'width': 0, 'height': 0, 'items': [], 'x': 0, 'y': 0, 'shelf_h': 0}
+            sheets.append(sheet)
+        sheet['items'].append((i, sheet['x'], sheet['y'], w, h))
+        sheet['width'] = max(sheet['width'], sheet['x'] + w)
+        sheet['height'] = max(sheet['height'], sheet['y'] + h)
+        sheet['x'] += w + padding
+        sheet['shelf_h'] = max(sheet['shelf_h'], h)
+    return [{'width': sh['width'], 'height': sh['height'], 'items': sh['items']} for sh in sheets]
+
+
+def atlas_mesh_quads(sheet, scale_val):
+    """
+    8 floats per image for REFCAST_BUILD_ATLAS_MESH_FN: the quad in local
+    units (sheet centred on the origin, +Y up) and its UV island.
+    """
+    sw, sh = float(sheet['width']), float(sheet['height'])
+    quads = []
+    for _, x, y, w, h in sheet['items']:
+        x0 = (x - sw / 2.0) * scale_val
+        x1 = (x + w - sw / 2.0) * scale_val
+        y1 = (sh / 2.0 - y) * scale_val
+        y0 = (sh / 2.0 - y - h) * scale_val
+        quads.extend([x0, y0, x1, y1, x / sw, 1.0 - (y + h) / sh, (x + w) / sw, 1.0 - y / sh])
+    return quads
+
+
+def atlas_sheet_shifts(sheets, scale_val):
+    """Offset of each sheet's centre along the view's +X, so sheets sit side by side."""
+    widths = [sh['width'] * scale_val for sh in sheets]
+    gap = max(widths) * ATLAS_SHEET_GAP if widths else 0.0
+    total = sum(widths) + gap * (len(widths) - 1)
+    shifts, cursor = [], -total / 2.0
+    for w in widths:
+        shifts.append(cursor + w / 2.0)
+        cursor += w + gap
+    return shifts
+
+
+def commit_atlas_mesh(runtime, name, sheet, scale_val, mat, tex, spec, props, layer_name):
+    """Build one sheet as a UV-island mesh (REFCAST_BUILD_ATLAS_MESH_FN) at the spec's placement."""
+    xform = [float(v) for v in spec['rotation'] + spec['pos']]
+    return runtime.REFCAST_BUILD_ATLAS_MESH_FN(
+        name, atlas_mesh_quads(sheet, scale_val), mat, tex, xform, sheet['path'], layer_name,
+        props['opacity'], props['gray'], props['freeze'], props['cull'],
+        props['renderable'], props['cast'], props['rcv'])
+
+
+def atlas_cache_key(paths, sheet_edge, cell_edge, padding):
+    """Sheets are reused when the same files (unchanged) are packed with the same settings."""
+    ident = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            ident.append([normalize_path(os.path.abspath(p)), st.st_size, int(st.st_mtime)])
+        except OSError:
+            ident.append([normalize_path(os.path.abspath(p)), 0, 0])
+    ident.append([sheet_edge, cell_edge, padding])
+    return hashlib.sha1(json.dumps(ident).encode('utf-8')).hexdigest()[:16]
+
+
+# ==========================================
+# ===== PROXY TEXTURES =====
+# ==========================================
+PROXY_DIRNAME = "proxies"     # inside the frame cache root, counted and evicted with it
+PROXY_DEFAULT_EDGE = 2048
+PROXY_PROP_FULL = "RefCast_FullRes"     # node user props used by the proxy swap
+PROXY_PROP_PROXY = "RefCast_Proxy"
+
+
+def proxy_cache_path(src_path, max_edge, proxy_root):
+    """Cached proxy location for a source image, without extension."""
+    st = os.stat(src_path)
+    ident = [os.path.normcase(os.path.abspath(src_path)), st.st_size, int(st.st_mtime), max_edge]
+    key = hashlib.sha1(json.dumps(ident).encode("utf-8")).hexdigest()
+    return os.path.join(proxy_root, key).replace("\\", "/")
+
+
+# ==========================================
+# ===== SHARED FADE =====
+# ==========================================
+# Optional fade groups (see REFCAST_FADE_* in MAXSCRIPT_HELPERS): one
+# instanced visibility controller per group instead of one per node.
+FADE_ALL_KEY = "all"
+FADE_SCOPES = ["All References", "Per Import"]
+
+
+def fade_group_key(scope):
+    """Group key for the planes of a new import: one shared group, or one per import."""
+    if scope == FADE_SCOPES[0]:
+        return FADE_ALL_KEY
+    return f"import_{int(time.time() * 1000):x}"
+
+
+# ==========================================
+# ===== CLIPBOARD IMAGES =====
+# ==========================================
+# Pasted images are named after a hash of their pixels, so pasting the same
+# image again finds the file already written and the import reuses its
+# texture and material. Kept next to the frame cache, not inside it: these
+# are the only copy of the image and must survive a cache purge.
+CLIPBOARD_DIRNAME = "RefCast_Clipboard"
+CLIPBOARD_PNG_QUALITY = 80    # Qt maps this to zlib level 1: lossless, several times faster than the default
+
+
+def clipboard_image_key(pixels, width, height):
+    """Content key for a 32-bit ARGB pixel buffer (any bytes-like object)."""
+    h = hashlib.blake2b(digest_size=10)
+    h.update(struct.pack('<2I', width, height))
+    h.update(pixels)
+    return h.hexdigest()
+
+
+def clipboard_image_path(root, key):
+    return os.path.join(root, f"clipboard_{key}.png").replace("\\", "/")
+
+
+# ==========================================
+# ===== SCENE INDEX =====
+# ==========================================
+# What produced each RefCast node, saved with the .max file so select,
+# relink and stats are dictionary lookups by node handle instead of layer
+# scans. Node handles are persistent across save / load.
+INDEX_PROP = "RefCast_Index"
+INDEX_VERSION = 1
+HASH_SAMPLE_BYTES = 64 * 1024
+
+
+def file_signature(path):
+    """
+    {'size', 'mtime', 'hash'} for a source file, or None if it's gone.
+    The hash samples the head and tail only, so it stays cheap on big videos.
+    """
+    try:
+        st = os.stat(path)
+        h = hashlib.sha1(str(st.st_size).encode("ascii"))
+        with open(path, 'rb') as f:
+            h.update(f.read(HASH_SAMPLE_BYTES))
+            if st.st_size > HASH_SAMPLE_BYTES * 2:
+                f.seek(-HASH_SAMPLE_BYTES, os.SEEK_END)
+                h.update(f.read(HASH_SAMPLE_BYTES))
+    except OSError:
+        return None
+    return {'size': st.st_size, 'mtime': int(st.st_mtime), 'hash': h.hexdigest()}
+
+
+def index_record(source, view, mode, settings, load_path=None, size=None, signature=None, proxy=None):
+    """One index entry; `settings` is the import snapshot the plane was built with."""
+    return {
+        'source': source,
+        'load': load_path or source,
+        'view': view,
+        'mode': mode,
+        'size': list(size) if size else None,
+        'sig': signature,
+        'proxy': proxy,
+        'settings': {k: settings[k] for k in ('scale', 'pivot', 'mat_type', 'use_alpha', 'proxy_edge')
+                     if k in settings},
+    }
+
+
+class ReferenceIndex(object):
+    """Node handle -> record, plus a reverse map from source file to handles."""
+
+    def __init__(self, records=None):
+        self.records = {}
+        self.by_source = {}
+        for handle, record in (records or {}).items():
+            self.add(int(handle), record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, handle, record):
+        self.remove(handle)
+        self.records[handle] = record
+        self.by_source.setdefault(normalize_path(record['source']), set()).add(handle)
+
+    def remove(self, handle):
+        record = self.records.pop(handle, None)
+        if record is None:
+            return
+        key = normalize_path(record['source'])
+        handles = self.by_source.get(key)
+        if handles is not None:
+            handles.discard(handle)
+            if not handles:
+                del self.by_source[key]
+
+    def get(self, handle):
+        return self.records.get(handle)
+
+    def handles(self):
+        return list(self.records)
+
+    def handles_for_source(self, path):
+        return list(self.by_source.get(normalize_path(path), ()))
+
+    def sources(self):
+        """One original path per indexed source file."""
+        return [self.records[next(iter(h))]['source'] for h in self.by_source.values()]
+
+    def relink(self, old_path, new_path):
+        """Point every record of `old_path` at `new_path`; returns the handles touched."""
+        handles = self.handles_for_source(old_path)
+        for handle in handles:
+            record = dict(self.records[handle])
+            if normalize_path(record['load']) == normalize_path(old_path):
+                record['load'] = new_path
+            record['source'] = new_path
+            record['proxy'] = None
+            record['sig'] = None
+            self.add(handle, record)
+        return handles
+
+    def update_source(self, path, **fields):
+        """Set `fields` on every record of `path` (e.g. a new signature after a re-sync)."""
+        for handle in self.handles_for_source(path):
+            self.records[handle] = dict(self.records[handle], **fields)
+
+    def stats(self):
+        by_mode = collections.Counter(r['mode'] for r in self.records.values())
+        by_view = collections.Counter(r['view'] for r in self.records.values())
+        return {'nodes': len(self.records), 'sources': len(self.by_source),
+                'by_mode': dict(by_mode), 'by_view': dict(by_view)}
+
+    def to_json(self):
+        return json.dumps({'version': INDEX_VERSION,
+                           'nodes': {str(h): r for h, r in self.records.items()}},
+                          separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, raw):
+        """Empty index for missing, corrupt or newer-version data."""
+        try:
+            data = json.loads(raw) if raw else {}
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+            return cls()
+        return cls(data.get('nodes'))
+
+
+def find_changed_sources(index):
+    """
+    Compare indexed sources with the disk: (changed, touched, missing).
+    changed / touched are [(source, new signature)]; touched files have a new
+    mtime but identical content. Files whose size and mtime still match are
+    not opened at all, so a large board costs one stat per file.
+    """
+    changed, touched, missing = [], [], []
+    for source in index.sources():
+        record = index.get(index.handles_for_source(source)[0])
+        old = record.get('sig')
+        try:
+            st = os.stat(source)
+        except OSError:
+            missing.append(source)
+            continue
+        if old and st.st_size == old['size'] and int(st.st_mtime) == old['mtime']:
+            continue
+        sig = file_signature(source)
+        if sig is None:
+            missing.append(source)
+        elif old is None or sig['hash'] == old['hash']:
+            touched.append((source, sig))   # no baseline yet, or only re-saved
+        else:
+            changed.append((source, sig))
+    return changed, touched, missing
+
+
+def read_scene_index(runtime):
+    """(index, raw JSON) from the open scene's file properties."""
+    raw = runtime.REFCAST_INDEX_READ_FN(INDEX_PROP) or ""
+    return ReferenceIndex.from_json(raw), raw
+
+
+def write_scene_index(runtime, index):
+    """Save `index` into the scene; returns the raw JSON written."""
+    raw = index.to_json()
+    runtime.REFCAST_INDEX_WRITE_FN(INDEX_PROP, raw)
+    return raw
+
+
+def index_new_nodes(runtime, index, nodes, records):
+    """Add freshly built `nodes` (one runtime call for all handles)."""
+    if not nodes:
+        return
+    for handle, record in zip(runtime.REFCAST_NODE_HANDLES_FN(nodes), records):
+        if handle:
+            index.add(int(handle), record)
+
+
+def index_legacy_nodes(runtime, index, layer_name):
+    """
+    Add records for textured planes on the layer that the index doesn't know
+    (built before the index existed), in one runtime call. Their view and
+    size are unknown; the first sync gives them a signature. Returns how many
+    were added.
+    """
+    added = 0
+    for row in runtime.REFCAST_LAYER_SOURCES_FN(layer_name) or ():
+        handle, source, load_path, proxy = int(row[0]), row[1], row[2], row[3]
+        if not source or index.get(handle) is not None:
+            continue
+        index.add(handle, index_record(source, "", "legacy", {}, load_path, proxy=proxy or None))
+        added += 1
+    return added
+
+
+def resolve_index_pairs(runtime, index, handles):
+    """[(handle, node)] for the live nodes of `handles` in one call; handles of deleted nodes are dropped from the index."""
+    if not handles:
+        return []
+    pairs = []
+    for handle, node in zip(handles, runtime.REFCAST_NODES_BY_HANDLE_FN(list(handles))):
+        if node is None:
+            index.remove(handle)
+        else:
+            pairs.append((handle, node))
+    return pairs
+
+
+def resolve_index_nodes(runtime, index, handles):
+    """Live nodes for `handles` (see resolve_index_pairs)."""
+    return [node for _, node in resolve_index_pairs(runtime, index, handles)]
+
+
+# ==========================================
+# ===== SMART VIEW DETECTION =====
+# ==========================================
+# Priority ordered: each entry = (view, exact_tokens, substring_patterns).
+# Supports full names, abbreviations, prefixes, suffixes, multi-language
+# hints and common 3D naming conventions.
+VIEW_RULES = [
+    ("Front",
+     {"front", "fv", "fnt", "frnt", "f_view", "frontview", "anterior", "fwd", "forward", "facade", "face"},
+     {"_front", "front_", "-front", "front-", ".front", "_fv", "fv_", "_fnt"}),
+    ("Back",
+     {"back", "bv", "bck", "bk", "rear", "b_view", "backview", "posterior", "behind", "dorsal"},
+     {"_back", "back_", "-back", "back-", ".back", "_bv", "bv_", "_bck", "_rear"}),
+    ("Left",
+     {"left", "lv", "lft", "lt", "l_view", "leftview", "lside", "l_side", "gauche", "izquierda"},
+     {"_left", "left_", "-left", "left-", ".left", "_lv", "lv_", "_lft"}),
+    ("Right",
+     {"right", "rv", "rgt", "rt", "r_view", "rightview", "rside", "r_side", "droite", "derecha"},
+     {"_right", "right_", "-right", "right-", ".right", "_rv", "rv_", "_rgt"}),
+    ("Top",
+     {"top", "tv", "tp", "t_view", "topview", "above", "up", "overhead", "ceil", "upper", "plan"},
+     {"_top", "top_", "-top", "top-", ".top", "_tv", "tv_"}),
+    ("Bottom",
+     {"bottom", "bov", "bot", "btm", "bt", "b_view", "bottomview", "below",
+      "down", "under", "ventral", "floor", "base", "sole", "lower"},
+     {"_bottom", "bottom_", "-bottom", "bottom-", ".bottom", "_bot", "bot_", "_btm", "btm_"}),
+]
+
+# Last resort: loose contains (unambiguous long keywords only)
+VIEW_LOOSE_KEYWORDS = [
+    ("Front", ["front", "anterior", "forward", "facade"]),
+    ("Back",  ["back", "rear", "posterior", "behind"]),
+    ("Left",  ["left"]),
+    ("Right", ["right"]),
+    ("Top",   ["top", "above", "overhead"]),
+    ("Bottom",["bottom", "below", "under"]),
+]
+
+VIEW_CACHE_SIZE = 65536
+_TOKEN_SPLIT_RE = re.compile(r'[\s_\-\.]+')
+
+# Confidence of a hit per pass, scaled by the rule's own "confidence"
+VIEW_PASS_CONFIDENCE = {'token': 1.0, 'pattern': 0.8, 'loose': 0.6}
+# Names that hit rules for more than one view (e.g. "front_back") keep the
+# highest-priority view but are scaled down so they go to review
+VIEW_AMBIGUOUS_FACTOR = 0.5
+SMART_MIN_CONFIDENCE = 0.7
+
+# Rule packs picked up automatically from the plugin folder
+VIEW_RULE_PACK_NAMES = ["RefCast_ViewRules.json", "RefCast_ViewRules.toml"]
+
+ViewMatch = collections.namedtuple('ViewMatch', 'view confidence rule keyword')
+NO_VIEW_MATCH = ViewMatch(None, 0.0, None, None)
+
+
+def builtin_view_rules():
+    """VIEW_RULES + VIEW_LOOSE_KEYWORDS as rule dicts, in priority order."""
+    loose = dict(VIEW_LOOSE_KEYWORDS)
+    return [{'name': f"builtin:{view}", 'view': view, 'tokens': set(tokens),
+             'patterns': set(patterns), 'loose': list(loose.get(view, [])), 'confidence': 1.0}
+            for view, tokens, patterns in VIEW_RULES]
+
+
+def _compile_view_scan(entries):
+    """
+    Compile a priority-ordered [(rank, patterns)] list into one combined
+    regex (a gate that rejects most names in a single C-level scan) plus
+    one regex per rule, tried in priority order only when the gate hits.
+    """
+    def alternation(patterns):
+        return "|".join(re.escape(p) for p in sorted(patterns, key=len, reverse=True))
+    entries = [(rank, patterns) for rank, patterns in entries if patterns]
+    if not entries:
+        return None
+    gate = re.compile(alternation([p for _, patterns in entries for p in patterns]))
+    per_rule = [(rank, re.compile(alternation(patterns)).search) for rank, patterns in entries]
+    return gate.search, per_rule
+
+
+def _scan_rules(compiled, name):
+    """Every (rank, keyword) hit for `name`, highest priority first."""
+    if compiled is None:
+        return []
+    gate, per_rule = compiled
+    if gate(name) is None:
+        return []
+    hits = []
+    for rank, search in per_rule:
+        m = search(name)
+        if m:
+            hits.append((rank, m.group(0)))
+    return hits
+
+
+class ViewDetector(object):
+    """
+    View rules compiled once: exact tokens go into a single dict
+    (token -> highest-priority rule), substring and loose passes into gated
+    regex scans. Results are memoized per basename.
+    """
+
+    def __init__(self, rules=None, cache_size=VIEW_CACHE_SIZE):
+        self.rules = builtin_view_rules() if rules is None else list(rules)
+        self.token_rank = {}
+        for rank, rule in enumerate(self.rules):
+            for t in rule['tokens']:
+                self.token_rank.setdefault(t, rank)
+        self.pattern_scan = _compile_view_scan([(r, rule['patterns']) for r, rule in enumerate(self.rules)])
+        self.loose_scan = _compile_view_scan([(r, rule['loose']) for r, rule in enumerate(self.rules)])
+        self.match_basename = functools.lru_cache(maxsize=cache_size)(self._match_basename)
+
+    def _result(self, hits, kind):
+        rank, keyword = min(hits) if len(hits) > 1 else hits[0]
+        rule = self.rules[rank]
+        confidence = VIEW_PASS_CONFIDENCE[kind] * rule['confidence']
+        if len(hits) > 1 and len({self.rules[r]['view'] for r, _ in hits}) > 1:
+            confidence *= VIEW_AMBIGUOUS_FACTOR
+        return ViewMatch(rule['view'], round(confidence, 3), rule['name'], keyword)
+
+    def _match_basename(self, basename):
+        name = os.path.splitext(basename)[0].lower()
+        # Pass 1: exact token match (highest confidence)
+        hits = [(self.token_rank[t], t) for t in _TOKEN_SPLIT_RE.split(name) if t in self.token_rank]
+        if hits:
+            return self._result(hits, 'token')
+        # Pass 2: substring match
+        hits = _scan_rules(self.pattern_scan, name)
+        if hits:
+            return self._result(hits, 'pattern')
+        # Pass 3: loose contains
+        hits = _scan_rules(self.loose_scan, name)
+        if hits:
+            return self._result(hits, 'loose')
+        return NO_VIEW_MATCH
+
+    def match(self, filename):
+        return self.match_basename(os.path.basename(filename))
+
+    def detect(self, filename):
+        return self.match(filename).view
+
+    def detect_many(self, paths):
+        return [self.detect(p) for p in paths]
+
+
+def _load_rule_pack_data(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.toml':
+        try:
+            import tomllib as toml_reader
+        except ImportError:
+            try:
+                import tomli as toml_reader
+            except ImportError:
+                return None, "TOML rule packs need Python 3.11+ or the 'tomli' package. Use JSON instead."
+        with open(path, 'rb') as f:
+            return toml_reader.load(f), None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f), None
+
+
+def load_view_rule_pack(path):
+    """
+    Read a JSON or TOML rule pack:
+
+        {"name": "Studio", "replace_builtin": false,
+         "rules": [{"view": "Front", "tokens": ["south"], "patterns": ["_elev_s"],
+                    "loose": ["southelevation"], "confidence": 0.9}]}
+
+    Returns (pack, error); pack = {'name', 'replace_builtin', 'rules'}.
+    """
+    try:
+        data, err = _load_rule_pack_data(path)
+    except Exception as e:
+        return None, f"{os.path.basename(path)}: {e}"
+    if err:
+        return None, err
+    if not isinstance(data, dict) or not isinstance(data.get('rules'), list):
+        return None, f"{os.path.basename(path)}: expected a 'rules' list"
+
+    pack_name = str(data.get('name') or os.path.splitext(os.path.basename(path))[0])
+    rules = []
+    for i, entry in enumerate(data['rules']):
+        view = str(entry.get('view', '')).capitalize()
+        if view not in BOX_VIEWS:
+            return None, f"{pack_name}: rule {i + 1} has unknown view '{entry.get('view')}'"
+        try:
+            confidence = float(entry.get('confidence', 1.0))
+        except (TypeError, ValueError):
+            confidence = -1.0
+        if not 0.0 < confidence <= 1.0:
+            return None, f"{pack_name}: rule {i + 1} confidence must be in (0, 1]"
+        rules.append({
+            'name': f"{pack_name}:{entry.get('name') or view}",
+            'view': view,
+            'tokens': {str(t).lower() for t in entry.get('tokens', [])},
+            'patterns': {str(t).lower() for t in entry.get('patterns', [])},
+            'loose': [str(t).lower() for t in entry.get('loose', [])],
+            'confidence': confidence,
+        })
+    return {'name': pack_name, 'replace_builtin': bool(data.get('replace_builtin')), 'rules': rules}, None
+
+
+def find_view_rule_packs(folders):
+    found = []
+    for folder in folders:
+        for fname in VIEW_RULE_PACK_NAMES:
+            path = os.path.join(folder, fname)
+            if os.path.isfile(path):
+                found.append(path)
+    return found
+
+
+def build_view_detector(pack_paths=()):
+    """
+    Compile rule packs (in order, ahead of the built-in rules so studio
+    conventions win) into a ViewDetector. Returns (detector, pack_names, errors);
+    packs that fail to load are skipped.
+    """
+    rules, names, errors = [], [], []
+    keep_builtin = True
+    for path in pack_paths:
+        pack, err = load_view_rule_pack(path)
+        if err:
+            errors.append(err)
+            continue
+        rules.extend(pack['rules'])
+        names.append(pack['name'])
+        if pack['replace_builtin']:
+            keep_builtin = False
+    if keep_builtin:
+        rules.extend(builtin_view_rules())
+    return ViewDetector(rules), names, errors
+
+
+VIEW_DETECTOR = ViewDetector()
+
+
+def detect_view_from_name(filename):
+    """View ("Front", "Back", ...) hinted by a filename, or None."""
+    return VIEW_DETECTOR.detect(filename)
+
+
+def detect_views(paths):
+    """Batch form of detect_view_from_name: one result per path, in order."""
+    return VIEW_DETECTOR.detect_many(paths)
+
+
+def match_views(paths, detector=None):
+    """ViewMatch (view, confidence, rule, keyword) per path, in order."""
+    detector = detector or VIEW_DETECTOR
+    return [detector.match(p) for p in paths]
+
+
+# ==========================================
+# ===== IMPORT PROFILING =====
+# ==========================================
+# Opt-in: an import given an ImportProfiler records one span per stage
+# (with the pymxs round-trips made inside it, when the runtime is wrapped in
+# CountingRuntime). NULL_PROFILER is the do-nothing default.
+PROFILE_DIRNAME = "RefCast_Profiles"     # next to the frame cache, so a purge keeps saved traces
+
+
+class ImportProfiler(object):
+    """Per-stage spans and runtime call counts, exportable as a Chrome trace."""
+
+    enabled = True
+
+    def __init__(self, label="import"):
+        self.label = label
+        self.origin = time.perf_counter()
+        self.wall_start = time.time()
+        self.events = []            # (name, thread id, start s, duration s, calls Counter, args)
+        self.calls = collections.Counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextlib.contextmanager
+    def stage(self, name, **args):
+        calls = collections.Counter()
+        stack = self._stack()
+        stack.append(calls)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                self.events.append((name, threading.get_ident(), start - self.origin, duration, calls, args))
+
+    def count(self, name):
+        """One runtime round-trip, charged to every open stage on this thread."""
+        for calls in self._stack():
+            calls[name] += 1
+        with self._lock:
+            self.calls[name] += 1
+
+    def totals(self):
+        """{stage: {'count', 'seconds', 'max', 'calls'}} in first-seen order."""
+        result = collections.OrderedDict()
+        with self._lock:
+            events = list(self.events)
+        for name, _, _, duration, calls, _ in sorted(events, key=lambda e: e[2]):
+            t = result.setdefault(name, {'count': 0, 'seconds': 0.0, 'max': 0.0, 'calls': 0})
+            t['count'] += 1
+            t['seconds'] += duration
+            t['max'] = max(t['max'], duration)
+            t['calls'] += sum(calls.values())
+        return result
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.origin
+        lines = [f"[RefCast] Profile '{self.label}': {elapsed * 1000:.0f} ms, "
+                 f"{sum(self.calls.values())} runtime calls",
+                 f"  {'stage':<18}{'n':>6}{'total ms':>11}{'mean ms':>10}{'max ms':>10}{'rt calls':>10}"]
+        for name, t in self.totals().items():
+            lines.append(f"  {name:<18}{t['count']:>6}{t['seconds'] * 1000:>11.1f}"
+                         f"{t['seconds'] * 1000 / t['count']:>10.2f}{t['max'] * 1000:>10.1f}{t['calls']:>10}")
+        if self.calls:
+            top = ", ".join(f"{n} {c}" for n, c in self.calls.most_common(8))
+            lines.append(f"  top runtime calls: {top}")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Trace Event Format dict (open in chrome://tracing or ui.perfetto.dev)."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+        trace = []
+        for name, tid, start, duration, calls, args in events:
+            event_args = {str(k): v for k, v in args.items()}
+            if calls:
+                event_args['runtime_calls'] = dict(calls)
+            trace.append({'name': name, 'cat': "refcast", 'ph': "X", 'pid': pid, 'tid': tid,
+                          'ts': round(start * 1e6, 1), 'dur': round(duration * 1e6, 1), 'args': event_args})
+        return {'traceEvents': trace, 'displayTimeUnit': "ms",
+                'otherData': {'label': self.label, 'started': self.wall_start,
+                              'runtime_calls': dict(self.calls), 'stages': self.totals()}}
+
+    def write_trace(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+
+class _NullProfiler(object):
+    enabled = False
+
+    @contextlib.contextmanager
+    def stage(self, name, **args):
+        yield
+
+    def count(self, name):
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+class CountingRuntime(object):
+    """
+    Wraps pymxs.runtime (or a stand-in) and counts each runtime function
+    call and each global write, by name. Handed only to the code paths being
+    profiled, which use it call-style (`runtime.fn(...)`): pymxs wrappers are
+    all callable, so a value read through it would come back as a function.
+    """
+
+    def __init__(self, runtime, profiler):
+        object.__setattr__(self, '_runtime', runtime)
+        object.__setattr__(self, '_profiler', profiler)
+
+    def __getattr__(self, name):
+        fn = getattr(self._runtime, name)
+        profiler = self._profiler
+
+        def counted(*args, **kwargs):
+            profiler.count(name)
+            return fn(*args, **kwargs)
+        return counted
+
+    def __setattr__(self, name, value):
+        self._profiler.count(name)
+        setattr(self._runtime, name, value)
@@ -16,6 +16,7 @@ import os
 import sys
 import base64
 import shutil
+import importlib
 
 try:
     import pymxs
@@ -49,21 +50,26 @@ def get_max_paths():
     return user_scripts, user_macros, user_icons
 
 
+PLUGIN_FILES = ["RefCast_V1.py", "RefCast_Core.py"]
+
+
 def install_main_script(user_scripts):
-    """Copy RefCast_V1.py to Max's user scripts folder."""
-    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), "RefCast_V1.py")
-    dst = os.path.join(user_scripts, "RefCast_V1.py")
+    """Copy the plugin files (RefCast_V1.py + RefCast_Core.py) to Max's user scripts folder."""
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    if not os.path.exists(os.path.join(src_dir, "RefCast_V1.py")):
+        src_dir = os.getcwd()
     
-    if not os.path.exists(src):
-        src = os.path.join(os.getcwd(), "RefCast_V1.py")
-    
-    if not os.path.exists(src):
-        print(f"[RefCast] WARNING: Could not find RefCast_V1.py automatically.")
-        print(f"[RefCast] Please manually copy RefCast_V1.py to: {user_scripts}")
-        return dst
-    
-    shutil.copy2(src, dst)
-    print(f"[RefCast] Plugin copied to: {dst}")
+    dst = os.path.join(user_scripts, "RefCast_V1.py")
+    for fname in PLUGIN_FILES:
+        src = os.path.join(src_dir, fname)
+        if not os.path.exists(src):
+            print(f"[RefCast] WARNING: Could not find {fname} automatically.")
+            print(f"[RefCast] Please manually copy {', '.join(PLUGIN_FILES)} to: {user_scripts}")
+            return dst
+    
+    for fname in PLUGIN_FILES:
+        shutil.copy2(os.path.join(src_dir, fname), os.path.join(user_scripts, fname))
+    print(f"[RefCast] Plugin copied to: {user_scripts}")
     return dst
 
 
@@ -109,7 +115,6 @@ def create_macroscript(user_macros, user_scripts, user_icons):
     buttonText:"RefCast"{icon_line}
 (
     python.execute "
-import importlib
 import sys
 import os
 
@@ -119,8 +124,9 @@ script_dir = os.path.dirname(script_path)
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
+# Already loaded this session: re-show the existing dock instead of reloading
 if 'RefCast_V1' in sys.modules:
-    importlib.reload(sys.modules['RefCast_V1'])
+    sys.modules['RefCast_V1'].run()
 else:
     import RefCast_V1
 "
@@ -190,7 +196,10 @@ def run_installer():
         script_dir = os.path.join(user_scripts)
         if script_dir not in sys.path:
             sys.path.insert(0, script_dir)
-        import RefCast_V1
+        # Freshly copied files: drop any loaded copy so the new code builds a new dock
+        for name in ('RefCast_V1', 'RefCast_Core'):
+            sys.modules.pop(name, None)
+        importlib.import_module('RefCast_V1')    # importing it runs the UI
     except Exception as e:
         print(f"[RefCast] Auto-launch note: {e}")
         print("[RefCast] Use the toolbar button or re-run the macro.")
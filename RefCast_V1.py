@@ -1,34 +1,49 @@
 import sys
 import os
 import time
-import re
 import base64
 import subprocess
-import glob
-import shutil
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PySide2 import QtWidgets, QtCore, QtGui
 import pymxs
 
+# RefCast_Core sits next to this file (also when launched via Run Script)
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPT_DIR)
+
+from RefCast_Core import (
+    ensure_maxscript_helpers,
+    IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, SEQUENCE_EXTENSIONS, ALL_MEDIA_EXTENSIONS,
+    normalize_path, scan_media_paths, parse_glob_list, DEFAULT_SCAN_OPTIONS, SEQUENCE_DIRNAME,
+    group_sequence_files,
+    find_ffmpeg, prepare_media, ffmpeg_missing_message, format_eta, TOOLS,
+    default_ffmpeg_jobs, VideoConversionScheduler,
+    FrameCache, FRAME_CACHE_DIRNAME, FRAME_CACHE_DEFAULT_MB,
+    probe_image_size,
+    views_for_file, plane_specs_for_file, build_plane_spec, commit_plane_specs, BOX_VIEWS,
+    build_view_detector, find_view_rule_packs, SMART_MIN_CONFIDENCE,
+    fit_size, pack_atlas, atlas_cache_key, atlas_sheet_shifts, move_in_view, commit_atlas_mesh,
+    layout_board, LAYOUT_DEFAULT_SPACING,
+    file_signature, index_record, read_scene_index, write_scene_index, index_new_nodes, resolve_index_nodes,
+    resolve_index_pairs,
+    index_legacy_nodes,
+    find_changed_sources,
+    ImportProfiler, NULL_PROFILER, CountingRuntime, PROFILE_DIRNAME,
+    ATLAS_DIRNAME, ATLAS_DEFAULT_SHEET, ATLAS_DEFAULT_CELL, ATLAS_DEFAULT_PADDING,
+    proxy_cache_path, PROXY_DIRNAME, PROXY_DEFAULT_EDGE, PROXY_PROP_FULL, PROXY_PROP_PROXY,
+    clipboard_image_key, clipboard_image_path, CLIPBOARD_DIRNAME, CLIPBOARD_PNG_QUALITY,
+    fade_group_key, FADE_SCOPES, load_settings, update_settings, default_settings_path,
+)
+
 rt = pymxs.runtime
 
 # ==========================================
 # ===== MAXSCRIPT FUNCTION INJECTION =======
 # ==========================================
-rt.execute("""
-fn UPDATE_VISIBILITY_FN obj val = (
-    if isValidNode obj do (
-        if obj.visibility == undefined then (
-            obj.visibility = Bezier_Float()
-        )
-        else (
-            if (getPropertyController obj #visibility) == undefined do (
-                obj.visibility = Bezier_Float()
-            )
-        )
-        obj.visibility.controller.value = val
-    )
-)
-""")
+ensure_maxscript_helpers(rt)
 # ==========================================
 
 # === PLUGIN INFO ===
@@ -74,123 +89,179 @@ def get_or_create_layer(name):
     return layer
 
 
-# ==========================================
-# ===== FFMPEG VIDEO CONVERSION SYSTEM =====
-# ==========================================
+MATERIAL_KEY_PROP = "RefCast_MatKey"
 
-def find_ffmpeg():
-    if shutil.which("ffmpeg"):
-        return shutil.which("ffmpeg")
-    common_paths = [
-        r"C:\ffmpeg\bin\ffmpeg.exe",
-        r"C:\Program Files\ffmpeg\bin\ffmpeg.exe",
-        r"C:\Program Files (x86)\ffmpeg\bin\ffmpeg.exe",
-        os.path.expanduser(r"~\ffmpeg\bin\ffmpeg.exe"),
-        os.path.expanduser(r"~\Desktop\ffmpeg\bin\ffmpeg.exe"),
-    ]
-    for p in common_paths:
-        if os.path.isfile(p):
-            return p
-    winget_dir = os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\WinGet\Packages")
-    if os.path.isdir(winget_dir):
-        for root, dirs, files in os.walk(winget_dir):
-            if "ffmpeg.exe" in files:
-                return os.path.join(root, "ffmpeg.exe")
-    return None
 
+class SceneAssetRegistry(object):
+    """
+    Textures and materials already used by the REFERENCES layer, keyed by
+    normalized file path plus the settings that shaped them, so re-importing
+    a file reuses its maps instead of stacking duplicates in the scene.
+    """
 
-def convert_video_to_sequence(ffmpeg_path, video_path):
-    base_name = os.path.splitext(os.path.basename(video_path))[0]
-    temp_root = rt.GetDir(rt.name("temp"))
-    seq_dir = os.path.join(temp_root, f"refcast_{base_name}_{int(time.time())}").replace("\\", "/")
-    os.makedirs(seq_dir, exist_ok=True)
-    frame_pattern = os.path.join(seq_dir, f"{base_name}_%05d.png").replace("\\", "/")
+    def __init__(self):
+        self.textures = {}      # (path, use_alpha) -> BitmapTexture
+        self.materials = {}     # (path, material key) -> material
+
+    @staticmethod
+    def material_key(mat_type, use_alpha):
+        return f"{mat_type}|{int(bool(use_alpha))}"
+
+    def rebuild(self, layer_name=LAYER_NAME, runtime=None):
+        """Re-read the layer in a single MAXScript call."""
+        runtime = rt if runtime is None else runtime
+        self.textures = {}
+        self.materials = {}
+        try:
+            rows = runtime.REFCAST_COLLECT_ASSETS_FN(layer_name)
+        except Exception:
+            return
+        for row in rows:
+            mat_key, mat, tex, filename, uses_alpha = row[0], row[1], row[2], row[3], row[4]
+            if not filename:
+                continue
+            path = normalize_path(filename)
+            self.textures.setdefault((path, bool(uses_alpha)), tex)
+            if mat_key:
+                self.materials.setdefault((path, mat_key), mat)
 
-    cmd = [ffmpeg_path, "-i", video_path, "-vf", "format=rgba", "-y", frame_pattern]
-    try:
-        cflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300, creationflags=cflags)
-    except subprocess.TimeoutExpired:
-        return None, f"FFmpeg timed out converting '{os.path.basename(video_path)}'"
-    except Exception as e:
-        return None, f"FFmpeg error: {str(e)}"
+    def find_texture(self, path, use_alpha):
+        return self.textures.get((normalize_path(path), bool(use_alpha)))
 
-    frames = sorted(glob.glob(os.path.join(seq_dir, f"{base_name}_*.png")))
-    if not frames:
-        stderr_short = result.stderr[-300:] if result.stderr else "Unknown error"
-        return None, f"FFmpeg produced no frames for '{os.path.basename(video_path)}'.\n{stderr_short}"
+    def add_texture(self, path, use_alpha, tex):
+        self.textures[(normalize_path(path), bool(use_alpha))] = tex
 
-    ifl_path = os.path.join(seq_dir, f"{base_name}.ifl").replace("\\", "/")
-    with open(ifl_path, 'w') as f:
-        for frame in frames:
-            f.write(frame.replace("\\", "/") + "\n")
-    return ifl_path, None
+    def find_material(self, path, mat_key):
+        return self.materials.get((normalize_path(path), mat_key))
+
+    def add_material(self, path, mat_key, mat):
+        self.materials[(normalize_path(path), mat_key)] = mat
 
 
 # ==========================================
-# ===== SMART VIEW DETECTION =====
+# ===== PROXY TEXTURES (Qt) =====
 # ==========================================
-def detect_view_from_name(filename):
+def make_proxy_image(src_path, size, max_edge, proxy_root, ffmpeg_path=None):
     """
-    Advanced view detection from filename.
-    Supports full names, abbreviations, prefixes, suffixes,
-    multi-language hints, and common 3D naming conventions.
+    Write (or reuse) a downscaled copy of `src_path` whose longest side is
+    `max_edge`. Safe off the main thread: uses QImageReader, which decodes
+    JPEGs straight at the reduced size. Formats Qt can't read (EXR, HDR…)
+    go through FFmpeg when available. Returns the proxy path or None.
     """
-    name = os.path.splitext(os.path.basename(filename))[0].lower()
-    tokens = re.split(r'[\s_\-\.]+', name)
-
-    # Priority ordered: each entry = (view, exact_tokens, substring_patterns)
-    rules = [
-        ("Front",
-         {"front", "fv", "fnt", "frnt", "f_view", "frontview", "anterior", "fwd", "forward", "facade", "face"},
-         {"_front", "front_", "-front", "front-", ".front", "_fv", "fv_", "_fnt"}),
-        ("Back",
-         {"back", "bv", "bck", "bk", "rear", "b_view", "backview", "posterior", "behind", "dorsal"},
-         {"_back", "back_", "-back", "back-", ".back", "_bv", "bv_", "_bck", "_rear"}),
-        ("Left",
-         {"left", "lv", "lft", "lt", "l_view", "leftview", "lside", "l_side", "gauche", "izquierda"},
-         {"_left", "left_", "-left", "left-", ".left", "_lv", "lv_", "_lft"}),
-        ("Right",
-         {"right", "rv", "rgt", "rt", "r_view", "rightview", "rside", "r_side", "droite", "derecha"},
-         {"_right", "right_", "-right", "right-", ".right", "_rv", "rv_", "_rgt"}),
-        ("Top",
-         {"top", "tv", "tp", "t_view", "topview", "above", "up", "overhead", "ceil", "upper", "plan"},
-         {"_top", "top_", "-top", "top-", ".top", "_tv", "tv_"}),
-        ("Bottom",
-         {"bottom", "bov", "bot", "btm", "bt", "b_view", "bottomview", "below",
-          "down", "under", "ventral", "floor", "base", "sole", "lower"},
-         {"_bottom", "bottom_", "-bottom", "bottom-", ".bottom", "_bot", "bot_", "_btm", "btm_"}),
-    ]
-
-    # Pass 1: Exact token match (highest confidence)
-    for view, token_set, _ in rules:
-        for t in tokens:
-            if t in token_set:
-                return view
-
-    # Pass 2: Substring match
-    for view, _, substr_set in rules:
-        for pat in substr_set:
-            if pat in name:
-                return view
-
-    # Pass 3: Loose contains (unambiguous long keywords only)
-    loose = [
-        ("Front", ["front", "anterior", "forward", "facade"]),
-        ("Back",  ["back", "rear", "posterior", "behind"]),
-        ("Left",  ["left"]),
-        ("Right", ["right"]),
-        ("Top",   ["top", "above", "overhead"]),
-        ("Bottom",["bottom", "below", "under"]),
-    ]
-    for view, keywords in loose:
-        for kw in keywords:
-            if kw in name:
-                return view
-
+    base = proxy_cache_path(src_path, max_edge, proxy_root)
+    for ext in (".jpg", ".png"):
+        if os.path.isfile(base + ext):
+            try:
+                os.utime(base + ext, None)     # LRU stamp for FrameCache eviction
+            except OSError:
+                pass
+            return base + ext
+
+    w, h = size
+    scale = max_edge / float(max(w, h))
+    pw, ph = max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+    os.makedirs(proxy_root, exist_ok=True)
+
+    reader = QtGui.QImageReader(src_path)
+    reader.setScaledSize(QtCore.QSize(pw, ph))
+    img = reader.read()
+    if not img.isNull():
+        out_path = base + (".png" if img.hasAlphaChannel() else ".jpg")
+        tmp_path = out_path + ".tmp"
+        if img.save(tmp_path, "PNG" if out_path.endswith(".png") else "JPG", 90):
+            os.replace(tmp_path, out_path)
+            return out_path
+
+    if ffmpeg_path:
+        out_path = base + ".png"
+        tmp_path = base + ".tmp.png"
+        cmd = [ffmpeg_path, "-i", src_path, "-vf", f"scale={pw}:{ph}", "-y", tmp_path]
+        try:
+            cflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+            subprocess.run(cmd, capture_output=True, timeout=120, creationflags=cflags)
+        except Exception:
+            return None
+        if os.path.isfile(tmp_path):
+            os.replace(tmp_path, out_path)
+            return out_path
     return None
 
 
+# ==========================================
+# ===== ATLAS SHEETS (Qt) =====
+# ==========================================
+def render_atlas_sheets(paths, sheet_edge, cell_edge, padding, atlas_root, should_stop=None, on_progress=None):
+    """
+    Pack images into PNG sheets under atlas_root/<key>/, reusing them when
+    the same unchanged files are packed with the same settings. Safe off the
+    main thread (QImage + QPainter only).
+    Returns (sheets, failed); sheets = [{'path', 'width', 'height',
+    'items': [(source path, x, y, w, h)]}].
+    """
+    out_dir = os.path.join(atlas_root, atlas_cache_key(paths, sheet_edge, cell_edge, padding))
+    layout_path = os.path.join(out_dir, "layout.json")
+    try:
+        with open(layout_path, 'r') as f:
+            layout = json.load(f)
+        if all(os.path.isfile(sh['path']) for sh in layout['sheets']):
+            return layout['sheets'], layout['failed']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    valid, sizes, failed = [], [], []
+    for p in paths:
+        size = probe_image_size(p)
+        if size is None:
+            qsize = QtGui.QImageReader(p).size()
+            size = (qsize.width(), qsize.height()) if qsize.isValid() else None
+        if not size:
+            failed.append(p)
+            continue
+        valid.append(p)
+        sizes.append(fit_size(size[0], size[1], cell_edge))
+
+    os.makedirs(out_dir, exist_ok=True)
+    sheets = []
+    done = 0
+    for n, sheet in enumerate(pack_atlas(sizes, sheet_edge, padding)):
+        img = QtGui.QImage(sheet['width'], sheet['height'], QtGui.QImage.Format_ARGB32_Premultiplied)
+        img.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(img)
+        items = []
+        for i, x, y, w, h in sheet['items']:
+            if should_stop is not None and should_stop():
+                painter.end()
+                return [], failed
+            reader = QtGui.QImageReader(valid[i])
+            reader.setScaledSize(QtCore.QSize(w, h))
+            src = reader.read()
+            done += 1
+            if src.isNull():
+                failed.append(valid[i])
+                continue
+            painter.drawImage(x, y, src)
+            items.append((valid[i], x, y, w, h))
+            if on_progress is not None:
+                on_progress(done, len(valid))
+        painter.end()
+        if not items:
+            continue
+        sheet_path = os.path.join(out_dir, f"sheet_{n:02d}.png").replace("\\", "/")
+        tmp_path = sheet_path + ".tmp"
+        if not img.save(tmp_path, "PNG"):
+            failed.extend(p for p, _, _, _, _ in items)
+            continue
+        os.replace(tmp_path, sheet_path)
+        sheets.append({'path': sheet_path, 'width': sheet['width'], 'height': sheet['height'], 'items': items})
+
+    tmp_path = layout_path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'sheets': sheets, 'failed': failed}, f)
+    os.replace(tmp_path, layout_path)
+    return sheets, failed
+
+
+
 # ===== STYLE CONSTANTS =====
 STYLE_DARK_BG = "#1a1a1a"
 STYLE_PANEL_BG = "#222"
@@ -226,11 +297,12 @@ BUTTON_STYLE = f"""
     QPushButton:pressed {{ background-color: #333; }}
 """
 
-# ===== SUPPORTED FORMATS =====
-IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.tga', '.bmp', '.tif', '.tiff', '.exr', '.hdr', '.gif']
-VIDEO_EXTENSIONS = ['.avi', '.mov', '.mp4', '.wmv', '.mpg', '.mpeg', '.mkv', '.webm', '.flv', '.m4v']
-SEQUENCE_EXTENSIONS = ['.ifl']
-ALL_MEDIA_EXTENSIONS = IMAGE_EXTENSIONS + VIDEO_EXTENSIONS + SEQUENCE_EXTENSIONS
+# ===== IMPORT PIPELINE =====
+IMPORT_BATCH_SIZE = 8       # files committed to the scene per UI tick
+IMPORT_TICK_MS = 15
+LIVE_PROPS_THROTTLE_MS = 33 # slider drags apply at most ~30 times per second
+STREAM_RELOAD_MS = 750      # throttle for re-reading growing IFLs
+SYNC_DEBOUNCE_MS = 1500     # watched folders settle before a background re-sync
 
 
 # =============================================================================
@@ -266,18 +338,384 @@ class DragDropWidget(QtWidgets.QLabel):
             event.ignore()
 
     def dropEvent(self, event):
-        files = [u.toLocalFile() for u in event.mimeData().urls()]
-        final_files = []
-        for f in files:
-            if os.path.isdir(f):
-                for root, dirs, filenames in os.walk(f):
-                    for fn in filenames:
-                        if os.path.splitext(fn)[1].lower() in ALL_MEDIA_EXTENSIONS:
-                            final_files.append(os.path.join(root, fn).replace("\\", "/"))
-            elif os.path.splitext(f)[1].lower() in ALL_MEDIA_EXTENSIONS:
-                final_files.append(f.replace("\\", "/"))
-        if final_files:
-            self.files_dropped.emit(final_files)
+        # Folders are expanded later on a worker thread (see ScanWorker)
+        paths = [u.toLocalFile() for u in event.mimeData().urls()]
+        paths = [p for p in paths if p]
+        if paths:
+            self.files_dropped.emit(paths)
+
+
+# =============================================================================
+#  FOLDER SCAN
+# =============================================================================
+class ScanWorker(QtCore.QObject):
+    """Expands dropped folders on a worker thread, streaming matches back per folder."""
+
+    batch_found = QtCore.Signal(list)
+    finished = QtCore.Signal(list, list)    # media files, import notes (sequence gaps, isolated frames)
+
+    def __init__(self, paths, options):
+        super().__init__()
+        self.paths = list(paths)
+        self.options = options
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        notes = []
+        try:
+            found = scan_media_paths(self.paths, self.options, self.batch_found.emit, self._cancel_event,
+                                     report=notes)
+        except Exception as e:
+            print(f"[RefCast] Folder scan failed: {e}")
+            found = []
+        self.finished.emit(found, notes)
+
+
+class AtlasWorker(QtCore.QObject):
+    """Packs and paints atlas sheets on a worker thread."""
+
+    progress = QtCore.Signal(int, int)
+    finished = QtCore.Signal(list, list)    # sheets, files that could not be read
+
+    def __init__(self, paths, options, atlas_root, profiler=NULL_PROFILER):
+        super().__init__()
+        self.paths = list(paths)
+        self.options = options
+        self.atlas_root = atlas_root
+        self.profiler = profiler
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        o = self.options
+        try:
+            with self.profiler.stage("atlas_render", images=len(self.paths)):
+                sheets, failed = render_atlas_sheets(self.paths, o['sheet'], o['cell'], o['padding'],
+                                                     self.atlas_root, lambda: self._cancelled,
+                                                     self.progress.emit)
+        except Exception as e:
+            print(f"[RefCast] Atlas packing failed: {e}")
+            sheets, failed = [], list(self.paths)
+        self.finished.emit(sheets, failed)
+
+
+# =============================================================================
+#  CLIPBOARD
+# =============================================================================
+class ClipboardWorker(QtCore.QObject):
+    """Hashes pasted images and writes the new ones as PNG on a worker thread."""
+
+    finished = QtCore.Signal(list, int)    # image paths, how many were already on disk
+
+    def __init__(self, images, root):
+        super().__init__()
+        self.images = list(images)
+        self.root = root
+
+    def _store(self, image):
+        img = image.convertToFormat(QtGui.QImage.Format_ARGB32)
+        path = clipboard_image_path(self.root, clipboard_image_key(img.constBits(), img.width(), img.height()))
+        if os.path.isfile(path):
+            return path, True
+        os.makedirs(self.root, exist_ok=True)
+        part = f"{path}.part-{threading.get_ident()}"
+        try:
+            if not img.save(part, "PNG", CLIPBOARD_PNG_QUALITY):
+                raise OSError(f"could not write {part}")
+            os.replace(part, path)
+        finally:
+            if os.path.exists(part):
+                os.remove(part)
+        return path, False
+
+    def run(self):
+        paths, reused = [], 0
+        for image in self.images:
+            try:
+                path, hit = self._store(image)
+            except Exception as e:
+                print(f"[RefCast] Clipboard image could not be saved: {e}")
+                continue
+            paths.append(path)
+            reused += hit
+        self.finished.emit(paths, reused)
+
+
+# =============================================================================
+#  IMPORT PIPELINE
+# =============================================================================
+class ImportWorker(QtCore.QObject):
+    """
+    Prepares files on a worker thread (existence checks, header probes,
+    FFmpeg conversion). Never touches pymxs — scene work is marshalled back
+    to the main thread.
+    """
+    item_ready = QtCore.Signal(str, str, int, int, object)    # source path, load path, width, height (0 = unknown), signature
+    item_failed = QtCore.Signal(str)        # error message
+    sequence_updated = QtCore.Signal(str, bool)   # streamed IFL path, conversion finished
+    video_progress = QtCore.Signal(str, float, float)   # video path, fraction done, ETA seconds (-1 = unknown)
+    finished = QtCore.Signal()
+
+    def __init__(self, file_paths, temp_root, ffmpeg_jobs=None, ffmpeg_threads=None, cache=None,
+                 video_options=None, stream=False, proxy_edge=0, profiler=NULL_PROFILER):
+        super().__init__()
+        self.file_paths = list(file_paths)
+        self.profiler = profiler
+        self.temp_root = temp_root
+        self.cache = cache
+        self.proxy_edge = proxy_edge
+        self._proxy_ffmpeg = None
+        self._proxy_ffmpeg_searched = False
+        self.video_options = video_options
+        self.stream = stream
+        self._streamed = set()
+        self._stream_lock = threading.Lock()
+        self.ffmpeg_jobs = ffmpeg_jobs
+        self.ffmpeg_threads = ffmpeg_threads
+        self._scheduler = None
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+
+    def _emit_result(self, fpath, load_path, err, size=None):
+        if load_path is None:
+            self.item_failed.emit(err or os.path.basename(fpath))
+        else:
+            w, h = size or probe_image_size(load_path) or (0, 0)
+            self.item_ready.emit(fpath, load_path, w, h, file_signature(fpath))
+
+    def run(self):
+        videos = []
+        images = []
+        for fpath in self.file_paths:
+            if os.path.splitext(fpath)[1].lower() in VIDEO_EXTENSIONS:
+                videos.append(fpath)
+            else:
+                images.append(fpath)
+
+        if images and not self._cancelled:
+            self._prepare_images(images)
+        if videos and not self._cancelled:
+            self._convert_videos(videos)
+        self.finished.emit()
+
+    def _prepare_image(self, fpath):
+        """Returns (load_path, error, original size)."""
+        with self.profiler.stage("prepare_image"):
+            return self._prepare_image_inner(fpath)
+
+    def _prepare_image_inner(self, fpath):
+        try:
+            load_path, err = prepare_media(fpath, self.temp_root)
+        except Exception as e:
+            return None, f"Cannot prepare '{os.path.basename(fpath)}': {str(e)}", None
+        if load_path is None:
+            return None, err, None
+        size = probe_image_size(load_path)
+        ext = os.path.splitext(load_path)[1].lower()
+        if (self.proxy_edge and size and max(size) > self.proxy_edge
+                and ext in IMAGE_EXTENSIONS and self.cache is not None):
+            proxy_root = os.path.join(self.cache.root, PROXY_DIRNAME)
+            try:
+                proxy = make_proxy_image(load_path, size, self.proxy_edge, proxy_root)
+                if proxy is None and ext in ('.exr', '.hdr'):
+                    proxy = make_proxy_image(load_path, size, self.proxy_edge, proxy_root,
+                                             self._find_proxy_ffmpeg())
+            except Exception:
+                proxy = None
+            if proxy:
+                load_path = proxy     # plane still uses the original size
+        return load_path, None, size
+
+    def _find_proxy_ffmpeg(self):
+        if not self._proxy_ffmpeg_searched:
+            self._proxy_ffmpeg = find_ffmpeg()
+            self._proxy_ffmpeg_searched = True
+        return self._proxy_ffmpeg
+
+    def _prepare_images(self, images):
+        if not self.proxy_edge:
+            for fpath in images:
+                if self._cancelled:
+                    break
+                load_path, err, size = self._prepare_image(fpath)
+                self._emit_result(fpath, load_path, err, size)
+            return
+
+        # Proxy generation decodes pixels: spread it over the cores
+        pool = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 4) - 1))
+        futures = {pool.submit(self._prepare_image, fpath): fpath for fpath in images}
+        try:
+            for future in as_completed(futures):
+                if self._cancelled:
+                    break
+                fpath = futures[future]
+                try:
+                    load_path, err, size = future.result()
+                except Exception as e:
+                    load_path, err, size = None, f"Cannot prepare '{os.path.basename(fpath)}': {str(e)}", None
+                self._emit_result(fpath, load_path, err, size)
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+    def _convert_videos(self, videos):
+        ffmpeg = find_ffmpeg()
+        if ffmpeg is None:
+            for fpath in videos:
+                self._emit_result(fpath, None, ffmpeg_missing_message(fpath))
+            return
+
+        self._scheduler = VideoConversionScheduler(ffmpeg, self.temp_root, self.ffmpeg_jobs,
+                                                   self.ffmpeg_threads, self.cache,
+                                                   self.video_options,
+                                                   self._on_frames if self.stream else None,
+                                                   self._on_video_progress, self.profiler)
+        try:
+            for fpath in videos:
+                if not os.path.isfile(fpath):
+                    self._emit_result(fpath, None, f"File not found: {os.path.basename(fpath)}")
+                    continue
+                self._scheduler.submit(fpath)
+            if self._cancelled:
+                self._scheduler.cancel()
+            # Clips are handed to the scene as soon as each one finishes
+            for fpath, ifl_path, err in self._scheduler.results():
+                if self._cancelled:
+                    break
+                with self._stream_lock:
+                    already_streamed = fpath in self._streamed
+                if not already_streamed:
+                    self._emit_result(fpath, ifl_path, err)
+        finally:
+            self._scheduler.shutdown()
+
+    def _on_video_progress(self, fpath, done, total, eta):
+        """Called from conversion threads on every FFmpeg progress block."""
+        fraction = min(1.0, done / total) if total else -1.0
+        self.video_progress.emit(fpath, fraction, -1.0 if eta is None else eta)
+
+    def _on_frames(self, fpath, ifl_path, count, finished):
+        """Called from conversion threads while a streamed clip grows."""
+        with self._stream_lock:
+            first = fpath not in self._streamed
+            self._streamed.add(fpath)
+        if first and not self._cancelled:
+            w, h = probe_image_size(ifl_path) or (0, 0)
+            self.item_ready.emit(fpath, ifl_path, w, h, file_signature(fpath))
+        self.sequence_updated.emit(ifl_path, finished)
+
+
+class ImportJob(object):
+    """State of one running import, owned by the main thread."""
+
+    def __init__(self, settings, total):
+        self.settings = settings
+        self.total = total
+        self.pending = []       # (source path, load path, size) waiting for texture load
+        self.loaded = []        # (tex, source path, size) waiting for plane creation
+        self.created = []
+        self.failed = []
+        self.loaded_count = 0
+        self.built_count = 0
+        self.max_width = 0.0
+        self.max_height = 0.0
+        self.proxies = {}       # source path -> proxy path actually loaded
+        self.sources = {}       # source path -> (load path, file signature), for the scene index
+        self.indexed = []       # (node, index record) built by this import
+        self.profiler = NULL_PROFILER
+        self.rt = rt            # scene calls of this import; a CountingRuntime while profiled
+        self.registry = SceneAssetRegistry()
+        self.offsets = None     # (offset_w, offset_h) once known
+        self.review = []        # (tex, source path, size) Smart Detect wasn't sure about
+        self.notes = []         # e.g. sequence gaps or isolated frames, shown at the end
+        self.order = {}         # source path -> position in the dropped list
+        self.layout = None      # source path -> (x, y) on the board, once laid out
+        self.layout_pending = False
+        self.early = []         # (tex, source path, size) streamed clips built before their final place
+        self.early_nodes = []   # (node, source path, view, size, pos) of those planes, moved once placed
+        self.preparing = True
+        self.cancelled = False
+        self.holding = False    # theHold open: every commit of the import lands in one undo record
+
+
+# =============================================================================
+#  SMART DETECT REVIEW
+# =============================================================================
+class ViewReviewDialog(QtWidgets.QDialog):
+    """Lets the user assign views to files Smart Detect matched weakly or not at all."""
+
+    SKIP = "Skip"
+
+    def __init__(self, rows, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"{PLUGIN_NAME} — Review Smart Detect")
+        self.setMinimumSize(560, 320)
+        self.setStyleSheet(f"background-color: {STYLE_PANEL_BG}; color: {STYLE_TEXT};")
+        self._paths = [fpath for fpath, _ in rows]
+        self._combos = []
+
+        lay = QtWidgets.QVBoxLayout(self)
+        lbl = QtWidgets.QLabel(f"{len(rows)} file(s) need a view. Low-confidence guesses are preselected.")
+        lbl.setStyleSheet(f"color: {STYLE_MUTED};")
+        lay.addWidget(lbl)
+
+        table = QtWidgets.QTableWidget(len(rows), 4)
+        table.setHorizontalHeaderLabels(["File", "Confidence", "Rule", "View"])
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        for i, (fpath, match) in enumerate(rows):
+            table.setItem(i, 0, QtWidgets.QTableWidgetItem(os.path.basename(fpath)))
+            conf = f"{match.confidence:.0%}" if match.view else "—"
+            table.setItem(i, 1, QtWidgets.QTableWidgetItem(conf))
+            rule = f"{match.rule} ({match.keyword})" if match.rule else "no match"
+            table.setItem(i, 2, QtWidgets.QTableWidgetItem(rule))
+            combo = QtWidgets.QComboBox()
+            combo.addItems([self.SKIP] + BOX_VIEWS)
+            if match.view:
+                combo.setCurrentText(match.view)
+            table.setCellWidget(i, 3, combo)
+            self._combos.append(combo)
+        lay.addWidget(table)
+
+        row_btns = QtWidgets.QHBoxLayout()
+        row_btns.addWidget(QtWidgets.QLabel("Set all to:"))
+        self.COMBO_ALL = QtWidgets.QComboBox()
+        self.COMBO_ALL.addItems([self.SKIP] + BOX_VIEWS)
+        self.COMBO_ALL.activated.connect(self._set_all)
+        row_btns.addWidget(self.COMBO_ALL)
+        row_btns.addStretch()
+        btn_ok = QtWidgets.QPushButton("Import Assigned")
+        btn_ok.setStyleSheet(f"background-color: {STYLE_ACCENT}; color: white; font-weight: bold; padding: 5px 10px;")
+        btn_ok.clicked.connect(self.accept)
+        btn_skip = QtWidgets.QPushButton("Skip All")
+        btn_skip.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 5px 10px;")
+        btn_skip.clicked.connect(self.reject)
+        row_btns.addWidget(btn_ok)
+        row_btns.addWidget(btn_skip)
+        lay.addLayout(row_btns)
+
+    def _set_all(self, index):
+        for combo in self._combos:
+            combo.setCurrentIndex(index)
+
+    def assignments(self):
+        """{source path: view} for every row not left on Skip."""
+        return {fpath: combo.currentText() for fpath, combo in zip(self._paths, self._combos)
+                if combo.currentText() != self.SKIP}
 
 
 # =============================================================================
@@ -345,6 +783,19 @@ class ReferenceManager(QtWidgets.QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
 
+        # Live property edits are coalesced: only the latest values are applied per tick
+        self._live_props_timer = QtCore.QTimer(self)
+        self._live_props_timer.setSingleShot(True)
+        self._live_props_timer.setInterval(LIVE_PROPS_THROTTLE_MS)
+        self._live_props_timer.timeout.connect(self.apply_live_properties)
+        self._live_props_full = False   # False while only the opacity slider moved
+
+        # Smart Detect rules: built-ins plus any rule pack next to the plugin
+        self._rule_pack_paths = find_view_rule_packs([_SCRIPT_DIR])
+        self._view_detector, self._rule_pack_names, errors = build_view_detector(self._rule_pack_paths)
+        for err in errors:
+            print(f"[RefCast] Rule pack skipped: {err}")
+
         root = QtWidgets.QVBoxLayout(self)
         root.setSpacing(0)
         root.setContentsMargins(0, 0, 0, 0)
@@ -447,7 +898,7 @@ class ReferenceManager(QtWidgets.QWidget):
         self.stack.setStyleSheet(f"background-color: {STYLE_PANEL_BG};")
 
         self.stack.addWidget(self._build_import_page())   # index 0
-        self.stack.addWidget(self._build_settings_page())  # index 1
+        self._settings_built = False                       # index 1, built on first use
         self.stack.setCurrentIndex(0)
         root.addWidget(self.stack, 1)
 
@@ -461,7 +912,39 @@ class ReferenceManager(QtWidgets.QWidget):
         # =====================================================================
         self.btn_page_import.clicked.connect(lambda: self._go_page(0))
         self.btn_page_settings.clicked.connect(lambda: self._go_page(1))
-        self.update_ui_state()
+
+        # Import pipeline state
+        self._frame_cache = None
+        self._import_job = None
+        self._import_worker = None
+        self._import_threads = {}
+        self._scan_worker = None
+        self._scan_count = 0
+        self._clipboard_worker = None
+        self._video_jobs = {}       # clip name -> progress line
+        self._last_profile = None
+        self._scene_index = None
+        self._scene_gen = None      # REFCAST_SCENE_GEN the cached index was read under
+
+        # Optional source watching: folder changes trigger a quiet re-sync
+        self._source_watcher = QtCore.QFileSystemWatcher(self)
+        self._source_watcher.directoryChanged.connect(self._on_source_dir_changed)
+        self._sync_timer = QtCore.QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(SYNC_DEBOUNCE_MS)
+        self._sync_timer.timeout.connect(lambda: self.sync_references(quiet=True))
+        self._commit_timer = QtCore.QTimer(self)
+        self._commit_timer.setInterval(IMPORT_TICK_MS)
+        self._commit_timer.timeout.connect(self._commit_import_batch)
+
+        # Streamed video textures: IFL path -> [BitmapTexture], reloaded as frames land
+        self._streaming_textures = {}
+        self._stream_dirty = set()
+        self._stream_finished = set()
+        self._stream_timer = QtCore.QTimer(self)
+        self._stream_timer.setSingleShot(True)
+        self._stream_timer.setInterval(STREAM_RELOAD_MS)
+        self._stream_timer.timeout.connect(self._reload_streaming_textures)
 
     # =================================================================
     # PAGE BUILDERS
@@ -497,11 +980,49 @@ class ReferenceManager(QtWidgets.QWidget):
 
         # Drop Zone — LARGE, expands
         self.drop_zone = DragDropWidget()
-        self.drop_zone.files_dropped.connect(self.process_files)
+        self.drop_zone.files_dropped.connect(self.import_paths)
         self.drop_zone.setMinimumHeight(220)
         self.drop_zone.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
         lay.addWidget(self.drop_zone, 1)
 
+        # Import progress (hidden while idle)
+        self.import_progress_row = QtWidgets.QWidget()
+        prog_lay = QtWidgets.QHBoxLayout(self.import_progress_row)
+        prog_lay.setContentsMargins(0, 0, 0, 0)
+        prog_lay.setSpacing(6)
+        self.PROGRESS_IMPORT = QtWidgets.QProgressBar()
+        self.PROGRESS_IMPORT.setFixedHeight(22)
+        self.PROGRESS_IMPORT.setStyleSheet(f"""
+            QProgressBar {{
+                background-color: #111; color: {STYLE_TEXT};
+                border: 1px solid {STYLE_BORDER}; border-radius: 3px;
+                text-align: center; font-size: 11px;
+            }}
+            QProgressBar::chunk {{ background-color: {STYLE_ACCENT}; }}
+        """)
+        self.btn_cancel_import = QtWidgets.QPushButton("✕  Cancel")
+        self.btn_cancel_import.setFixedHeight(22)
+        self.btn_cancel_import.setToolTip("Stop the import and keep the planes created so far")
+        self.btn_cancel_import.clicked.connect(self.cancel_import)
+        self.btn_cancel_import.setStyleSheet("""
+            QPushButton {
+                background-color: #5a2a2a; color: white;
+                border-radius: 3px; padding: 0 10px;
+                font-weight: bold; border: 1px solid #7a3a3a;
+            }
+            QPushButton:hover { background-color: #7a3a3a; }
+        """)
+        prog_lay.addWidget(self.PROGRESS_IMPORT, 1)
+        prog_lay.addWidget(self.btn_cancel_import)
+        self.import_progress_row.setVisible(False)
+        lay.addWidget(self.import_progress_row)
+
+        # Per-clip FFmpeg progress / ETA while videos convert
+        self.lbl_video_progress = QtWidgets.QLabel("")
+        self.lbl_video_progress.setStyleSheet(f"color: {STYLE_MUTED}; font-size: 11px;")
+        self.lbl_video_progress.setVisible(False)
+        lay.addWidget(self.lbl_video_progress)
+
         # Select All References
         self.btn_select_all = QtWidgets.QPushButton("⬚  Select All Reference Planes")
         self.btn_select_all.setToolTip(f"Select all objects in the '{LAYER_NAME}' layer")
@@ -540,13 +1061,42 @@ class ReferenceManager(QtWidgets.QWidget):
         group_mode.setStyleSheet(GROUPBOX_STYLE)
         mode_layout = QtWidgets.QVBoxLayout()
         self.COMBO_MODE = QtWidgets.QComboBox()
-        self.COMBO_MODE.addItems(["Manual View (Standard)", "Box Mode (6 Sides Cube)", "Smart Detect (By Name)"])
+        self.COMBO_MODE.addItems(["Manual View (Standard)", "Box Mode (6 Sides Cube)", "Smart Detect (By Name)",
+                                  "Atlas Board (Contact Sheet)"])
         self.COMBO_MODE.currentIndexChanged.connect(self.update_ui_state)
         self.COMBO_MODE.setStyleSheet(f"padding: 5px; background-color: {STYLE_WIDGET_BG};")
         mode_layout.addWidget(self.COMBO_MODE)
         self.lbl_info = QtWidgets.QLabel("")
         self.lbl_info.setStyleSheet(f"color: {STYLE_MUTED}; font-size: 11px;")
         mode_layout.addWidget(self.lbl_info)
+
+        # Smart Detect rules + review threshold (shown in Smart mode only)
+        self.smart_rules_box = QtWidgets.QWidget()
+        smart_lay = QtWidgets.QVBoxLayout(self.smart_rules_box)
+        smart_lay.setContentsMargins(0, 0, 0, 0)
+        row_rules = QtWidgets.QHBoxLayout()
+        self.lbl_rule_pack = QtWidgets.QLabel("")
+        self.lbl_rule_pack.setStyleSheet(f"color: {STYLE_MUTED}; font-size: 11px;")
+        row_rules.addWidget(self.lbl_rule_pack, 1)
+        self.btn_load_rules = QtWidgets.QPushButton("Load Rules...")
+        self.btn_load_rules.setToolTip("Add a JSON/TOML rule pack with your studio's naming conventions")
+        self.btn_load_rules.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 4px;")
+        self.btn_load_rules.clicked.connect(self.load_rule_pack)
+        row_rules.addWidget(self.btn_load_rules)
+        smart_lay.addLayout(row_rules)
+
+        row_conf = QtWidgets.QHBoxLayout()
+        row_conf.addWidget(QtWidgets.QLabel("Review Below:"))
+        self.SPIN_SMART_CONF = QtWidgets.QDoubleSpinBox()
+        self.SPIN_SMART_CONF.setRange(0.0, 1.0)
+        self.SPIN_SMART_CONF.setSingleStep(0.05)
+        self.SPIN_SMART_CONF.setValue(SMART_MIN_CONFIDENCE)
+        self.SPIN_SMART_CONF.setToolTip("Files matched with less confidence are listed for review after import")
+        self.SPIN_SMART_CONF.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        row_conf.addWidget(self.SPIN_SMART_CONF)
+        smart_lay.addLayout(row_conf)
+        mode_layout.addWidget(self.smart_rules_box)
+        self._update_rule_pack_label()
         group_mode.setLayout(mode_layout)
         layout.addWidget(group_mode)
 
@@ -558,6 +1108,37 @@ class ReferenceManager(QtWidgets.QWidget):
         self.COMBO_VIEW.addItems(["Front", "Back", "Left", "Right", "Top", "Bottom"])
         self.COMBO_VIEW.setStyleSheet(f"padding: 5px; background-color: {STYLE_WIDGET_BG};")
         align_layout.addWidget(self.COMBO_VIEW)
+
+        # Board layout (Manual mode): spread a multi-image drop instead of stacking it
+        self.layout_box = QtWidgets.QWidget()
+        board_lay = QtWidgets.QVBoxLayout(self.layout_box)
+        board_lay.setContentsMargins(0, 4, 0, 0)
+        row_layout = QtWidgets.QHBoxLayout()
+        row_layout.addWidget(QtWidgets.QLabel("Layout:"))
+        self.COMBO_LAYOUT = QtWidgets.QComboBox()
+        self.COMBO_LAYOUT.addItems(["Stacked (Same Position)", "Grid", "Row", "Masonry"])
+        self.COMBO_LAYOUT.setToolTip("How several images dropped together are arranged in the view")
+        self.COMBO_LAYOUT.setStyleSheet(f"padding: 3px; background-color: {STYLE_WIDGET_BG};")
+        row_layout.addWidget(self.COMBO_LAYOUT)
+        board_lay.addLayout(row_layout)
+
+        row_spacing = QtWidgets.QHBoxLayout()
+        row_spacing.addWidget(QtWidgets.QLabel("Spacing:"))
+        self.SPIN_LAYOUT_SPACING = QtWidgets.QDoubleSpinBox()
+        self.SPIN_LAYOUT_SPACING.setRange(0.0, 100000.0)
+        self.SPIN_LAYOUT_SPACING.setValue(LAYOUT_DEFAULT_SPACING)
+        self.SPIN_LAYOUT_SPACING.setToolTip("Gap between planes (scene units)")
+        row_spacing.addWidget(self.SPIN_LAYOUT_SPACING)
+        row_spacing.addWidget(QtWidgets.QLabel("Columns:"))
+        self.SPIN_LAYOUT_COLUMNS = QtWidgets.QSpinBox()
+        self.SPIN_LAYOUT_COLUMNS.setRange(0, 100)
+        self.SPIN_LAYOUT_COLUMNS.setSpecialValueText("Auto")
+        self.SPIN_LAYOUT_COLUMNS.setToolTip("Grid / Masonry columns (Auto = square-ish board)")
+        row_spacing.addWidget(self.SPIN_LAYOUT_COLUMNS)
+        for w in [self.SPIN_LAYOUT_SPACING, self.SPIN_LAYOUT_COLUMNS]:
+            w.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        board_lay.addLayout(row_spacing)
+        align_layout.addWidget(self.layout_box)
         self.group_align.setLayout(align_layout)
         layout.addWidget(self.group_align)
 
@@ -636,9 +1217,30 @@ class ReferenceManager(QtWidgets.QWidget):
         self.SLIDER_OPACITY.setRange(0, 100)
         self.SLIDER_OPACITY.setValue(100)
         self.SLIDER_OPACITY.setTracking(True)
-        self.SLIDER_OPACITY.valueChanged.connect(self.update_live_properties)
+        self.SLIDER_OPACITY.valueChanged.connect(self.update_live_opacity)
         props_layout.addWidget(self.SLIDER_OPACITY)
 
+        row_fade = QtWidgets.QHBoxLayout()
+        self.CHK_SHARED_FADE = QtWidgets.QCheckBox("Shared Fade")
+        self.CHK_SHARED_FADE.setToolTip(
+            "References share one opacity controller per group:\n"
+            "the slider fades the whole group (or, with nothing selected,\n"
+            "every group) in a single change, however many planes it holds.")
+        self.COMBO_FADE_SCOPE = QtWidgets.QComboBox()
+        self.COMBO_FADE_SCOPE.addItems(FADE_SCOPES)
+        self.COMBO_FADE_SCOPE.setToolTip("Group new imports together, or give each import its own fade")
+        self.COMBO_FADE_SCOPE.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        # Restored before connecting: the scene's groups are already in place
+        fade_prefs = load_settings(default_settings_path()).get('shared_fade', {})
+        self.CHK_SHARED_FADE.setChecked(bool(fade_prefs.get('enabled')))
+        if fade_prefs.get('scope') in FADE_SCOPES:
+            self.COMBO_FADE_SCOPE.setCurrentText(fade_prefs['scope'])
+        self.CHK_SHARED_FADE.toggled.connect(self.toggle_shared_fade)
+        self.COMBO_FADE_SCOPE.currentIndexChanged.connect(self.save_fade_prefs)
+        row_fade.addWidget(self.CHK_SHARED_FADE)
+        row_fade.addWidget(self.COMBO_FADE_SCOPE, 1)
+        props_layout.addLayout(row_fade)
+
         grid = QtWidgets.QGridLayout()
         self.CHK_FREEZE = QtWidgets.QCheckBox("Freeze")
         self.CHK_CULL = QtWidgets.QCheckBox("Backface Cull")
@@ -647,13 +1249,13 @@ class ReferenceManager(QtWidgets.QWidget):
         self.CHK_RCV_SHADOWS = QtWidgets.QCheckBox("Rec. Shadows")
         self.CHK_SHOW_GRAY = QtWidgets.QCheckBox("Frozen Gray")
 
+        self.CHK_CULL.setChecked(True)
+        self.CHK_RENDERABLE.setChecked(True)
+
         for chk in [self.CHK_FREEZE, self.CHK_CULL, self.CHK_RENDERABLE,
                      self.CHK_CAST_SHADOWS, self.CHK_RCV_SHADOWS, self.CHK_SHOW_GRAY]:
             chk.toggled.connect(self.update_live_properties)
 
-        self.CHK_CULL.setChecked(True)
-        self.CHK_RENDERABLE.setChecked(True)
-
         grid.addWidget(self.CHK_FREEZE, 0, 0)
         grid.addWidget(self.CHK_CULL, 0, 1)
         grid.addWidget(self.CHK_RENDERABLE, 1, 0)
@@ -678,6 +1280,336 @@ class ReferenceManager(QtWidgets.QWidget):
         group_mat.setLayout(mat_layout)
         layout.addWidget(group_mat)
 
+        # 6. VIDEO
+        group_video = QtWidgets.QGroupBox("6. Video (FFmpeg)")
+        group_video.setStyleSheet(GROUPBOX_STYLE)
+        video_layout = QtWidgets.QVBoxLayout()
+
+        row_jobs = QtWidgets.QHBoxLayout()
+        row_jobs.addWidget(QtWidgets.QLabel("Parallel Jobs:"))
+        self.SPIN_FFMPEG_JOBS = QtWidgets.QSpinBox()
+        self.SPIN_FFMPEG_JOBS.setRange(1, 16)
+        self.SPIN_FFMPEG_JOBS.setValue(default_ffmpeg_jobs())
+        self.SPIN_FFMPEG_JOBS.setToolTip("How many videos are converted at the same time")
+        self.SPIN_FFMPEG_JOBS.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        row_jobs.addWidget(self.SPIN_FFMPEG_JOBS)
+        video_layout.addLayout(row_jobs)
+
+        row_threads = QtWidgets.QHBoxLayout()
+        row_threads.addWidget(QtWidgets.QLabel("Threads / Job:"))
+        self.SPIN_FFMPEG_THREADS = QtWidgets.QSpinBox()
+        self.SPIN_FFMPEG_THREADS.setRange(0, 64)
+        self.SPIN_FFMPEG_THREADS.setSpecialValueText("Auto")
+        self.SPIN_FFMPEG_THREADS.setValue(0)
+        self.SPIN_FFMPEG_THREADS.setToolTip("FFmpeg threads per conversion (Auto = cores / parallel jobs)")
+        self.SPIN_FFMPEG_THREADS.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        row_threads.addWidget(self.SPIN_FFMPEG_THREADS)
+        video_layout.addLayout(row_threads)
+
+        row_range = QtWidgets.QHBoxLayout()
+        row_range.addWidget(QtWidgets.QLabel("In (s):"))
+        self.SPIN_VIDEO_IN = QtWidgets.QDoubleSpinBox()
+        self.SPIN_VIDEO_IN.setRange(0.0, 86400.0)
+        self.SPIN_VIDEO_IN.setDecimals(2)
+        self.SPIN_VIDEO_IN.setToolTip("Start time of the extracted range")
+        row_range.addWidget(self.SPIN_VIDEO_IN)
+        row_range.addWidget(QtWidgets.QLabel("Out (s):"))
+        self.SPIN_VIDEO_OUT = QtWidgets.QDoubleSpinBox()
+        self.SPIN_VIDEO_OUT.setRange(0.0, 86400.0)
+        self.SPIN_VIDEO_OUT.setDecimals(2)
+        self.SPIN_VIDEO_OUT.setSpecialValueText("End")
+        self.SPIN_VIDEO_OUT.setToolTip("End time of the extracted range")
+        row_range.addWidget(self.SPIN_VIDEO_OUT)
+        video_layout.addLayout(row_range)
+
+        row_fps = QtWidgets.QHBoxLayout()
+        row_fps.addWidget(QtWidgets.QLabel("FPS:"))
+        self.SPIN_VIDEO_FPS = QtWidgets.QDoubleSpinBox()
+        self.SPIN_VIDEO_FPS.setRange(0.0, 240.0)
+        self.SPIN_VIDEO_FPS.setDecimals(2)
+        self.SPIN_VIDEO_FPS.setSpecialValueText("Native")
+        self.SPIN_VIDEO_FPS.setToolTip("Drop frames down to this rate (e.g. 12 for blocking reference)")
+        row_fps.addWidget(self.SPIN_VIDEO_FPS)
+        row_fps.addWidget(QtWidgets.QLabel("Max Edge:"))
+        self.SPIN_VIDEO_EDGE = QtWidgets.QSpinBox()
+        self.SPIN_VIDEO_EDGE.setRange(0, 16384)
+        self.SPIN_VIDEO_EDGE.setSingleStep(256)
+        self.SPIN_VIDEO_EDGE.setSpecialValueText("Native")
+        self.SPIN_VIDEO_EDGE.setToolTip("Downscale frames so the longest side fits (pixels)")
+        row_fps.addWidget(self.SPIN_VIDEO_EDGE)
+        video_layout.addLayout(row_fps)
+
+        row_format = QtWidgets.QHBoxLayout()
+        row_format.addWidget(QtWidgets.QLabel("Frames:"))
+        self.COMBO_VIDEO_FORMAT = QtWidgets.QComboBox()
+        self.COMBO_VIDEO_FORMAT.addItems(["PNG (Alpha)", "JPEG (Smaller, No Alpha)"])
+        row_format.addWidget(self.COMBO_VIDEO_FORMAT)
+        video_layout.addLayout(row_format)
+
+        self.CHK_STREAM_VIDEO = QtWidgets.QCheckBox("Stream Frames (show clip while converting)")
+        self.CHK_STREAM_VIDEO.setChecked(True)
+        self.CHK_STREAM_VIDEO.setToolTip("Create the plane as soon as the first frames exist "
+                                         "and extend it as FFmpeg continues. With AUTO offset or a "
+                                         "board layout it moves into place once every file is ready")
+        video_layout.addWidget(self.CHK_STREAM_VIDEO)
+
+        for w in [self.SPIN_VIDEO_IN, self.SPIN_VIDEO_OUT, self.SPIN_VIDEO_FPS,
+                  self.SPIN_VIDEO_EDGE, self.COMBO_VIDEO_FORMAT]:
+            w.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+
+        # FFmpeg location: found once, remembered in the RefCast settings file
+        self.lbl_ffmpeg_info = QtWidgets.QLabel("")
+        self.lbl_ffmpeg_info.setWordWrap(True)
+        self.lbl_ffmpeg_info.setStyleSheet(f"color: {STYLE_MUTED}; font-size: 11px;")
+        video_layout.addWidget(self.lbl_ffmpeg_info)
+        row_ffmpeg = QtWidgets.QHBoxLayout()
+        self.btn_ffmpeg_browse = QtWidgets.QPushButton("Set FFmpeg…")
+        self.btn_ffmpeg_browse.setToolTip("Use a specific ffmpeg executable")
+        self.btn_ffmpeg_browse.clicked.connect(self.browse_ffmpeg)
+        self.btn_ffmpeg_auto = QtWidgets.QPushButton("Auto Detect")
+        self.btn_ffmpeg_auto.setToolTip("Forget the chosen path and search again")
+        self.btn_ffmpeg_auto.clicked.connect(self.auto_detect_ffmpeg)
+        for b in [self.btn_ffmpeg_browse, self.btn_ffmpeg_auto]:
+            b.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 4px;")
+            row_ffmpeg.addWidget(b)
+        video_layout.addLayout(row_ffmpeg)
+
+        group_video.setLayout(video_layout)
+        layout.addWidget(group_video)
+
+        # 7. VIDEO CACHE
+        group_cache = QtWidgets.QGroupBox("7. Video Cache")
+        group_cache.setStyleSheet(GROUPBOX_STYLE)
+        cache_layout = QtWidgets.QVBoxLayout()
+
+        row_cache_size = QtWidgets.QHBoxLayout()
+        row_cache_size.addWidget(QtWidgets.QLabel("Max Size (MB):"))
+        self.SPIN_CACHE_MB = QtWidgets.QSpinBox()
+        self.SPIN_CACHE_MB.setRange(256, 512000)
+        self.SPIN_CACHE_MB.setSingleStep(256)
+        self.SPIN_CACHE_MB.setValue(FRAME_CACHE_DEFAULT_MB)
+        self.SPIN_CACHE_MB.setToolTip("Least recently used clips and proxy textures are removed above this size")
+        self.SPIN_CACHE_MB.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        self.SPIN_CACHE_MB.valueChanged.connect(self.update_cache_limit)
+        row_cache_size.addWidget(self.SPIN_CACHE_MB)
+        cache_layout.addLayout(row_cache_size)
+
+        self.lbl_cache_info = QtWidgets.QLabel("")
+        self.lbl_cache_info.setStyleSheet(f"color: {STYLE_MUTED}; font-size: 11px;")
+        cache_layout.addWidget(self.lbl_cache_info)
+
+        row_cache_btns = QtWidgets.QHBoxLayout()
+        self.btn_cache_refresh = QtWidgets.QPushButton("Refresh")
+        self.btn_cache_refresh.clicked.connect(self.refresh_cache_info)
+        self.btn_cache_open = QtWidgets.QPushButton("Open Folder")
+        self.btn_cache_open.clicked.connect(self.open_cache_folder)
+        self.btn_cache_purge = QtWidgets.QPushButton("Purge")
+        self.btn_cache_purge.setToolTip("Delete all cached frame sequences")
+        self.btn_cache_purge.clicked.connect(self.purge_cache)
+        for b in [self.btn_cache_refresh, self.btn_cache_open, self.btn_cache_purge]:
+            b.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 4px;")
+            row_cache_btns.addWidget(b)
+        cache_layout.addLayout(row_cache_btns)
+
+        group_cache.setLayout(cache_layout)
+        layout.addWidget(group_cache)
+
+        # 8. PROXY TEXTURES
+        group_proxy = QtWidgets.QGroupBox("8. Proxy Textures")
+        group_proxy.setStyleSheet(GROUPBOX_STYLE)
+        proxy_layout = QtWidgets.QVBoxLayout()
+        self.CHK_PROXY = QtWidgets.QCheckBox("Use Proxies for Large Images")
+        self.CHK_PROXY.setToolTip("Load a cached, downscaled copy; the plane keeps the original size")
+        proxy_layout.addWidget(self.CHK_PROXY)
+
+        row_proxy_edge = QtWidgets.QHBoxLayout()
+        row_proxy_edge.addWidget(QtWidgets.QLabel("Max Edge (px):"))
+        self.SPIN_PROXY_EDGE = QtWidgets.QSpinBox()
+        self.SPIN_PROXY_EDGE.setRange(256, 16384)
+        self.SPIN_PROXY_EDGE.setSingleStep(256)
+        self.SPIN_PROXY_EDGE.setValue(PROXY_DEFAULT_EDGE)
+        self.SPIN_PROXY_EDGE.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        row_proxy_edge.addWidget(self.SPIN_PROXY_EDGE)
+        proxy_layout.addLayout(row_proxy_edge)
+
+        self.btn_proxy_swap = QtWidgets.QPushButton("⇄  Proxy / Full Res (Selected)")
+        self.btn_proxy_swap.setToolTip("Swap the selected planes between proxy and full-resolution textures")
+        self.btn_proxy_swap.clicked.connect(self.toggle_proxy_resolution)
+        self.btn_proxy_swap.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 4px;")
+        proxy_layout.addWidget(self.btn_proxy_swap)
+
+        group_proxy.setLayout(proxy_layout)
+        layout.addWidget(group_proxy)
+
+        # 9. FOLDER SCAN & SEQUENCES
+        group_scan = QtWidgets.QGroupBox("9. Folder Scan & Sequences")
+        group_scan.setStyleSheet(GROUPBOX_STYLE)
+        scan_layout = QtWidgets.QVBoxLayout()
+
+        row_depth = QtWidgets.QHBoxLayout()
+        row_depth.addWidget(QtWidgets.QLabel("Max Depth:"))
+        self.SPIN_SCAN_DEPTH = QtWidgets.QSpinBox()
+        self.SPIN_SCAN_DEPTH.setRange(-1, 64)
+        self.SPIN_SCAN_DEPTH.setValue(-1)
+        self.SPIN_SCAN_DEPTH.setSpecialValueText("Unlimited")
+        self.SPIN_SCAN_DEPTH.setToolTip("Subfolder levels to scan below a dropped folder (0 = that folder only)")
+        self.SPIN_SCAN_DEPTH.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        row_depth.addWidget(self.SPIN_SCAN_DEPTH)
+        scan_layout.addLayout(row_depth)
+
+        row_include = QtWidgets.QHBoxLayout()
+        row_include.addWidget(QtWidgets.QLabel("Include:"))
+        self.EDIT_SCAN_INCLUDE = QtWidgets.QLineEdit()
+        self.EDIT_SCAN_INCLUDE.setPlaceholderText("all media  (e.g. *.png; *front*)")
+        self.EDIT_SCAN_INCLUDE.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        row_include.addWidget(self.EDIT_SCAN_INCLUDE)
+        scan_layout.addLayout(row_include)
+
+        row_exclude = QtWidgets.QHBoxLayout()
+        row_exclude.addWidget(QtWidgets.QLabel("Exclude:"))
+        self.EDIT_SCAN_EXCLUDE = QtWidgets.QLineEdit()
+        self.EDIT_SCAN_EXCLUDE.setPlaceholderText("files or folders  (e.g. *_thumb*; old)")
+        self.EDIT_SCAN_EXCLUDE.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        row_exclude.addWidget(self.EDIT_SCAN_EXCLUDE)
+        scan_layout.addLayout(row_exclude)
+
+        self.CHK_GROUP_SEQUENCES = QtWidgets.QCheckBox("Numbered Frames as IFL Sequence")
+        self.CHK_GROUP_SEQUENCES.setChecked(True)
+        self.CHK_GROUP_SEQUENCES.setToolTip("name_0001.png, name_0002.png… become one animated plane")
+        scan_layout.addWidget(self.CHK_GROUP_SEQUENCES)
+
+        row_min_frames = QtWidgets.QHBoxLayout()
+        row_min_frames.addWidget(QtWidgets.QLabel("Min Frames:"))
+        self.SPIN_SEQ_MIN_FRAMES = QtWidgets.QSpinBox()
+        self.SPIN_SEQ_MIN_FRAMES.setRange(2, 1000)
+        self.SPIN_SEQ_MIN_FRAMES.setValue(DEFAULT_SCAN_OPTIONS['min_frames'])
+        self.SPIN_SEQ_MIN_FRAMES.setToolTip("Shorter numbered runs import as separate images")
+        self.SPIN_SEQ_MIN_FRAMES.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        row_min_frames.addWidget(self.SPIN_SEQ_MIN_FRAMES)
+        scan_layout.addLayout(row_min_frames)
+
+        row_seq_range = QtWidgets.QHBoxLayout()
+        row_seq_range.addWidget(QtWidgets.QLabel("Frames:"))
+        self.SPIN_SEQ_START = QtWidgets.QSpinBox()
+        self.SPIN_SEQ_START.setRange(0, 9999999)
+        self.SPIN_SEQ_START.setSpecialValueText("First")
+        self.SPIN_SEQ_START.setToolTip("First frame number to use")
+        row_seq_range.addWidget(self.SPIN_SEQ_START)
+        row_seq_range.addWidget(QtWidgets.QLabel("to"))
+        self.SPIN_SEQ_END = QtWidgets.QSpinBox()
+        self.SPIN_SEQ_END.setRange(0, 9999999)
+        self.SPIN_SEQ_END.setSpecialValueText("Last")
+        self.SPIN_SEQ_END.setToolTip("Last frame number to use")
+        row_seq_range.addWidget(self.SPIN_SEQ_END)
+        row_seq_range.addWidget(QtWidgets.QLabel("Every:"))
+        self.SPIN_SEQ_STEP = QtWidgets.QSpinBox()
+        self.SPIN_SEQ_STEP.setRange(1, 1000)
+        self.SPIN_SEQ_STEP.setToolTip("Use every Nth frame (timing is kept when holding gaps)")
+        row_seq_range.addWidget(self.SPIN_SEQ_STEP)
+        for w in [self.SPIN_SEQ_START, self.SPIN_SEQ_END, self.SPIN_SEQ_STEP]:
+            w.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        scan_layout.addLayout(row_seq_range)
+
+        row_gaps = QtWidgets.QHBoxLayout()
+        row_gaps.addWidget(QtWidgets.QLabel("Missing Frames:"))
+        self.COMBO_SEQ_GAPS = QtWidgets.QComboBox()
+        self.COMBO_SEQ_GAPS.addItems(["Hold Previous Frame", "Split into Separate Sequences", "Skip (Shorter Clip)"])
+        self.COMBO_SEQ_GAPS.setStyleSheet(f"padding: 3px; background-color: {STYLE_WIDGET_BG};")
+        row_gaps.addWidget(self.COMBO_SEQ_GAPS)
+        scan_layout.addLayout(row_gaps)
+
+        group_scan.setLayout(scan_layout)
+        layout.addWidget(group_scan)
+
+        # 10. ATLAS BOARD
+        group_atlas = QtWidgets.QGroupBox("10. Atlas Board")
+        group_atlas.setStyleSheet(GROUPBOX_STYLE)
+        atlas_layout = QtWidgets.QVBoxLayout()
+
+        row_atlas_out = QtWidgets.QHBoxLayout()
+        row_atlas_out.addWidget(QtWidgets.QLabel("Output:"))
+        self.COMBO_ATLAS_OUTPUT = QtWidgets.QComboBox()
+        self.COMBO_ATLAS_OUTPUT.addItems(["Single Plane per Sheet", "Mesh with UV Islands"])
+        self.COMBO_ATLAS_OUTPUT.setToolTip("Mesh: one quad per image, all sharing the sheet texture")
+        self.COMBO_ATLAS_OUTPUT.setStyleSheet(f"padding: 3px; background-color: {STYLE_WIDGET_BG};")
+        row_atlas_out.addWidget(self.COMBO_ATLAS_OUTPUT)
+        atlas_layout.addLayout(row_atlas_out)
+
+        row_atlas_size = QtWidgets.QHBoxLayout()
+        row_atlas_size.addWidget(QtWidgets.QLabel("Sheet:"))
+        self.SPIN_ATLAS_SHEET = QtWidgets.QSpinBox()
+        self.SPIN_ATLAS_SHEET.setRange(1024, 16384)
+        self.SPIN_ATLAS_SHEET.setSingleStep(1024)
+        self.SPIN_ATLAS_SHEET.setValue(ATLAS_DEFAULT_SHEET)
+        self.SPIN_ATLAS_SHEET.setToolTip("Max sheet size (px)")
+        row_atlas_size.addWidget(self.SPIN_ATLAS_SHEET)
+        row_atlas_size.addWidget(QtWidgets.QLabel("Image:"))
+        self.SPIN_ATLAS_CELL = QtWidgets.QSpinBox()
+        self.SPIN_ATLAS_CELL.setRange(64, 16384)
+        self.SPIN_ATLAS_CELL.setSingleStep(128)
+        self.SPIN_ATLAS_CELL.setValue(ATLAS_DEFAULT_CELL)
+        self.SPIN_ATLAS_CELL.setToolTip("Max edge of each image inside a sheet (px)")
+        row_atlas_size.addWidget(self.SPIN_ATLAS_CELL)
+        row_atlas_size.addWidget(QtWidgets.QLabel("Gap:"))
+        self.SPIN_ATLAS_PAD = QtWidgets.QSpinBox()
+        self.SPIN_ATLAS_PAD.setRange(0, 256)
+        self.SPIN_ATLAS_PAD.setValue(ATLAS_DEFAULT_PADDING)
+        self.SPIN_ATLAS_PAD.setToolTip("Padding between images (px)")
+        row_atlas_size.addWidget(self.SPIN_ATLAS_PAD)
+        for w in [self.SPIN_ATLAS_SHEET, self.SPIN_ATLAS_CELL, self.SPIN_ATLAS_PAD]:
+            w.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 3px;")
+        atlas_layout.addLayout(row_atlas_size)
+
+        group_atlas.setLayout(atlas_layout)
+        layout.addWidget(group_atlas)
+
+        # 11. SCENE INDEX
+        group_index = QtWidgets.QGroupBox("11. Scene Index")
+        group_index.setStyleSheet(GROUPBOX_STYLE)
+        index_layout = QtWidgets.QVBoxLayout()
+        self.lbl_index_info = QtWidgets.QLabel("")
+        self.lbl_index_info.setWordWrap(True)
+        self.lbl_index_info.setStyleSheet(f"color: {STYLE_MUTED}; font-size: 11px;")
+        index_layout.addWidget(self.lbl_index_info)
+
+        row_index_btns = QtWidgets.QHBoxLayout()
+        self.btn_index_refresh = QtWidgets.QPushButton("Refresh")
+        self.btn_index_refresh.clicked.connect(self.refresh_index_info)
+        self.btn_index_relink = QtWidgets.QPushButton("Relink Missing…")
+        self.btn_index_relink.setToolTip("Find moved source files by name in a folder and repoint their planes")
+        self.btn_index_relink.clicked.connect(self.relink_missing_sources)
+        self.btn_index_sync = QtWidgets.QPushButton("Sync Changed")
+        self.btn_index_sync.setToolTip("Reload only the source files that changed on disk and resize their planes")
+        self.btn_index_sync.clicked.connect(self.sync_references)
+        for b in [self.btn_index_refresh, self.btn_index_relink, self.btn_index_sync]:
+            b.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 4px;")
+            row_index_btns.addWidget(b)
+        index_layout.addLayout(row_index_btns)
+
+        self.CHK_WATCH_SOURCES = QtWidgets.QCheckBox("Watch Source Files (Auto Sync)")
+        self.CHK_WATCH_SOURCES.setToolTip("Re-sync automatically when files in the source folders change")
+        self.CHK_WATCH_SOURCES.toggled.connect(self.update_source_watch)
+        index_layout.addWidget(self.CHK_WATCH_SOURCES)
+
+        group_index.setLayout(index_layout)
+        layout.addWidget(group_index)
+
+        # 12. DIAGNOSTICS
+        group_diag = QtWidgets.QGroupBox("12. Diagnostics")
+        group_diag.setStyleSheet(GROUPBOX_STYLE)
+        diag_layout = QtWidgets.QVBoxLayout()
+        self.CHK_PROFILE_IMPORT = QtWidgets.QCheckBox("Profile Imports")
+        self.CHK_PROFILE_IMPORT.setToolTip("Time each import stage and count pymxs calls; "
+                                           "prints a summary to the Listener and saves a Chrome trace")
+        diag_layout.addWidget(self.CHK_PROFILE_IMPORT)
+        self.btn_export_profile = QtWidgets.QPushButton("Export Last Profile…")
+        self.btn_export_profile.setToolTip("Save the last import's trace (chrome://tracing / Perfetto)")
+        self.btn_export_profile.clicked.connect(self.export_last_profile)
+        self.btn_export_profile.setStyleSheet(f"background-color: {STYLE_WIDGET_BG}; padding: 4px;")
+        diag_layout.addWidget(self.btn_export_profile)
+        group_diag.setLayout(diag_layout)
+        layout.addWidget(group_diag)
+
         # Select All References (also on settings page)
         self.btn_select_all_s = QtWidgets.QPushButton("⬚  Select All Reference Planes")
         self.btn_select_all_s.setToolTip(f"Select all objects in the '{LAYER_NAME}' layer")
@@ -708,10 +1640,28 @@ class ReferenceManager(QtWidgets.QWidget):
     # =================================================================
     # NAVIGATION
     # =================================================================
+    def _ensure_settings_page(self):
+        """Build the Settings page the first time anything needs it; the Import page opens without it."""
+        if self._settings_built:
+            return
+        self._settings_built = True
+        self.stack.addWidget(self._build_settings_page())  # index 1
+        # Default values set while building fire the live-property signals;
+        # they must not touch whatever happens to be selected.
+        self._live_props_timer.stop()
+        self._live_props_full = False
+        self.update_ui_state()
+
     def _go_page(self, idx):
+        if idx == 1:
+            self._ensure_settings_page()
         self.stack.setCurrentIndex(idx)
         self.btn_page_import.setChecked(idx == 0)
         self.btn_page_settings.setChecked(idx == 1)
+        if idx == 1:
+            self.refresh_cache_info()
+            self.refresh_index_info()
+            self.refresh_ffmpeg_info()
 
     # =================================================================
     # UI STATE
@@ -720,24 +1670,178 @@ class ReferenceManager(QtWidgets.QWidget):
         mode = self.COMBO_MODE.currentText()
         if "Manual" in mode:
             self.group_align.setVisible(True)
+            self.layout_box.setVisible(True)
+            self.smart_rules_box.setVisible(False)
             self.lbl_info.setText("Standard Mode: Applies selected View to all images.")
             self.COMBO_PIVOT.setEnabled(True)
         elif "Box" in mode:
             self.group_align.setVisible(False)
+            self.smart_rules_box.setVisible(False)
             self.lbl_info.setText("Box Mode: Creates 6 planes (Cube). Offset adjusted by W/H.")
             self.COMBO_PIVOT.setEnabled(True)
         elif "Smart" in mode:
             self.group_align.setVisible(False)
+            self.smart_rules_box.setVisible(True)
             self.lbl_info.setText("Auto-Detect: Reads filename keywords for view assignment.")
             self.COMBO_PIVOT.setEnabled(True)
+        elif "Atlas" in mode:
+            self.group_align.setVisible(True)
+            self.layout_box.setVisible(False)
+            self.smart_rules_box.setVisible(False)
+            self.lbl_info.setText("Atlas: Packs all images into a few texture sheets (see Atlas Board).")
+            self.COMBO_PIVOT.setEnabled(False)
+
+    def _update_rule_pack_label(self):
+        packs = " + ".join(self._rule_pack_names)
+        self.lbl_rule_pack.setText(f"Rules: {packs} + built-in" if packs else "Rules: built-in")
+
+    def load_rule_pack(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Load View Rule Pack", "", "Rule Packs (*.json *.toml)")
+        if not path:
+            return
+        paths = [p for p in self._rule_pack_paths if normalize_path(p) != normalize_path(path)] + [path]
+        detector, names, errors = build_view_detector(paths)
+        if errors:
+            QtWidgets.QMessageBox.warning(self, PLUGIN_NAME, "\n".join(errors))
+        self._rule_pack_paths = paths
+        self._view_detector, self._rule_pack_names = detector, names
+        self._update_rule_pack_label()
 
     def toggle_auto_offset(self):
         self.SPIN_OFFSET.setEnabled(not self.btn_auto_offset.isChecked())
 
+    # =================================================================
+    # VIDEO CACHE
+    # =================================================================
+    def get_frame_cache(self):
+        if self._frame_cache is None:
+            self._ensure_settings_page()
+            root = os.path.join(rt.GetDir(rt.name("temp")), FRAME_CACHE_DIRNAME)
+            self._frame_cache = FrameCache(root, self.SPIN_CACHE_MB.value() * 1024 * 1024, (PROXY_DIRNAME,))
+        return self._frame_cache
+
+    def refresh_ffmpeg_info(self):
+        # Only shows what is already known: the search itself runs with the first video
+        lines = []
+        for name in TOOLS.TOOLS:
+            info = TOOLS.info(name)
+            if info and os.path.isfile(info['path']):
+                pinned = "  (set)" if TOOLS.user_path(name) else ""
+                lines.append(f"{name} {info['version']}: {info['path']}{pinned}")
+            else:
+                lines.append(f"{name}: not found yet")
+        self.lbl_ffmpeg_info.setText("\n".join(lines))
+
+    def browse_ffmpeg(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Locate ffmpeg", "",
+                                                        "FFmpeg (ffmpeg ffmpeg.exe);;All Files (*)")
+        if not path:
+            return
+        info, err = TOOLS.set_user_path("ffmpeg", path)
+        if info is None:
+            QtWidgets.QMessageBox.warning(self, PLUGIN_NAME, err)
+            return
+        # Keep ffprobe from the same install when there is one
+        probe = os.path.join(os.path.dirname(path), os.path.basename(path).lower().replace("ffmpeg", "ffprobe"))
+        if os.path.isfile(probe):
+            TOOLS.set_user_path("ffprobe", probe)
+        self.refresh_ffmpeg_info()
+
+    def auto_detect_ffmpeg(self):
+        for name in TOOLS.TOOLS:
+            TOOLS.clear_user_path(name)
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            found = find_ffmpeg()
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self.refresh_ffmpeg_info()
+        if not found:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
+                "FFmpeg was not found.\nInstall it (winget install ffmpeg) or use Set FFmpeg….")
+
+    def update_cache_limit(self):
+        if self._frame_cache is not None:
+            self._frame_cache.max_bytes = self.SPIN_CACHE_MB.value() * 1024 * 1024
+
+    def refresh_cache_info(self):
+        try:
+            cache = self.get_frame_cache()
+            entries, loose = cache.entries(), cache.loose_files()
+        except Exception:
+            entries, loose = [], []
+        size_mb = sum(e.get("bytes", 0) for e in entries + loose) / (1024.0 * 1024.0)
+        frames = sum(e.get("frames", 0) for e in entries)
+        self.lbl_cache_info.setText(f"{len(entries)} clip(s)  •  {frames} frames  •  {size_mb:.1f} MB")
+
+    def open_cache_folder(self):
+        cache = self.get_frame_cache()
+        os.makedirs(cache.root, exist_ok=True)
+        QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(cache.root))
+
+    def purge_cache(self):
+        if self._import_job is not None:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
+                "Cannot purge the cache while an import is running.")
+            return
+        ans = QtWidgets.QMessageBox.question(self, PLUGIN_NAME,
+            "Delete all cached video frames?\n"
+            "Planes still using them will show missing textures until re-imported.")
+        if ans != QtWidgets.QMessageBox.Yes:
+            return
+        removed = self.get_frame_cache().purge()
+        self.refresh_cache_info()
+        QtWidgets.QMessageBox.information(self, PLUGIN_NAME, f"Removed {removed} cached folder(s).")
+
+    # =================================================================
+    # PROXY SWAP
+    # =================================================================
+    def toggle_proxy_resolution(self):
+        """Flip each selected plane's bitmap between its proxy and the original file."""
+        swapped = 0
+        handled = set()
+        objs = list(rt.selection)
+        index = self.scene_index()
+        handles = rt.REFCAST_NODE_HANDLES_FN(objs) if objs else []
+        with pymxs.undo(True, "RefCast Proxy Swap"):
+            for obj, handle in zip(objs, handles):
+                record = index.get(handle)
+                if record is not None:
+                    full, proxy = record['source'], record['proxy']
+                else:   # planes from before the scene index
+                    full = rt.getUserProp(obj, PROXY_PROP_FULL)
+                    proxy = rt.getUserProp(obj, PROXY_PROP_PROXY)
+                if not full or not proxy or obj.material is None:
+                    continue
+                full_key = os.path.normcase(os.path.normpath(full))
+                for tex in rt.getClassInstances(rt.BitmapTexture, target=obj.material):
+                    tex_handle = rt.getHandleByAnim(tex)
+                    if tex_handle in handled:
+                        continue     # materials shared by Box Mode planes flip once
+                    handled.add(tex_handle)
+                    is_full = os.path.normcase(os.path.normpath(tex.filename)) == full_key
+                    tex.filename = proxy if is_full else full
+                    swapped += 1
+        rt.redrawViews()
+        if not swapped:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
+                "No proxied reference planes in the selection.")
+
     # =================================================================
     # SELECT ALL REFERENCES
     # =================================================================
     def select_all_references(self):
+        index = self.scene_index()
+        if len(index):
+            nodes = resolve_index_nodes(rt, index, index.handles())
+            if nodes:
+                rt.select(nodes)
+                rt.redrawViews()
+                QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
+                    f"Selected {len(nodes)} reference plane(s).")
+                return
+        # Nothing indexed (no textured planes): fall back to the layer
         layer = rt.LayerManager.getLayerFromName(LAYER_NAME)
         if layer is None:
             QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
@@ -768,6 +1872,189 @@ class ReferenceManager(QtWidgets.QWidget):
             QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
                 f"Layer '{LAYER_NAME}' exists but has no objects.")
 
+    # =================================================================
+    # SCENE INDEX
+    # =================================================================
+    def scene_index(self):
+        """
+        The open scene's RefCast index, kept in memory and re-read only after
+        a new / opened / reset scene, a merge or an undo / redo. Planes from
+        before the index (or merged in from another file) are added on that
+        read, so every feature sees them.
+        """
+        gen = rt.REFCAST_SCENE_GEN
+        if self._scene_index is None or gen != self._scene_gen:
+            index, _ = read_scene_index(rt)
+            index_legacy_nodes(rt, index, LAYER_NAME)
+            self._scene_index, self._scene_gen = index, gen
+        return self._scene_index
+
+    def save_scene_index(self):
+        if self._scene_index is not None:
+            write_scene_index(rt, self._scene_index)
+
+    def nodes_for_source(self, path):
+        """Live nodes built from `path`, straight from the index."""
+        index = self.scene_index()
+        return resolve_index_nodes(rt, index, index.handles_for_source(path))
+
+    def refresh_index_info(self):
+        try:
+            index = self.scene_index()
+            resolve_index_nodes(rt, index, index.handles())
+        except Exception:
+            self.lbl_index_info.setText("Scene index unavailable.")
+            return
+        stats = index.stats()
+        missing = sum(1 for src in index.sources() if not os.path.exists(src))
+        modes = ", ".join(f"{m.split()[0]} {n}" for m, n in sorted(stats['by_mode'].items()))
+        text = f"{stats['nodes']} plane(s) from {stats['sources']} file(s)"
+        if modes:
+            text += f"  •  {modes}"
+        if missing:
+            text += f"  •  {missing} missing"
+        self.lbl_index_info.setText(text)
+
+    def sync_references(self, quiet=False):
+        """
+        Reload only the sources that changed on disk since they were indexed,
+        regenerate their proxies and resize their planes if the image size changed.
+        """
+        if self._import_job is not None:
+            if quiet:
+                self._sync_timer.start()    # try again once the import is done
+            return
+        index = self.scene_index()
+        changed, touched, missing = find_changed_sources(index)
+        for source, sig in touched:
+            index.update_source(source, sig=sig)
+
+        reloaded, skipped = [], []
+        resize_nodes, widths, lengths = [], [], []
+        with pymxs.undo(True, "RefCast Sync"):
+            for source, sig in changed:
+                handles = index.handles_for_source(source)
+                record = index.get(handles[0])
+                converted = normalize_path(record['load']) != normalize_path(source) and not record['proxy']
+                if os.path.splitext(source)[1].lower() in VIDEO_EXTENSIONS or record.get('members') or converted:
+                    skipped.append(os.path.basename(source))   # converted media: re-import to refresh
+                    continue
+                size = probe_image_size(source)
+                proxy = self._refresh_proxy(source, size, record) if record['proxy'] else None
+                stale = {normalize_path(source)}
+                if record['proxy']:
+                    stale.add(normalize_path(record['proxy']))
+                handled = set()
+                for handle, node in resolve_index_pairs(rt, index, handles):
+                    if node.material is not None:
+                        for tex in rt.getClassInstances(rt.BitmapTexture, target=node.material):
+                            key = rt.getHandleByAnim(tex)
+                            if key in handled or normalize_path(tex.filename) not in stale:
+                                continue
+                            handled.add(key)
+                            # Planes swapped to full res stay full res
+                            if proxy and normalize_path(tex.filename) != normalize_path(source):
+                                tex.filename = proxy
+                            else:
+                                tex.reload()
+                    node_record = index.get(handle)
+                    if size and node_record and node_record['size'] and tuple(node_record['size']) != tuple(size):
+                        scale_val = node_record['settings'].get('scale', 1.0)
+                        resize_nodes.append(node)
+                        widths.append(size[0] * scale_val)
+                        lengths.append(size[1] * scale_val)
+                fields = {'sig': sig, 'size': list(size) if size else record['size']}
+                if proxy:
+                    fields['proxy'] = fields['load'] = proxy
+                index.update_source(source, **fields)
+                reloaded.append(os.path.basename(source))
+            if resize_nodes:
+                rt.REFCAST_RESIZE_PLANES_FN(resize_nodes, widths, lengths)
+
+        if changed or touched:
+            self.save_scene_index()
+        if reloaded:
+            rt.redrawViews()
+        self.update_source_watch()
+
+        summary = f"Synced {len(reloaded)} changed file(s), resized {len(resize_nodes)} plane(s)."
+        if skipped:
+            summary += f"\nSkipped (re-import to refresh): {', '.join(skipped)}"
+        if missing:
+            summary += f"\n{len(missing)} source file(s) missing — use Relink Missing…"
+        if quiet:
+            if reloaded:
+                print(f"[RefCast] {summary}")
+        else:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME, summary)
+        if self.stack.currentIndex() == 1:
+            self.refresh_index_info()
+
+    def _refresh_proxy(self, source, size, record):
+        """New proxy for a changed source (the proxy cache key includes size and mtime)."""
+        if not size:
+            return None
+        edge = record['settings'].get('proxy_edge') or PROXY_DEFAULT_EDGE
+        try:
+            return make_proxy_image(source, size, edge, os.path.join(self.get_frame_cache().root, PROXY_DIRNAME))
+        except Exception:
+            return None
+
+    def update_source_watch(self):
+        """Watch the folders of indexed sources while Auto Sync is on."""
+        watched = self._source_watcher.directories()
+        if watched:
+            self._source_watcher.removePaths(watched)
+        if not self._settings_built or not self.CHK_WATCH_SOURCES.isChecked():
+            return
+        folders = {os.path.dirname(src) for src in self.scene_index().sources()}
+        folders = [f for f in folders if os.path.isdir(f)]
+        if folders:
+            self._source_watcher.addPaths(folders)
+
+    def _on_source_dir_changed(self, path):
+        # Editors often write a file in several steps: wait for the folder to settle
+        self._sync_timer.start()
+
+    def relink_missing_sources(self):
+        index = self.scene_index()
+        missing = [src for src in index.sources() if not os.path.exists(src)]
+        if not missing:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME, "All indexed source files are present.")
+            return
+        folder = QtWidgets.QFileDialog.getExistingDirectory(
+            self, f"Find {len(missing)} missing file(s) in…")
+        if not folder:
+            return
+        found = {}
+        for root, _, names in os.walk(folder):
+            for name in names:
+                found.setdefault(name.lower(), os.path.join(root, name).replace("\\", "/"))
+
+        relinked = 0
+        with pymxs.undo(True, "RefCast Relink"):
+            for old in missing:
+                new = found.get(os.path.basename(old).lower())
+                if new is None:
+                    continue
+                nodes = self.nodes_for_source(old)
+                records = [index.get(h) for h in index.handles_for_source(old)]
+                stale = {normalize_path(old)}
+                stale.update(normalize_path(r['proxy']) for r in records if r and r['proxy'])
+                for node in nodes:
+                    if node.material is None:
+                        continue
+                    for tex in rt.getClassInstances(rt.BitmapTexture, target=node.material):
+                        if normalize_path(tex.filename) in stale:
+                            tex.filename = new
+                index.relink(old, new)
+                relinked += 1
+        self.save_scene_index()
+        rt.redrawViews()
+        self.refresh_index_info()
+        QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
+            f"Relinked {relinked} of {len(missing)} missing file(s).")
+
     # =================================================================
     # VIEWPORT
     # =================================================================
@@ -796,198 +2083,173 @@ class ReferenceManager(QtWidgets.QWidget):
     # LIVE PROPERTIES
     # =================================================================
     def update_live_properties(self):
+        # Widget signals can fire dozens of times per frame while dragging;
+        # the timer collapses them into one apply with the latest values.
+        self._live_props_full = True
+        if not self._live_props_timer.isActive():
+            self._live_props_timer.start()
+
+    def update_live_opacity(self):
+        # Opacity alone: planes in a fade group need no per-node pass
+        if not self._live_props_timer.isActive():
+            self._live_props_timer.start()
+
+    def apply_live_properties(self):
+        full, self._live_props_full = self._live_props_full, False
         sel = rt.selection
-        if not sel or len(sel) == 0:
-            return
-
+        has_sel = bool(sel) and len(sel) > 0
         opacity_val = self.SLIDER_OPACITY.value() / 100.0
-        freeze = self.CHK_FREEZE.isChecked()
-        cull = self.CHK_CULL.isChecked()
-        renderable = self.CHK_RENDERABLE.isChecked()
-        cast = self.CHK_CAST_SHADOWS.isChecked()
-        rcv = self.CHK_RCV_SHADOWS.isChecked()
-        gray = self.CHK_SHOW_GRAY.isChecked()
 
+        if not has_sel:
+            if not self.CHK_SHARED_FADE.isChecked():
+                return
+            # Nothing selected: one controller value per group fades everything
+            with pymxs.undo(False):
+                rt.REFCAST_FADE_SET_FN(rt.REFCAST_FADE_GROUPS_FN(LAYER_NAME), opacity_val, LAYER_NAME)
+            rt.redrawViews()
+            return
+
+        # Grouped planes fade through their group's controller (whether or not
+        # Shared Fade is on now), loose planes one by one
+        split = rt.REFCAST_FADE_SPLIT_FN(sel)
+        keys, loose = split[0], split[1]
+        targets = sel if full else loose
         with pymxs.undo(False):
-            for obj in sel:
-                try:
-                    rt.UPDATE_VISIBILITY_FN(obj, opacity_val)
-                    obj.showFrozenInGray = gray
-                    if freeze:
-                        if not obj.isFrozen: rt.freeze(obj)
-                    else:
-                        if obj.isFrozen: rt.unfreeze(obj)
-                    obj.backFaceCull = cull
-                    obj.renderable = renderable
-                    obj.castShadows = cast
-                    obj.receiveShadows = rcv
-                except Exception:
-                    pass
+            if len(keys):
+                rt.REFCAST_FADE_SET_FN(keys, opacity_val, LAYER_NAME)
+            if len(targets):
+                rt.REFCAST_APPLY_PROPS_FN(
+                    targets, opacity_val,
+                    self.CHK_SHOW_GRAY.isChecked(),
+                    self.CHK_FREEZE.isChecked(),
+                    self.CHK_CULL.isChecked(),
+                    self.CHK_RENDERABLE.isChecked(),
+                    self.CHK_CAST_SHADOWS.isChecked(),
+                    self.CHK_RCV_SHADOWS.isChecked())
         rt.redrawViews()
 
-    # =================================================================
-    # PIVOT HELPER
-    # =================================================================
-    def _get_pivot_world_offset(self, view_name, pivot_loc, final_w, final_h):
-        if pivot_loc == "Center":
-            return (0.0, 0.0, 0.0)
-
-        w2 = final_w / 2.0
-        h2 = final_h / 2.0
-        dx = dy = dz = 0.0
-
-        if view_name in ("Front", "Back"):
-            if "Bottom" in pivot_loc: dz = -h2
-            elif "Top" in pivot_loc: dz = h2
-            if "Left" in pivot_loc: dx = -w2
-            elif "Right" in pivot_loc: dx = w2
-        elif view_name == "Left":
-            if "Bottom" in pivot_loc: dz = -h2
-            elif "Top" in pivot_loc: dz = h2
-            if "Left" in pivot_loc: dy = w2
-            elif "Right" in pivot_loc: dy = -w2
-        elif view_name == "Right":
-            if "Bottom" in pivot_loc: dz = -h2
-            elif "Top" in pivot_loc: dz = h2
-            if "Left" in pivot_loc: dy = -w2
-            elif "Right" in pivot_loc: dy = w2
-        elif view_name == "Top":
-            if "Bottom" in pivot_loc: dy = -h2
-            elif "Top" in pivot_loc: dy = h2
-            if "Left" in pivot_loc: dx = -w2
-            elif "Right" in pivot_loc: dx = w2
-        elif view_name == "Bottom":
-            if "Bottom" in pivot_loc: dy = h2
-            elif "Top" in pivot_loc: dy = -h2
-            if "Left" in pivot_loc: dx = -w2
-            elif "Right" in pivot_loc: dx = w2
-
-        return (dx, dy, dz)
+    def _reference_nodes(self):
+        """Every RefCast node in the scene (older planes are indexed when the index is read)."""
+        index = self.scene_index()
+        return resolve_index_nodes(rt, index, index.handles())
 
-    # =================================================================
-    # CREATE PLANE
-    # =================================================================
-    def create_plane_obj(self, tex, view_name, scale_val, offset_val, pivot_loc, mat, props, is_box_mode=False):
-        img_w = tex.bitmap.width
-        img_h = tex.bitmap.height
-        final_w = img_w * scale_val
-        final_h = img_h * scale_val
+    def save_fade_prefs(self):
+        update_settings('shared_fade', {'enabled': self.CHK_SHARED_FADE.isChecked(),
+                                        'scope': self.COMBO_FADE_SCOPE.currentText()})
 
-        plane = rt.Plane(width=final_w, length=final_h, widthsegs=1, lengthsegs=1)
-        plane.name = "Ref_" + view_name + "_" + os.path.basename(tex.filename)
-        plane.material = mat
-
-        rt.showTextureMap(mat, tex, True)
-        rt.addModifier(plane, rt.Uvwmap(maptype=4))
-
-        rot_x = rot_y = rot_z = 0
-        if view_name == "Front": rot_x = 90
-        elif view_name == "Back": rot_x = 90; rot_z = 180
-        elif view_name == "Left": rot_x = 90; rot_z = -90
-        elif view_name == "Right": rot_x = 90; rot_z = 90
-        elif view_name == "Top": rot_x = 0
-        elif view_name == "Bottom": rot_x = 180
-
-        rt.rotate(plane, rt.EulerAngles(rot_x, rot_y, rot_z))
-
-        px = py = pz = 0.0
-        if view_name == "Front": py = offset_val
-        elif view_name == "Back": py = -offset_val
-        elif view_name == "Left": px = offset_val
-        elif view_name == "Right": px = -offset_val
-        elif view_name == "Top": pz = -offset_val
-        elif view_name == "Bottom": pz = offset_val
-
-        plane.pos = rt.Point3(px, py, pz)
-
-        pdx, pdy, pdz = self._get_pivot_world_offset(view_name, pivot_loc, final_w, final_h)
-        plane.pivot = rt.Point3(px + pdx, py + pdy, pz + pdz)
-
-        plane.renderable = props['renderable']
-        plane.castShadows = props['cast']
-        plane.receiveShadows = props['rcv']
-        plane.backFaceCull = props['cull']
-
-        rt.UPDATE_VISIBILITY_FN(plane, props['opacity'])
+    def toggle_shared_fade(self, checked):
+        """Put loose references into the shared "all" group, or give every plane its own opacity again."""
+        self.save_fade_prefs()
+        nodes = self._reference_nodes()
+        if not nodes:
+            return
+        with pymxs.undo(True, "RefCast Shared Fade"):
+            if checked:
+                # Planes already in a per-import group keep it
+                loose = rt.REFCAST_FADE_SPLIT_FN(nodes)[1]
+                if len(loose):
+                    rt.REFCAST_FADE_ATTACH_FN(loose, fade_group_key(FADE_SCOPES[0]),
+                                              self.SLIDER_OPACITY.value() / 100.0, LAYER_NAME)
+            else:
+                rt.REFCAST_FADE_DETACH_FN(nodes)
+        rt.redrawViews()
 
-        if props['freeze']:
-            plane.showFrozenInGray = props['gray']
-            rt.freeze(plane)
+    # =================================================================
+    # CREATE PLANES
+    # =================================================================
+    def create_planes_bulk(self, entries, props, layer_name=LAYER_NAME, runtime=None):
+        """
+        Build planes from (spec, tex, mat, mat_key, full_path, proxy_path)
+        entries in one MAXScript call; returns the new nodes, already on the layer.
+        """
+        return commit_plane_specs(rt if runtime is None else runtime, entries, props, layer_name)
 
-        return plane
+    def create_plane_obj(self, tex, view_name, scale_val, offset_val, pivot_loc, mat, props, is_box_mode=False,
+                         img_size=None):
+        if img_size is not None:
+            img_w, img_h = img_size
+        else:
+            img_w = tex.bitmap.width
+            img_h = tex.bitmap.height
+        spec = build_plane_spec(os.path.basename(tex.filename), view_name, img_w, img_h,
+                                scale_val, offset_val, pivot_loc)
+        return self.create_planes_bulk([(spec, tex, mat, None, None, None)], props)[0]
 
     # =================================================================
     # MATERIAL
     # =================================================================
-    def get_material_instance(self, mat_type, name, tex_map, use_alpha):
+    def get_material_instance(self, mat_type, name, tex_map, use_alpha, runtime=None):
+        runtime = rt if runtime is None else runtime
         mat = None
         if "Physical" in mat_type:
-            mat = rt.PhysicalMaterial(name=name)
+            mat = runtime.PhysicalMaterial(name=name)
             mat.base_color_map = tex_map
             mat.roughness = 1.0
             if use_alpha: mat.cutout_map = tex_map
         elif "Standard" in mat_type:
-            mat = rt.StandardMaterial(name=name)
+            mat = runtime.StandardMaterial(name=name)
             mat.diffuseMap = tex_map
             if use_alpha: mat.opacityMap = tex_map
         elif "VRay" in mat_type:
             try:
-                mat = rt.VRayMtl(name=name); mat.texmap_diffuse = tex_map
+                mat = runtime.VRayMtl(name=name); mat.texmap_diffuse = tex_map
                 if use_alpha: mat.texmap_opacity = tex_map
             except Exception:
-                return self.get_material_instance("Standard", name, tex_map, use_alpha)
+                return self.get_material_instance("Standard", name, tex_map, use_alpha, runtime)
         elif "Corona" in mat_type:
             try:
-                mat = rt.CoronaPhysicalMtl(name=name); mat.baseTexmap = tex_map
+                mat = runtime.CoronaPhysicalMtl(name=name); mat.baseTexmap = tex_map
                 if use_alpha: mat.opacityTexmap = tex_map
             except Exception:
-                return self.get_material_instance("Standard", name, tex_map, use_alpha)
+                return self.get_material_instance("Standard", name, tex_map, use_alpha, runtime)
         elif "Arnold" in mat_type:
             try:
-                mat = rt.ai_standard_surface(name=name); mat.base_color_shader = tex_map
+                mat = runtime.ai_standard_surface(name=name); mat.base_color_shader = tex_map
                 if use_alpha: mat.opacity_shader = tex_map
             except Exception:
-                return self.get_material_instance("Standard", name, tex_map, use_alpha)
+                return self.get_material_instance("Standard", name, tex_map, use_alpha, runtime)
         elif "Redshift" in mat_type:
             try:
-                mat = rt.Redshift_Material(name=name); mat.diffuse_color_map = tex_map
+                mat = runtime.Redshift_Material(name=name); mat.diffuse_color_map = tex_map
                 if use_alpha: mat.opacity_color_map = tex_map
             except Exception:
-                return self.get_material_instance("Standard", name, tex_map, use_alpha)
+                return self.get_material_instance("Standard", name, tex_map, use_alpha, runtime)
         else:
-            mat = rt.StandardMaterial(name=name, diffuseMap=tex_map)
+            mat = runtime.StandardMaterial(name=name, diffuseMap=tex_map)
         return mat
 
     # =================================================================
     # LOAD TEXTURE
     # =================================================================
-    def load_texture_map(self, fpath, use_alpha):
+    def load_texture_map(self, fpath, use_alpha, load_path=None, size=None, registry=None, runtime=None):
+        runtime = rt if runtime is None else runtime
         ext = os.path.splitext(fpath)[1].lower()
-        load_path = fpath
-
-        if ext in VIDEO_EXTENSIONS:
-            ffmpeg = find_ffmpeg()
-            if ffmpeg is None:
-                return None, (
-                    f"Cannot load video '{os.path.basename(fpath)}'.\n"
-                    f"FFmpeg is required for video support.\n\n"
-                    f"Install FFmpeg:\n"
-                    f"  winget install ffmpeg\n"
-                    f"  or download from https://ffmpeg.org/download.html\n"
-                    f"  and add to system PATH"
-                )
-            ifl_path, err = convert_video_to_sequence(ffmpeg, fpath)
-            if ifl_path is None:
+
+        if load_path is None:
+            ffmpeg = find_ffmpeg() if ext in VIDEO_EXTENSIONS else None
+            load_path, err = prepare_media(fpath, runtime.GetDir(runtime.name("temp")), ffmpeg,
+                                           self.get_frame_cache())
+            if load_path is None:
                 return None, err
-            load_path = ifl_path
+
+        if registry is not None:
+            tex = registry.find_texture(load_path, use_alpha)
+            if tex is not None:
+                return tex, None
+
+        if size is None:
+            size = probe_image_size(load_path)
 
         try:
-            tex = rt.BitmapTexture(fileName=load_path)
-            bmp = tex.bitmap
-            if bmp is None:
-                return None, f"Max could not read: {os.path.basename(fpath)}"
-            _ = bmp.width
-            _ = bmp.height
+            tex = runtime.BitmapTexture(fileName=load_path)
+            # A valid header probe stands in for validation; only unknown
+            # formats make Max decode the bitmap up front.
+            if size is None:
+                bmp = tex.bitmap
+                if bmp is None:
+                    return None, f"Max could not read: {os.path.basename(fpath)}"
+                _ = bmp.width
+                _ = bmp.height
         except Exception as e:
             return None, f"Cannot load '{os.path.basename(fpath)}': {str(e)}"
 
@@ -1004,6 +2266,9 @@ class ReferenceManager(QtWidgets.QWidget):
             except Exception:
                 pass
 
+        if registry is not None:
+            registry.add_texture(load_path, use_alpha, tex)
+
         return tex, None
 
     # =================================================================
@@ -1023,110 +2288,697 @@ class ReferenceManager(QtWidgets.QWidget):
         )
         files, _ = QtWidgets.QFileDialog.getOpenFileNames(self, "Select Media Files", "", filters)
         if files:
-            self.process_files(files)
+            self.import_paths(files)
 
     def paste_from_clipboard(self):
+        """
+        Copied files (any number, folders too) import like a drop. A copied
+        image is saved under a hash of its pixels on a worker thread, so
+        pasting the same image again reuses its file, texture and material.
+        """
         cb = QtGui.QGuiApplication.clipboard()
-        if cb.mimeData().hasImage():
-            temp_dir = rt.GetDir(rt.name("temp"))
-            fname = "clipboard_ref_{}.png".format(str(int(time.time())))
-            full_path = os.path.join(temp_dir, fname).replace("\\", "/")
-            if cb.image().save(full_path, "PNG"):
-                self.process_files([full_path])
-        else:
+        mime = cb.mimeData()
+        paths = [u.toLocalFile() for u in mime.urls()] if mime.hasUrls() else []
+        paths = [p for p in paths if p]
+        if paths:
+            self.import_paths(paths)
+            return
+        if not mime.hasImage():
             QtWidgets.QMessageBox.warning(self, "Info", "Clipboard is empty or has no image!")
+            return
+        if self._import_job is not None or self._scan_worker is not None or self._clipboard_worker is not None:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
+                "An import is already running.\nWait for it to finish or cancel it first.")
+            return
+
+        root = os.path.join(rt.GetDir(rt.name("temp")), CLIPBOARD_DIRNAME).replace("\\", "/")
+        thread = QtCore.QThread(self)
+        worker = ClipboardWorker([cb.image()], root)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_clipboard_saved)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(lambda t=thread: self._release_import_thread(t))
+        self._import_threads[thread] = worker
+        self._clipboard_worker = worker
+        thread.start()
+
+    def _on_clipboard_saved(self, paths, reused):
+        if self.sender() is not self._clipboard_worker:
+            return
+        self._clipboard_worker = None
+        if reused:
+            print(f"[RefCast] Clipboard: {reused} image(s) already saved — reusing the existing file")
+        if paths:
+            self.process_files(paths)
+        else:
+            QtWidgets.QMessageBox.warning(self, PLUGIN_NAME, "The clipboard image could not be saved.")
 
     # =================================================================
     # PROCESS FILES
     # =================================================================
-    def process_files(self, file_paths):
-        mode = self.COMBO_MODE.currentText()
-        scale_val = self.SPIN_SCALE.value()
-        pivot_loc = self.COMBO_PIVOT.currentText()
-        mat_type = self.COMBO_MAT.currentText()
-        use_alpha = self.CHK_ALPHA.isChecked()
-        is_auto_offset = self.btn_auto_offset.isChecked()
-
-        props = {
-            'freeze': self.CHK_FREEZE.isChecked(),
-            'cull': self.CHK_CULL.isChecked(),
-            'renderable': self.CHK_RENDERABLE.isChecked(),
-            'cast': self.CHK_CAST_SHADOWS.isChecked(),
-            'rcv': self.CHK_RCV_SHADOWS.isChecked(),
-            'gray': self.CHK_SHOW_GRAY.isChecked(),
-            'opacity': self.SLIDER_OPACITY.value() / 100.0
+    def _snapshot_import_settings(self):
+        self._ensure_settings_page()
+        return {
+            'mode': self.COMBO_MODE.currentText(),
+            'view': self.COMBO_VIEW.currentText(),
+            'scale': self.SPIN_SCALE.value(),
+            'pivot': self.COMBO_PIVOT.currentText(),
+            'mat_type': self.COMBO_MAT.currentText(),
+            'use_alpha': self.CHK_ALPHA.isChecked(),
+            'auto_offset': self.btn_auto_offset.isChecked(),
+            'offset': self.SPIN_OFFSET.value(),
+            'ffmpeg_jobs': self.SPIN_FFMPEG_JOBS.value(),
+            'ffmpeg_threads': self.SPIN_FFMPEG_THREADS.value(),
+            'video_options': self._video_options(),
+            'stream_video': self.CHK_STREAM_VIDEO.isChecked(),
+            'proxy_edge': self.SPIN_PROXY_EDGE.value() if self.CHK_PROXY.isChecked() else 0,
+            'detector': self._view_detector,
+            'min_confidence': self.SPIN_SMART_CONF.value(),
+            'atlas': {
+                'output': "mesh" if "Mesh" in self.COMBO_ATLAS_OUTPUT.currentText() else "plane",
+                'sheet': self.SPIN_ATLAS_SHEET.value(),
+                'cell': self.SPIN_ATLAS_CELL.value(),
+                'padding': self.SPIN_ATLAS_PAD.value(),
+            },
+            'layout': {
+                'mode': self.COMBO_LAYOUT.currentText().split()[0].lower(),
+                'spacing': self.SPIN_LAYOUT_SPACING.value(),
+                'columns': self.SPIN_LAYOUT_COLUMNS.value(),
+            },
+            'props': {
+                'freeze': self.CHK_FREEZE.isChecked(),
+                'cull': self.CHK_CULL.isChecked(),
+                'renderable': self.CHK_RENDERABLE.isChecked(),
+                'cast': self.CHK_CAST_SHADOWS.isChecked(),
+                'rcv': self.CHK_RCV_SHADOWS.isChecked(),
+                'gray': self.CHK_SHOW_GRAY.isChecked(),
+                'opacity': self.SLIDER_OPACITY.value() / 100.0
+            },
+            # Fade group for this import's planes, '' when each keeps its own opacity
+            'fade': (fade_group_key(self.COMBO_FADE_SCOPE.currentText())
+                     if self.CHK_SHARED_FADE.isChecked() else ""),
+        }
+
+    def _video_options(self):
+        return {
+            'start': self.SPIN_VIDEO_IN.value(),
+            'end': self.SPIN_VIDEO_OUT.value(),
+            'fps': self.SPIN_VIDEO_FPS.value(),
+            'max_edge': self.SPIN_VIDEO_EDGE.value(),
+            'format': 'jpg' if "JPEG" in self.COMBO_VIDEO_FORMAT.currentText() else 'png',
         }
 
-        created_objs = []
-        failed_files = []
+    def _scan_options(self):
+        self._ensure_settings_page()
+        return {
+            'max_depth': self.SPIN_SCAN_DEPTH.value(),
+            'include': parse_glob_list(self.EDIT_SCAN_INCLUDE.text()),
+            'exclude': parse_glob_list(self.EDIT_SCAN_EXCLUDE.text()),
+            'group_sequences': self.CHK_GROUP_SEQUENCES.isChecked(),
+            'min_frames': self.SPIN_SEQ_MIN_FRAMES.value(),
+            'sequence_root': os.path.join(rt.GetDir(rt.name("temp")), SEQUENCE_DIRNAME).replace("\\", "/"),
+            'frame_start': self.SPIN_SEQ_START.value(),
+            'frame_end': self.SPIN_SEQ_END.value(),
+            'frame_step': self.SPIN_SEQ_STEP.value(),
+            'gap_mode': ["hold", "split", "skip"][self.COMBO_SEQ_GAPS.currentIndex()],
+        }
+
+    def import_paths(self, paths):
+        """
+        Dropped or browsed paths: files import directly (numbered frames
+        grouped into IFLs); folders are scanned off the main thread first.
+        """
+        if not any(os.path.isdir(p) for p in paths):
+            files = [p for p in paths if os.path.splitext(p)[1].lower() in ALL_MEDIA_EXTENSIONS]
+            notes = []
+            options = self._scan_options()
+            if options['group_sequences'] and len(files) > 1:
+                files = group_sequence_files(files, options, notes)
+            self.process_files(files, notes)
+            return
+        if self._import_job is not None or self._scan_worker is not None:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
+                "An import is already running.\nWait for it to finish or cancel it first.")
+            return
+
+        thread = QtCore.QThread(self)
+        worker = ScanWorker(paths, self._scan_options())
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.batch_found.connect(self._on_scan_batch)
+        worker.finished.connect(self._on_scan_finished)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(lambda t=thread: self._release_import_thread(t))
+        self._import_threads[thread] = worker
+        self._scan_worker = worker
+        self._scan_count = 0
+
+        self.PROGRESS_IMPORT.setRange(0, 0)
+        self.PROGRESS_IMPORT.setFormat("Scanning…")
+        self.btn_cancel_import.setEnabled(True)
+        self.import_progress_row.setVisible(True)
+        thread.start()
+
+    def _on_scan_batch(self, files):
+        if self.sender() is not self._scan_worker:
+            return
+        self._scan_count += len(files)
+        self.PROGRESS_IMPORT.setFormat(f"Scanning…  {self._scan_count} file(s) found")
 
-        with pymxs.undo(True, "RefCast Import"):
-            loaded_data = []
-            max_width = 0.0
-            max_height = 0.0
+    def _on_scan_finished(self, files, notes):
+        worker = self.sender()
+        if worker is not self._scan_worker:
+            return
+        self._scan_worker = None
+        self.import_progress_row.setVisible(False)
+        if worker.is_cancelled():
+            return
+        if not files:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME, "No supported media found in the dropped folder(s).")
+            return
+        self.process_files(files, notes)
+
+    def process_files(self, file_paths, notes=None):
+        """
+        Staged import: files are prepared (checked / converted) on a worker
+        thread, then textures and planes are committed here in small batches
+        so the Max UI stays responsive.
+        """
+        if not file_paths:
+            return
+        if self._import_job is not None:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
+                "An import is already running.\nWait for it to finish or cancel it first.")
+            return
+
+        settings = self._snapshot_import_settings()
+        if "Atlas" in settings['mode']:
+            self._start_atlas_import(file_paths, settings, notes)
+            return
+
+        job = ImportJob(settings, len(file_paths))
+        job.notes = list(notes or [])
+        job.order = {p: i for i, p in enumerate(file_paths)}
+        # A board needs every size before the first plane is placed
+        job.layout_pending = ("Manual" in settings['mode'] and len(file_paths) > 1
+                              and settings['layout']['mode'] != "stacked")
+        if not job.settings['auto_offset']:
+            job.offsets = (job.settings['offset'], job.settings['offset'])
+        self._start_profiling(job, f"{len(file_paths)} file(s), {settings['mode']}")
+        job.registry.rebuild(runtime=job.rt)
+        self._import_job = job
+
+        thread = QtCore.QThread(self)
+        worker = ImportWorker(file_paths, rt.GetDir(rt.name("temp")),
+                              job.settings['ffmpeg_jobs'], job.settings['ffmpeg_threads'],
+                              self.get_frame_cache(), job.settings['video_options'],
+                              job.settings['stream_video'], job.settings['proxy_edge'], job.profiler)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.item_ready.connect(self._on_import_item_ready)
+        worker.item_failed.connect(self._on_import_item_failed)
+        worker.sequence_updated.connect(self._on_sequence_updated)
+        worker.video_progress.connect(self._on_video_progress)
+        worker.finished.connect(self._on_import_prepared)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(lambda t=thread: self._release_import_thread(t))
+        self._import_threads[thread] = worker
+        self._import_worker = worker
+
+        self.PROGRESS_IMPORT.setRange(0, job.total * 2)
+        self.PROGRESS_IMPORT.setValue(0)
+        self.PROGRESS_IMPORT.setFormat("Preparing…  %p%")
+        self.btn_cancel_import.setEnabled(True)
+        self.import_progress_row.setVisible(True)
+
+        thread.start()
+        self._commit_timer.start()
+
+    def _start_atlas_import(self, file_paths, settings, notes=None):
+        """Atlas mode: pack still images into sheets on a worker thread, then build one object per sheet."""
+        stills = [p for p in file_paths if os.path.splitext(p)[1].lower() in IMAGE_EXTENSIONS]
+        if not stills:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME, "Atlas mode packs still images only.")
+            return
+        job = ImportJob(settings, len(stills))
+        job.notes = list(notes or [])
+        job.failed = [f"{os.path.basename(p)} (atlas mode packs still images only)"
+                      for p in file_paths if p not in stills]
+        self._start_profiling(job, f"{len(stills)} file(s), Atlas")
+        job.registry.rebuild(runtime=job.rt)
+        self._import_job = job
+
+        thread = QtCore.QThread(self)
+        worker = AtlasWorker(stills, settings['atlas'], os.path.join(rt.GetDir(rt.name("temp")), ATLAS_DIRNAME),
+                             job.profiler)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_atlas_progress)
+        worker.finished.connect(self._on_atlas_ready)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(lambda t=thread: self._release_import_thread(t))
+        self._import_threads[thread] = worker
+        self._import_worker = worker
+
+        self.PROGRESS_IMPORT.setRange(0, len(stills))
+        self.PROGRESS_IMPORT.setValue(0)
+        self.PROGRESS_IMPORT.setFormat("Packing atlas…  %p%")
+        self.btn_cancel_import.setEnabled(True)
+        self.import_progress_row.setVisible(True)
+        thread.start()
+
+    def _on_atlas_progress(self, done, total):
+        if self.sender() is self._import_worker:
+            self.PROGRESS_IMPORT.setValue(done)
+
+    def _on_atlas_ready(self, sheets, failed):
+        job = self._import_job
+        if job is None or self.sender() is not self._import_worker:
+            return
+        self._import_worker = None
+        job.preparing = False
+        job.failed.extend(f"Cannot read: {os.path.basename(p)}" for p in failed)
+        if sheets and not job.cancelled:
+            with self._import_undo(job), job.profiler.stage("atlas_build", sheets=len(sheets)):
+                self._build_atlas(job, sheets)
+        self._finish_import()
+
+    def _build_atlas(self, job, sheets):
+        s = job.settings
+        view = s['view']
+        scale_val = s['scale']
+        if s['auto_offset']:
+            offset = max(sh['width'] for sh in sheets) * scale_val / 2.0
+            self.SPIN_OFFSET.setValue(offset)
+        else:
+            offset = s['offset']
+        mat_key = SceneAssetRegistry.material_key(s['mat_type'], s['use_alpha'])
+        entries = []
+        records = []
+        for n, (sheet, shift) in enumerate(zip(sheets, atlas_sheet_shifts(sheets, scale_val))):
+            size = (sheet['width'], sheet['height'])
+            tex, err = self.load_texture_map(sheet['path'], s['use_alpha'], sheet['path'], size, job.registry,
+                                             job.rt)
+            if tex is None:
+                job.failed.append(err or os.path.basename(sheet['path']))
+                continue
+            mat = self._reuse_or_create_material(job, "Ref_Atlas_", tex, sheet['path'])
+            spec = build_plane_spec(f"Atlas_{n + 1:02d}", view, size[0], size[1], scale_val, offset, "Center")
+            spec = move_in_view(spec, view, shift)
+            record = index_record(sheet['path'], view, s['mode'], s, size=size)
+            record['members'] = [item[0] for item in sheet['items']]
+            if s['atlas']['output'] == "mesh":
+                node = commit_atlas_mesh(job.rt, spec['name'], sheet, scale_val, mat, tex, spec,
+                                         s['props'], LAYER_NAME)
+                job.created.append(node)
+                job.indexed.append((node, record))
+            else:
+                entries.append((spec, tex, mat, mat_key, None, None))
+                records.append(record)
+        nodes = self.create_planes_bulk(entries, s['props'], runtime=job.rt)
+        job.created.extend(nodes)
+        job.indexed.extend(zip(nodes, records))
+
+    def cancel_import(self):
+        if self._scan_worker is not None:
+            self._scan_worker.cancel()
+            self.btn_cancel_import.setEnabled(False)
+            self.PROGRESS_IMPORT.setFormat("Cancelling…")
+            return
+        job = self._import_job
+        if job is None:
+            return
+        job.cancelled = True
+        job.pending = []
+        if self._import_worker is not None:
+            self._import_worker.cancel()
+        self.btn_cancel_import.setEnabled(False)
+        self.PROGRESS_IMPORT.setFormat("Cancelling…")
+
+    def _release_import_thread(self, thread):
+        worker = self._import_threads.pop(thread, None)
+        if worker is not None:
+            worker.deleteLater()
+        thread.deleteLater()
+
+    def _on_import_item_ready(self, fpath, load_path, width, height, signature):
+        job = self._import_job
+        if job is None or job.cancelled or self.sender() is not self._import_worker:
+            return
+        job.sources[fpath] = (load_path, signature)
+        size = (width, height) if width > 0 and height > 0 else None
+        if load_path != fpath and os.path.splitext(fpath)[1].lower() in IMAGE_EXTENSIONS:
+            job.proxies[fpath] = load_path
+        job.pending.append((fpath, load_path, size))
+
+    def _on_import_item_failed(self, err):
+        job = self._import_job
+        if job is None or self.sender() is not self._import_worker:
+            return
+        job.failed.append(err)
+        job.loaded_count += 1
+        job.built_count += 1
+        self._update_import_progress()
+
+    def _on_import_prepared(self):
+        if self.sender() is not self._import_worker:
+            return
+        self._clear_video_progress()
+        if self._import_job is not None:
+            self._import_job.preparing = False
+        self._import_worker = None
+
+    def _on_video_progress(self, fpath, fraction, eta):
+        if self.sender() is not self._import_worker:
+            return
+        name = os.path.basename(fpath)
+        if fraction >= 1.0:
+            self._video_jobs.pop(name, None)
+        else:
+            pct = f"{fraction * 100:.0f}%" if fraction >= 0 else "…"
+            self._video_jobs[name] = f"{name}  {pct}  ETA {format_eta(eta if eta >= 0 else None)}"
+        self.lbl_video_progress.setText("\n".join(self._video_jobs.values()))
+        self.lbl_video_progress.setVisible(bool(self._video_jobs))
+
+    def _clear_video_progress(self):
+        self._video_jobs = {}
+        self.lbl_video_progress.setVisible(False)
+
+    def _on_sequence_updated(self, ifl_path, finished):
+        if finished:
+            self._stream_finished.add(ifl_path)
+        if ifl_path in self._streaming_textures:
+            self._stream_dirty.add(ifl_path)
+            if not self._stream_timer.isActive():
+                self._stream_timer.start()
+
+    def _track_streaming_texture(self, tex, load_path):
+        if load_path in self._stream_finished:
+            return
+        self._streaming_textures.setdefault(load_path, []).append(tex)
 
-            for fpath in file_paths:
-                tex, err = self.load_texture_map(fpath, use_alpha)
-                if tex is None:
-                    failed_files.append(err or os.path.basename(fpath))
+    def _reload_streaming_textures(self):
+        dirty = self._stream_dirty
+        self._stream_dirty = set()
+        for ifl_path in dirty:
+            for tex in self._streaming_textures.get(ifl_path, []):
+                try:
+                    tex.reload()
+                except Exception:
+                    pass
+            if ifl_path in self._stream_finished:
+                self._streaming_textures.pop(ifl_path, None)
+                self._stream_finished.discard(ifl_path)
+        if dirty:
+            rt.redrawViews()
+
+    def _update_import_progress(self):
+        job = self._import_job
+        if job is None:
+            return
+        self.PROGRESS_IMPORT.setValue(job.loaded_count + job.built_count)
+        if not job.cancelled:
+            self.PROGRESS_IMPORT.setFormat(
+                f"Importing {min(job.loaded_count, job.total)}/{job.total}…  %p%")
+
+    def _commit_import_batch(self):
+        """Timer tick: load / build at most IMPORT_BATCH_SIZE files, then yield to Qt."""
+        job = self._import_job
+        if job is None:
+            self._commit_timer.stop()
+            return
+        s = job.settings
+
+        if job.pending:
+            batch = job.pending[:IMPORT_BATCH_SIZE]
+            del job.pending[:IMPORT_BATCH_SIZE]
+            placed = job.offsets is not None and not job.layout_pending
+            early = []
+            with self._import_undo(job):
+                for fpath, load_path, size in batch:
+                    with job.profiler.stage("load_texture"):
+                        tex, err = self.load_texture_map(fpath, s['use_alpha'], load_path, size, job.registry, job.rt)
+                    job.loaded_count += 1
+                    if tex is None:
+                        job.failed.append(err or os.path.basename(fpath))
+                        job.built_count += 1
+                        continue
+                    if size is None:
+                        size = (tex.bitmap.width, tex.bitmap.height)
+                    current_w = size[0] * s['scale']
+                    current_h = size[1] * s['scale']
+                    if current_w > job.max_width: job.max_width = current_w
+                    if current_h > job.max_height: job.max_height = current_h
+                    if s['stream_video'] and os.path.splitext(fpath)[1].lower() in VIDEO_EXTENSIONS:
+                        self._track_streaming_texture(tex, load_path)
+                        if not placed:
+                            early.append((tex, fpath, size))
+                            continue
+                    job.loaded.append((tex, fpath, size))
+                # Offsets are known up front unless AUTO is on: build as we go
+                if placed:
+                    self._build_import_planes(job, job.loaded)
+                    job.loaded = []
+                # Streamed clips show up now at a provisional place (AUTO offset so
+                # far, no board slot) and move once every size is known
+                if early:
+                    self._build_import_planes(job, early, early=True)
+                    job.early.extend(early)
+            self._update_import_progress()
+            return
+
+        if job.preparing and not job.cancelled:
+            return  # waiting on the worker thread
+
+        if job.loaded or job.early:
+            if job.offsets is None:
+                job.offsets = (job.max_width / 2.0, job.max_height / 2.0)
+                self.SPIN_OFFSET.setValue(job.offsets[0])
+            if job.layout_pending:
+                self._layout_import_board(job)
+        if job.early:
+            with self._import_undo(job):
+                self._place_early_planes(job)
+
+        if job.loaded:
+            batch = job.loaded[:IMPORT_BATCH_SIZE]
+            del job.loaded[:IMPORT_BATCH_SIZE]
+            with self._import_undo(job):
+                self._build_import_planes(job, batch)
+            self._update_import_progress()
+            return
+
+        self._finish_import()
+
+    def _import_undo(self, job):
+        """
+        Undo context for one commit of `job`. Commits span many timer ticks,
+        so the first one opens a hold that _finish_import accepts: the whole
+        import is a single Ctrl+Z step.
+        """
+        if not job.holding:
+            rt.theHold.Begin()
+            job.holding = True
+        return pymxs.undo(True)
+
+    def _layout_import_board(self, job):
+        """Place every loaded file on the Manual mode board in one pass, in drop order."""
+        s = job.settings
+        job.layout_pending = False
+        def drop_order(item):
+            return job.order.get(item[1], len(job.order))
+        job.loaded.sort(key=drop_order)
+        items = sorted(job.loaded + job.early, key=drop_order)   # streamed clips already built get a slot too
+        sizes = [(size[0] * s['scale'], size[1] * s['scale']) for _, _, size in items]
+        board = s['layout']
+        with job.profiler.stage("layout"):
+            centres = layout_board(sizes, board['mode'], board['spacing'], board['columns'])
+        job.layout = {fpath: c for (_, fpath, _), c in zip(items, centres)}
+
+    def _place_early_planes(self, job):
+        """Move planes built before the offsets / board were final to where they belong."""
+        s = job.settings
+        with job.profiler.stage("place_early", planes=len(job.early_nodes)):
+            for node, fpath, view, size, pos in job.early_nodes:
+                if not job.rt.isValidNode(node):
                     continue
-                current_w = tex.bitmap.width * scale_val
-                current_h = tex.bitmap.height * scale_val
-                if current_w > max_width: max_width = current_w
-                if current_h > max_height: max_height = current_h
-                loaded_data.append((tex, fpath))
-
-            if is_auto_offset:
-                offset_val_w = max_width / 2.0
-                offset_val_h = max_height / 2.0
-                self.SPIN_OFFSET.setValue(offset_val_w)
+                spec = plane_specs_for_file(fpath, size, s['mode'], [view], s['scale'],
+                                            job.offsets, s['pivot'])[0]
+                if job.layout and fpath in job.layout:
+                    spec = move_in_view(spec, view, *job.layout[fpath])
+                delta = [a - b for a, b in zip(spec['pos'], pos)]
+                if any(abs(d) > 1e-6 for d in delta):
+                    job.rt.move(node, job.rt.Point3(*delta))
+        job.early = []
+        job.early_nodes = []
+
+    def _build_import_planes(self, job, loaded_data, assigned_views=None, early=False):
+        """
+        Planes for loaded textures; `assigned_views` ({path: view}) overrides
+        Smart Detect. `early` planes use the offsets known so far and are
+        remembered for _place_early_planes.
+        """
+        s = job.settings
+        mode = s['mode']
+        scale_val = s['scale']
+        pivot_loc = s['pivot']
+        mat_key = SceneAssetRegistry.material_key(s['mat_type'], s['use_alpha'])
+        offsets = job.offsets or (job.max_width / 2.0, job.max_height / 2.0)
+        entries = []
+        records = []
+        placed = []
+
+        for tex, fpath, size in loaded_data:
+            if size is None:
+                size = (tex.bitmap.width, tex.bitmap.height)
+            if assigned_views is not None:
+                views, prefix = [assigned_views[fpath]], "Ref_"
             else:
-                offset_val_w = self.SPIN_OFFSET.value()
-                offset_val_h = self.SPIN_OFFSET.value()
-
-            if "Manual" in mode:
-                view_name = self.COMBO_VIEW.currentText()
-                for tex, fpath in loaded_data:
-                    mat_name = "Ref_" + os.path.basename(fpath)
-                    mat = self.get_material_instance(mat_type, mat_name, tex, use_alpha)
-                    if not mat: mat = rt.StandardMaterial(name=mat_name, diffuseMap=tex)
-                    obj = self.create_plane_obj(tex, view_name, scale_val, offset_val_w, pivot_loc, mat, props, False)
-                    created_objs.append(obj)
-
-            elif "Box" in mode:
-                all_views = ["Front", "Back", "Left", "Right", "Top", "Bottom"]
-                for tex, fpath in loaded_data:
-                    base_mat_name = "Ref_Box_" + os.path.basename(fpath)
-                    mat = self.get_material_instance(mat_type, base_mat_name, tex, use_alpha)
-                    if not mat: mat = rt.StandardMaterial(name=base_mat_name, diffuseMap=tex)
-                    for v in all_views:
-                        use_offset = offset_val_h if (v in ["Top", "Bottom"]) else offset_val_w
-                        obj = self.create_plane_obj(tex, v, scale_val, use_offset, pivot_loc, mat, props, True)
-                        created_objs.append(obj)
-
-            elif "Smart" in mode:
-                for tex, fpath in loaded_data:
-                    detected = detect_view_from_name(fpath)
-                    if detected:
-                        mat_name = "Ref_" + os.path.basename(fpath)
-                        mat = self.get_material_instance(mat_type, mat_name, tex, use_alpha)
-                        if not mat: mat = rt.StandardMaterial(name=mat_name, diffuseMap=tex)
-                        obj = self.create_plane_obj(tex, detected, scale_val, offset_val_w, pivot_loc, mat, props, False)
-                        created_objs.append(obj)
-
-            if created_objs:
-                ref_layer = get_or_create_layer(LAYER_NAME)
-                for obj in created_objs:
-                    ref_layer.addNode(obj)
-                rt.select(created_objs)
-                rt.redrawViews()
+                views, prefix = views_for_file(mode, fpath, s['view'], s['detector'], s['min_confidence'])
+            if not views:
+                if "Smart" in mode:
+                    job.review.append((tex, fpath, size))
+                continue
+            with job.profiler.stage("material"):
+                mat = self._reuse_or_create_material(job, prefix, tex, fpath)
+            proxy = job.proxies.get(fpath)
+            load_path, signature = job.sources.get(fpath, (None, None))
+            specs = plane_specs_for_file(fpath, size, mode, views, scale_val, offsets, pivot_loc)
+            for view, spec in zip(views, specs):
+                if job.layout and fpath in job.layout:
+                    spec = move_in_view(spec, view, *job.layout[fpath])
+                entries.append((spec, tex, mat, mat_key, fpath if proxy else None, proxy))
+                records.append(index_record(fpath, view, mode, s, load_path, size, signature, proxy))
+                placed.append((fpath, view, size, spec['pos']))
+
+        # Built straight onto the layer, batch by batch, so a cancel keeps partial results
+        with job.profiler.stage("build_planes", planes=len(entries)):
+            created_objs = self.create_planes_bulk(entries, s['props'], runtime=job.rt)
+        job.created.extend(created_objs)
+        job.indexed.extend(zip(created_objs, records))
+        if early:
+            job.early_nodes.extend((node,) + p for node, p in zip(created_objs, placed))
+        job.built_count += len(loaded_data)
+
+    def _reuse_or_create_material(self, job, prefix, tex, fpath):
+        """Material for `tex`, shared with any RefCast plane already using the same file and settings."""
+        s = job.settings
+        mat_key = SceneAssetRegistry.material_key(s['mat_type'], s['use_alpha'])
+        tex_path = tex.filename
+        mat = job.registry.find_material(tex_path, mat_key)
+        if mat is not None:
+            return mat
+        mat_name = prefix + os.path.basename(fpath)
+        mat = self.get_material_instance(s['mat_type'], mat_name, tex, s['use_alpha'], job.rt)
+        if not mat: mat = job.rt.StandardMaterial(name=mat_name, diffuseMap=tex)
+        job.registry.add_material(tex_path, mat_key, mat)
+        return mat
+
+    def _finish_import(self):
+        job = self._import_job
+        self._commit_timer.stop()
+        self._import_job = None
+        if self._import_worker is not None:
+            self._import_worker.cancel()
+            self._import_worker = None
+        self.import_progress_row.setVisible(False)
+        self._clear_video_progress()
 
-        if failed_files:
+        try:
+            if job.review and not job.cancelled:
+                self._review_smart_detect(job)
+
+            if job.created:
+                with job.profiler.stage("scene_index"):
+                    index = self.scene_index()
+                    if job.indexed:
+                        index_new_nodes(job.rt, index, [n for n, _ in job.indexed], [r for _, r in job.indexed])
+                    self.save_scene_index()
+                self.update_source_watch()
+
+            if job.proxies:
+                # Proxies share the frame cache limit; keep the ones this import just loaded
+                self.get_frame_cache().evict(protect={f"{PROXY_DIRNAME}/{os.path.basename(p)}"
+                                                      for p in job.proxies.values()})
+
+            if job.created and job.settings['fade']:
+                with job.profiler.stage("shared_fade"), self._import_undo(job):
+                    job.rt.REFCAST_FADE_ATTACH_FN(job.created, job.settings['fade'],
+                                              job.settings['props']['opacity'], LAYER_NAME)
+
+            if job.created:
+                with job.profiler.stage("select_redraw"):
+                    job.rt.select(job.created)
+                    job.rt.redrawViews()
+        finally:
+            if job.holding:
+                rt.theHold.Accept("RefCast Import")
+                job.holding = False
+        self._stop_profiling(job)
+
+        if job.cancelled:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
+                f"Import cancelled — kept {len(job.created)} plane(s).")
+
+        if job.notes and not job.cancelled:
+            msg = "Import notes:\n\n"
+            msg += "\n".join(f"• {n}" for n in job.notes)
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME, msg)
+
+        if job.failed:
             msg = "The following files could not be loaded:\n\n"
-            msg += "\n".join(f"• {f}" for f in failed_files)
+            msg += "\n".join(f"• {f}" for f in job.failed)
             QtWidgets.QMessageBox.warning(self, f"{PLUGIN_NAME} — Import Warning", msg)
 
 
+    # =================================================================
+    # PROFILING
+    # =================================================================
+    def _start_profiling(self, job, label):
+        if not self.CHK_PROFILE_IMPORT.isChecked():
+            return
+        job.profiler = ImportProfiler(label)
+        # Only this import's scene calls are counted, not the rest of the UI
+        job.rt = CountingRuntime(pymxs.runtime, job.profiler)
+
+    def _stop_profiling(self, job):
+        if not job.profiler.enabled:
+            return
+        self._last_profile = job.profiler
+        print(job.profiler.summary())
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(rt.GetDir(rt.name("temp")), PROFILE_DIRNAME, f"refcast_import_{stamp}.json")
+        try:
+            print(f"[RefCast] Trace written to {job.profiler.write_trace(path)}")
+        except OSError as e:
+            print(f"[RefCast] Could not write trace: {e}")
+
+    def export_last_profile(self):
+        if self._last_profile is None:
+            QtWidgets.QMessageBox.information(self, PLUGIN_NAME,
+                "No profiled import yet.\nTurn on 'Profile Imports' and import something first.")
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Import Profile", "refcast_profile.json", "Chrome Trace (*.json)")
+        if path:
+            self._last_profile.write_trace(path)
+
+    def _review_smart_detect(self, job):
+        """Ask for views of files Smart Detect couldn't place confidently, then build those."""
+        detector = job.settings['detector']
+        rows = [(fpath, detector.match(fpath)) for _, fpath, _ in job.review]
+        dlg = ViewReviewDialog(rows, self)
+        if dlg.exec_() != QtWidgets.QDialog.Accepted:
+            return
+        assigned = dlg.assignments()
+        reviewed = [item for item in job.review if item[1] in assigned]
+        if not reviewed:
+            return
+        with self._import_undo(job):
+            self._build_import_planes(job, reviewed, assigned)
+
+
 # =============================================================================
 # RUN
 # =============================================================================
@@ -1136,10 +2988,18 @@ def run():
 
     if max_win:
         for dock in max_win.findChildren(QtWidgets.QDockWidget):
-            if dock.objectName() == dock_id:
-                max_win.removeDockWidget(dock)
-                dock.close()
-                dock.deleteLater()
+            if dock.objectName() != dock_id:
+                continue
+            # Same module still loaded: bring the existing dock back with its state
+            if isinstance(dock.widget(), ReferenceManager):
+                ensure_maxscript_helpers(rt)
+                dock.show()
+                dock.raise_()
+                dock.activateWindow()
+                return
+            max_win.removeDockWidget(dock)
+            dock.close()
+            dock.deleteLater()
 
     widget = ReferenceManager()
     dock_widget = QtWidgets.QDockWidget(PLUGIN_FULL, max_win)
@@ -0,0 +1,148 @@
+"""
+Smart Detect benchmark
+======================
+Compares the compiled, memoized view detector in RefCast_Core against the
+original per-call implementation (copied below unchanged) on a synthetic
+reference library, and checks both give identical answers.
+
+Usage:
+    python benchmarks/bench_detect.py
+    python benchmarks/bench_detect.py --files 50000 --unique 0.3
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from RefCast_Core import ViewDetector, detect_views
+
+WORDS = ["car", "chair", "hero", "house", "robot", "tree", "concept", "ref", "final", "v02", "wip",
+         "detail", "sketch", "model", "blueprint", "scan", "photo"]
+HINTS = ["front", "Back", "LEFT", "right", "top", "bottom", "fv", "bv", "lv", "rv", "tv", "bot",
+         "rear", "facade", "under", "Above", "side", "frontal", "backdrop", "topology", "persp", ""]
+SEPARATORS = ["_", "-", " ", ".", ""]
+EXTENSIONS = [".jpg", ".png", ".tga", ".exr"]
+
+
+# ==========================================
+# ===== LEGACY IMPLEMENTATION =====
+# ==========================================
+def legacy_detect_view_from_name(filename):
+    """
+    Advanced view detection from filename.
+    Supports full names, abbreviations, prefixes, suffixes,
+    multi-language hints, and common 3D naming conventions.
+    """
+    name = os.path.splitext(os.path.basename(filename))[0].lower()
+    tokens = re.split(r'[\s_\-\.]+', name)
+
+    # Priority ordered: each entry = (view, exact_tokens, substring_patterns)
+    rules = [
+        ("Front",
+         {"front", "fv", "fnt", "frnt", "f_view", "frontview", "anterior", "fwd", "forward", "facade", "face"},
+         {"_front", "front_", "-front", "front-", ".front", "_fv", "fv_", "_fnt"}),
+        ("Back",
+         {"back", "bv", "bck", "bk", "rear", "b_view", "backview", "posterior", "behind", "dorsal"},
+         {"_back", "back_", "-back", "back-", ".back", "_bv", "bv_", "_bck", "_rear"}),
+        ("Left",
+         {"left", "lv", "lft", "lt", "l_view", "leftview", "lside", "l_side", "gauche", "izquierda"},
+         {"_left", "left_", "-left", "left-", ".left", "_lv", "lv_", "_lft"}),
+        ("Right",
+         {"right", "rv", "rgt", "rt", "r_view", "rightview", "rside", "r_side", "droite", "derecha"},
+         {"_right", "right_", "-right", "right-", ".right", "_rv", "rv_", "_rgt"}),
+        ("Top",
+         {"top", "tv", "tp", "t_view", "topview", "above", "up", "overhead", "ceil", "upper", "plan"},
+         {"_top", "top_", "-top", "top-", ".top", "_tv", "tv_"}),
+        ("Bottom",
+         {"bottom", "bov", "bot", "btm", "bt", "b_view", "bottomview", "below",
+          "down", "under", "ventral", "floor", "base", "sole", "lower"},
+         {"_bottom", "bottom_", "-bottom", "bottom-", ".bottom", "_bot", "bot_", "_btm", "btm_"}),
+    ]
+
+    # Pass 1: Exact token match (highest confidence)
+    for view, token_set, _ in rules:
+        for t in tokens:
+            if t in token_set:
+                return view
+
+    # Pass 2: Substring match
+    for view, _, substr_set in rules:
+        for pat in substr_set:
+            if pat in name:
+                return view
+
+    # Pass 3: Loose contains (unambiguous long keywords only)
+    loose = [
+        ("Front", ["front", "anterior", "forward", "facade"]),
+        ("Back",  ["back", "rear", "posterior", "behind"]),
+        ("Left",  ["left"]),
+        ("Right", ["right"]),
+        ("Top",   ["top", "above", "overhead"]),
+        ("Bottom",["bottom", "below", "under"]),
+    ]
+    for view, keywords in loose:
+        for kw in keywords:
+            if kw in name:
+                return view
+
+    return None
+
+
+# ==========================================
+# ===== BENCHMARK =====
+# ==========================================
+def make_names(count, unique_ratio, seed=7):
+    """Library-like paths: `unique_ratio` of them distinct, the rest repeated basenames in other folders."""
+    rng = random.Random(seed)
+    n_unique = max(1, int(count * unique_ratio))
+    stems = []
+    for _ in range(n_unique):
+        parts = [rng.choice(WORDS), rng.choice(HINTS), f"{rng.randint(0, 999):03d}"]
+        rng.shuffle(parts)
+        stems.append(rng.choice(SEPARATORS).join(p for p in parts if p))
+    paths = []
+    for i in range(count):
+        stem = stems[i % n_unique]
+        paths.append(f"D:/refs/project_{rng.randint(0, 40)}/{stem}{rng.choice(EXTENSIONS)}")
+    return paths
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Smart Detect view detection.")
+    parser.add_argument('--files', type=int, default=20000)
+    parser.add_argument('--unique', type=float, default=0.5, help="fraction of distinct basenames")
+    args = parser.parse_args(argv)
+
+    paths = make_names(args.files, args.unique)
+    legacy, t_legacy = timed(lambda: [legacy_detect_view_from_name(p) for p in paths])
+    cold, t_cold = timed(ViewDetector().detect_many, paths)
+    detect_views(paths)
+    warm, t_warm = timed(detect_views, paths)
+
+    mismatches = [(p, a, b) for p, a, b in zip(paths, legacy, cold) if a != b]
+    print(f"Smart Detect benchmark — {len(paths)} paths, {len(set(os.path.basename(p) for p in paths))} basenames")
+    print(f"  legacy         {t_legacy * 1000:9.1f} ms")
+    print(f"  compiled cold  {t_cold * 1000:9.1f} ms   x{t_legacy / max(t_cold, 1e-9):.1f}")
+    print(f"  compiled warm  {t_warm * 1000:9.1f} ms   x{t_legacy / max(t_warm, 1e-9):.1f}")
+    if mismatches or cold != warm:
+        for p, a, b in mismatches[:10]:
+            print(f"  MISMATCH {p}: legacy={a} compiled={b}")
+        return 1
+    print("  results identical to legacy")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
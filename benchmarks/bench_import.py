@@ -0,0 +1,316 @@
+"""
+RefCast import benchmark
+========================
+Runs the headless import stages from RefCast_Core on synthetic media and a
+fake pymxs runtime, so import performance can be tracked without 3ds Max.
+
+Stages:
+    scan      expand a folder into media files (os.walk, then parallel scandir)
+    probe     read image sizes from file headers
+    detect    Smart Mode view detection on every filename
+    plan      plane specs for Manual and Box Mode
+    layout    Manual mode board layouts (grid / row / masonry) for every image
+    commit    bulk plane construction through the fake runtime (call counts)
+    index     record every Manual plane in the scene index, save, reload, look up by source
+    resync    find the few changed sources among all indexed images (stat first, hash on change)
+    atlas     bin-pack every image into sheets, then one mesh per sheet
+    video     cold FFmpeg conversion vs. cached re-import (needs FFmpeg)
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --images 5000 --json results.json
+    python benchmarks/bench_import.py --baseline results.json --tolerance 0.25
+    python benchmarks/bench_import.py --trace trace.json      # chrome://tracing / Perfetto
+
+With --baseline, exits with status 1 if any stage got slower than the
+baseline by more than the tolerance.
+"""
+
+import os
+import sys
+import json
+import time
+import struct
+import zlib
+import random
+import shutil
+import argparse
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import fake_pymxs
+import RefCast_Core
+from RefCast_Core import (
+    collect_media_files, scan_media_paths, probe_image_size, detect_view_from_name,
+    views_for_file, plane_specs_for_file, commit_plane_specs,
+    ToolResolver, FrameCache, VideoConversionScheduler,
+    fit_size, pack_atlas, build_plane_spec, commit_atlas_mesh, layout_board,
+    ReferenceIndex, index_record, index_new_nodes, read_scene_index, write_scene_index, resolve_index_nodes,
+    file_signature, find_changed_sources, ImportProfiler,
+)
+
+VIEW_HINTS = ["front", "back", "left", "right", "top", "bottom", "fv", "side", "detail", "ref", "concept"]
+IMAGE_SIZES = [(640, 480), (1024, 768), (1920, 1080), (2048, 2048), (4096, 2160), (800, 1200)]
+DEFAULT_PROPS = {'opacity': 0.5, 'gray': False, 'freeze': True, 'cull': False,
+                 'renderable': False, 'cast': False, 'rcv': False}
+
+
+# ==========================================
+# ===== SYNTHETIC MEDIA =====
+# ==========================================
+def write_png(path, w, h):
+    """Valid PNG with a 1-row compressed body; only the header matters to the probe."""
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+    raw = zlib.compress(b'\x00' + b'\x80' * (3 * min(w, 64)))
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', w, h, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', raw))
+        f.write(chunk(b'IEND', b''))
+
+
+def write_bmp(path, w, h):
+    with open(path, 'wb') as f:
+        f.write(b'BM' + struct.pack('<IHHI', 54, 0, 0, 54))
+        f.write(struct.pack('<IiiHHIIiiII', 40, w, h, 1, 24, 0, 0, 2835, 2835, 0, 0))
+
+
+def write_tga(path, w, h):
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<BBBHHBHHHHBB', 0, 0, 2, 0, 0, 0, 0, 0, w, h, 24, 0))
+
+
+WRITERS = [('.png', write_png), ('.png', write_png), ('.bmp', write_bmp), ('.tga', write_tga)]
+
+
+def make_images(root, count, seed=1):
+    rng = random.Random(seed)
+    expected = {}
+    for i in range(count):
+        sub = os.path.join(root, f"set_{i // 100:02d}")
+        os.makedirs(sub, exist_ok=True)
+        ext, writer = WRITERS[i % len(WRITERS)]
+        w, h = rng.choice(IMAGE_SIZES)
+        path = os.path.join(sub, f"model_{i:05d}_{rng.choice(VIEW_HINTS)}{ext}").replace("\\", "/")
+        writer(path, w, h)
+        expected[path] = (w, h)
+    return expected
+
+
+def make_videos(ffmpeg_path, root, count):
+    import subprocess
+    paths = []
+    for i in range(count):
+        path = os.path.join(root, f"clip_{i:02d}_front.mp4")
+        cmd = [ffmpeg_path, '-y', '-loglevel', 'error', '-f', 'lavfi',
+               '-i', 'testsrc=duration=2:size=320x240:rate=24', '-pix_fmt', 'yuv420p', path]
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        paths.append(path)
+    return paths
+
+
+# ==========================================
+# ===== STAGES =====
+# ==========================================
+PROFILER = ImportProfiler("bench_import")
+
+
+def timed(results, name, fn, *args):
+    start = time.perf_counter()
+    with PROFILER.stage(name):
+        value = fn(*args)
+    results[name] = time.perf_counter() - start
+    return value
+
+
+def plan(files, sizes, mode):
+    specs = []
+    for fpath in files:
+        views, prefix = views_for_file(mode, fpath, "Front")
+        if views:
+            specs.extend(plane_specs_for_file(fpath, sizes[fpath], mode, views, 1.0,
+                                              (1000.0, 1000.0), "Center"))
+    return specs
+
+
+def layout(files, sizes):
+    boxes = [sizes[f] for f in files]
+    return [layout_board(boxes, mode, 10.0) for mode in ("grid", "row", "masonry")]
+
+
+def commit(runtime, specs, batch_size):
+    tex = runtime.BitmapTexture(filename="shared.png")
+    mat = runtime.StandardMaterial(name="Ref_shared", diffuseMap=tex)
+    runtime.reset_counts()
+    for i in range(0, len(specs), batch_size):
+        entries = [(spec, tex, mat, "Standard|1", None, None) for spec in specs[i:i + batch_size]]
+        commit_plane_specs(runtime, entries, DEFAULT_PROPS, "REFERENCES")
+    return runtime.total_calls
+
+
+def index(runtime, files, sizes):
+    nodes = runtime.nodes[:len(files)]      # the commit_manual planes, one per file
+    records = [index_record(f, "Front", "Manual", {'scale': 1.0}, size=sizes[f]) for f in files]
+    runtime.reset_counts()
+    scene_index = ReferenceIndex()
+    index_new_nodes(runtime, scene_index, nodes, records)
+    write_scene_index(runtime, scene_index)
+    loaded, _ = read_scene_index(runtime)
+    for f in files:
+        resolve_index_nodes(runtime, loaded, loaded.handles_for_source(f))
+    return runtime.total_calls
+
+
+def signed_index(files, sizes):
+    scene_index = ReferenceIndex()
+    for handle, f in enumerate(files, 1):
+        scene_index.add(handle, index_record(f, "Front", "Manual", {}, size=sizes[f], signature=file_signature(f)))
+    return scene_index
+
+
+def edit_files(files, count):
+    """Append to `count` images and push their mtime forward, like an artist re-saving them."""
+    edited = files[::max(1, len(files) // count)][:count]
+    for f in edited:
+        with open(f, 'ab') as fh:
+            fh.write(b'\x00' * 16)
+        st = os.stat(f)
+        os.utime(f, (st.st_atime, st.st_mtime + 10))
+    return edited
+
+
+def atlas(runtime, files, sizes):
+    fitted = [fit_size(sizes[f][0], sizes[f][1], 512) for f in files]
+    sheets = pack_atlas(fitted, 4096, 4)
+    runtime.reset_counts()
+    for n, sheet in enumerate(sheets):
+        sheet = dict(sheet, path=f"sheet_{n:02d}.png")
+        spec = build_plane_spec(sheet['path'], "Front", sheet['width'], sheet['height'], 1.0, 1000.0, "Center")
+        commit_atlas_mesh(runtime, spec['name'], sheet, 1.0, None, None, spec, DEFAULT_PROPS, "REFERENCES")
+    return runtime.total_calls
+
+
+def bench_videos(results, notes, root, count):
+    # Throwaway resolver, so a benchmark never writes the user's RefCast_Settings.json;
+    # conversions look ffprobe up through RefCast_Core.TOOLS, so it stands in there too
+    tools = ToolResolver(os.path.join(root, "settings.json"))
+    saved_tools, RefCast_Core.TOOLS = RefCast_Core.TOOLS, tools
+    try:
+        ffmpeg_path = tools.resolve("ffmpeg")
+        if not ffmpeg_path:
+            notes.append("video: skipped (FFmpeg not found)")
+            return
+        videos = make_videos(ffmpeg_path, root, count)
+        cache = FrameCache(os.path.join(root, "cache"))
+
+        def run_all():
+            scheduler = VideoConversionScheduler(ffmpeg_path, root, cache=cache)
+            for v in videos:
+                scheduler.submit(v)
+            errors = [err for _, _, err in scheduler.results() if err]
+            scheduler.shutdown()
+            if errors:
+                raise RuntimeError(errors[0])
+
+        timed(results, 'video_cold', run_all)
+        timed(results, 'video_cached', run_all)
+    finally:
+        RefCast_Core.TOOLS = saved_tools
+
+
+# ==========================================
+# ===== REPORT =====
+# ==========================================
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, base in baseline.get('stages', {}).items():
+        now = results.get(name)
+        if now is None or base <= 0:
+            continue
+        if now > base * (1.0 + tolerance):
+            regressions.append(f"{name}: {now * 1000:.1f} ms vs {base * 1000:.1f} ms baseline")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark RefCast's headless import stages.")
+    parser.add_argument('--images', type=int, default=1000)
+    parser.add_argument('--videos', type=int, default=4)
+    parser.add_argument('--batch', type=int, default=8, help="planes per commit (IMPORT_BATCH_SIZE)")
+    parser.add_argument('--call-cost-us', type=float, default=0.0,
+                        help="simulated cost of one pymxs call, in microseconds")
+    parser.add_argument('--json', help="write results to this file")
+    parser.add_argument('--baseline', help="compare against a previous --json result")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--trace', help="write a Chrome trace of the stages to this file")
+    parser.add_argument('--keep', action='store_true', help="keep the generated media")
+    args = parser.parse_args(argv)
+
+    runtime = fake_pymxs.install(args.call_cost_us / 1e6)
+    root = tempfile.mkdtemp(prefix="refcast_bench_")
+    results, calls, notes = {}, {}, []
+    try:
+        expected = make_images(os.path.join(root, "images"), args.images)
+
+        files = timed(results, 'scan', collect_media_files, [os.path.join(root, "images")])
+        scanned = timed(results, 'scan_parallel', scan_media_paths, [os.path.join(root, "images")])
+        if sorted(scanned) != sorted(files):
+            notes.append(f"scan_parallel: found {len(scanned)} files, os.walk found {len(files)}")
+        sizes = timed(results, 'probe', lambda: {f: probe_image_size(f) for f in files})
+        bad = [f for f in files if sizes[f] != expected.get(f)]
+        if bad:
+            notes.append(f"probe: {len(bad)} size mismatch(es), e.g. {bad[0]}")
+        timed(results, 'detect', lambda: [detect_view_from_name(f) for f in files])
+        manual = timed(results, 'plan_manual', plan, files, sizes, "Manual")
+        box = timed(results, 'plan_box', plan, files, sizes, "Box Mode")
+        timed(results, 'layout', layout, files, sizes)
+        calls['commit_manual'] = timed(results, 'commit_manual', commit, runtime, manual, args.batch)
+        calls['commit_box'] = timed(results, 'commit_box', commit, runtime, box, args.batch)
+        calls['index'] = timed(results, 'index', index, runtime, files, sizes)
+        scene_index = signed_index(files, sizes)
+        edited = edit_files(files, 5)
+        changed, _, _ = timed(results, 'resync', find_changed_sources, scene_index)
+        if sorted(src for src, _ in changed) != sorted(edited):
+            notes.append(f"resync: found {len(changed)} changed file(s), expected {len(edited)}")
+        calls['atlas'] = timed(results, 'atlas', atlas, runtime, files, sizes)
+
+        if args.videos:
+            video_root = os.path.join(root, "videos")
+            os.makedirs(video_root, exist_ok=True)
+            bench_videos(results, notes, video_root, args.videos)
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(f"RefCast import benchmark — {len(files)} images, batch {args.batch}")
+    for name, sec in results.items():
+        extra = f"  ({calls[name]} runtime calls)" if name in calls else ""
+        print(f"  {name:<14} {sec * 1000:9.1f} ms{extra}")
+    for note in notes:
+        print(f"  note: {note}")
+
+    if args.trace:
+        PROFILER.write_trace(args.trace)
+
+    report = {'images': len(files), 'batch': args.batch, 'stages': results, 'calls': calls, 'notes': notes}
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for r in regressions:
+            print(f"  REGRESSION {r}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
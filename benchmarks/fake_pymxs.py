@@ -0,0 +1,195 @@
+"""
+Fake pymxs for headless benchmarks
+==================================
+A tiny stand-in for `pymxs.runtime` that records every call made through it.
+It knows just enough of the scene side (bitmaps, materials, the RefCast
+MAXScript helpers) for RefCast_Core to run against it. Nothing is rendered.
+
+`call_cost` adds a fixed delay per runtime call, to mimic the Python ↔
+MAXScript marshalling cost that dominates real imports.
+"""
+
+import sys
+import time
+import types
+import contextlib
+from collections import Counter
+
+
+class FakeNode(object):
+    def __init__(self, **props):
+        self.__dict__.update(props)
+        self.user_props = {}
+
+    def __repr__(self):
+        return f"<FakeNode {getattr(self, 'name', '?')}>"
+
+
+class FakeBitmap(object):
+    def __init__(self, width=0, height=0):
+        self.width = width
+        self.height = height
+
+
+class FakeBitmapTexture(FakeNode):
+    def __init__(self, filename="", size=(0, 0), **props):
+        FakeNode.__init__(self, filename=filename, alphaSource=2, **props)
+        self.bitmap = FakeBitmap(*size)
+        self.reloads = 0
+
+    def reload(self):
+        self.reloads += 1
+
+
+class FakeRuntime(object):
+    """Counts calls per name in `self.calls`; `self.nodes` holds every plane built."""
+
+    def __init__(self, call_cost=0.0):
+        self.call_cost = call_cost
+        self.calls = Counter()
+        self.nodes = []
+        self.layers = {}
+        self.executed = []
+        self.file_props = {}
+        self.handles = {}
+        self._next_handle = 1
+
+    def _register(self, node):
+        node.handle = self._next_handle
+        self.handles[node.handle] = node
+        self._next_handle += 1
+
+    def _call(self, name):
+        self.calls[name] += 1
+        if self.call_cost:
+            time.sleep(self.call_cost)
+
+    def reset_counts(self):
+        self.calls.clear()
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    # --- Plain runtime functions ---
+    def execute(self, script):
+        self._call('execute')
+        self.executed.append(script)
+        return True
+
+    def redrawViews(self):
+        self._call('redrawViews')
+
+    def select(self, objs):
+        self._call('select')
+
+    def BitmapTexture(self, filename="", **props):
+        self._call('BitmapTexture')
+        return FakeBitmapTexture(filename=filename, **props)
+
+    def StandardMaterial(self, **props):
+        self._call('StandardMaterial')
+        return FakeNode(**props)
+
+    def PhysicalMaterial(self, **props):
+        self._call('PhysicalMaterial')
+        return FakeNode(**props)
+
+    # --- Injected RefCast MAXScript helpers ---
+    def REFCAST_BUILD_PLANES_FN(self, names, widths, lengths, mats, texs, xforms, mat_keys,
+                                full_paths, proxy_paths, layer_name, val, gray, do_freeze,
+                                cull, rend, cast_sh, rcv_sh):
+        self._call('REFCAST_BUILD_PLANES_FN')
+        layer = self.layers.setdefault(layer_name, [])
+        built = []
+        for i, name in enumerate(names):
+            x = xforms[i * 9:(i + 1) * 9]
+            node = FakeNode(name=name, width=widths[i], length=lengths[i], material=mats[i],
+                            rotation=tuple(x[0:3]), pos=tuple(x[3:6]), pivot=tuple(x[6:9]),
+                            visibility=val, isFrozen=do_freeze, backfacecull=cull,
+                            renderable=rend, castShadows=cast_sh, receiveShadows=rcv_sh,
+                            showFrozenInGray=gray)
+            node.user_props['RefCast_MatKey'] = mat_keys[i]
+            if proxy_paths[i]:
+                node.user_props['RefCast_FullRes'] = full_paths[i]
+                node.user_props['RefCast_Proxy'] = proxy_paths[i]
+            self._register(node)
+            built.append(node)
+        layer.extend(built)
+        self.nodes.extend(built)
+        return built
+
+    def REFCAST_BUILD_ATLAS_MESH_FN(self, name, quads, mat, tex, xform, sheet_path, layer_name,
+                                    val, gray, do_freeze, cull, rend, cast_sh, rcv_sh):
+        self._call('REFCAST_BUILD_ATLAS_MESH_FN')
+        node = FakeNode(name=name, material=mat, faces=len(quads) // 8 * 2,
+                        rotation=tuple(xform[0:3]), pos=tuple(xform[3:6]), visibility=val,
+                        isFrozen=do_freeze, backfacecull=cull, renderable=rend,
+                        castShadows=cast_sh, receiveShadows=rcv_sh, showFrozenInGray=gray)
+        node.user_props['RefCast_Atlas'] = sheet_path
+        self._register(node)
+        self.layers.setdefault(layer_name, []).append(node)
+        self.nodes.append(node)
+        return node
+
+    def REFCAST_APPLY_PROPS_FN(self, objs, val, gray, do_freeze, cull, rend, cast_sh, rcv_sh):
+        self._call('REFCAST_APPLY_PROPS_FN')
+        for o in objs:
+            o.visibility = val
+            o.showFrozenInGray = gray
+            o.isFrozen = do_freeze
+            o.backfacecull = cull
+            o.renderable = rend
+            o.castShadows = cast_sh
+            o.receiveShadows = rcv_sh
+        return len(objs)
+
+    def REFCAST_RESIZE_PLANES_FN(self, objs, widths, lengths):
+        self._call('REFCAST_RESIZE_PLANES_FN')
+        for o, w, l in zip(objs, widths, lengths):
+            o.width = w
+            o.length = l
+        return len(objs)
+
+    def REFCAST_INDEX_READ_FN(self, prop_name):
+        self._call('REFCAST_INDEX_READ_FN')
+        return self.file_props.get(prop_name, "")
+
+    def REFCAST_INDEX_WRITE_FN(self, prop_name, data):
+        self._call('REFCAST_INDEX_WRITE_FN')
+        self.file_props[prop_name] = data
+        return True
+
+    def REFCAST_NODE_HANDLES_FN(self, objs):
+        self._call('REFCAST_NODE_HANDLES_FN')
+        return [getattr(o, 'handle', 0) for o in objs]
+
+    def REFCAST_NODES_BY_HANDLE_FN(self, handles):
+        self._call('REFCAST_NODES_BY_HANDLE_FN')
+        return [self.handles.get(h) for h in handles]
+
+    def REFCAST_COLLECT_ASSETS_FN(self, layer_name):
+        self._call('REFCAST_COLLECT_ASSETS_FN')
+        rows = []
+        for node in self.layers.get(layer_name, []):
+            mat = node.material
+            tex = getattr(mat, 'diffuseMap', None)
+            if tex is not None:
+                rows.append([node.user_props.get('RefCast_MatKey', ""), mat, tex,
+                             tex.filename, tex.alphaSource == 2])
+        return rows
+
+
+@contextlib.contextmanager
+def _undo(enabled, label=""):
+    yield
+
+
+def install(call_cost=0.0):
+    """Register a fake `pymxs` module in sys.modules and return its runtime."""
+    runtime = FakeRuntime(call_cost)
+    module = types.ModuleType('pymxs')
+    module.runtime = runtime
+    module.undo = _undo
+    sys.modules['pymxs'] = module
+    return runtime